@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Fail-fast blueprint validation and normalization, run before Blender starts.
+
+The schema is checked room by room. Room sizes and openings are then
+gathered into NumPy arrays, so size, overlap and opening checks run for all
+rooms and openings at once. Problems come back as structured issues:
+
+    {'severity': 'error'|'warning'|'info', 'code': 'opening.wider_than_wall',
+     'path': 'rooms[2].doors[0].width', 'message': '...', 'fix': '...' or None}
+
+With repair=True, fixable problems are corrected in a normalized copy of the
+blueprint. Examples: missing heights, openings that do not fit their wall,
+duplicate ids, negative sizes, and overlapping rooms (the room that loses
+less is trimmed so the two share a wall). The repaired copy is snapped to
+whole millimetres, with nearly coincident room edges welded together.
+Problems with no fix, such as
+absurd sizes or non-numeric dimensions, reject the job.
+
+Plain Python + NumPy - no bpy.
+
+Usage:
+  python3 blueprint_check.py input.json [--fix fixed.json] [--report issues.json]
+
+Exit status: 0 valid (after repairs when --fix is given), 65 rejected.
+"""
+
+import copy
+import json
+import math
+import sys
+
+import numpy as np
+
+from build_control import option_value, write_report
+from house_layout import ADJACENT_TOLERANCE, DEFAULT_ROOM_HEIGHT, WALL_SIDES, snap_blueprint
+
+EXIT_INVALID = 65  # EX_DATAERR
+
+ROOM_TYPES = ['living', 'bedroom', 'bathroom', 'kitchen', 'deck', 'balcony', 'hallway', 'stairs']
+OUTDOOR_TYPES = ['deck', 'balcony']
+DOOR_TYPES = ['standard', 'sliding_glass']
+
+MIN_ROOM_SIZE = 0.5       # m; smaller rooms cannot hold a wall with an opening
+MAX_ROOM_SIZE = 50.0      # m; larger usually means centimetres slipped through
+MAX_ROOM_HEIGHT = 6.0
+
+# Builder limits for openings (see wall_shell.opening_cut)
+OPENING_MARGIN = 0.05     # kept free at each wall end
+HEAD_CLEARANCE = 0.1      # wall left above a door
+MIN_OPENING_WIDTH = 0.3
+MIN_WINDOW_HEIGHT = 0.2
+
+DOOR_DEFAULTS = {'position': 0.5, 'width': 0.9, 'height': 2.1}
+WINDOW_DEFAULTS = {'position': 0.5, 'width': 1.2, 'height': 1.4, 'bottom': 0.9}
+
+
+def _number(value):
+    """float for real numbers, NaN for anything else (bools, strings, None)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return math.nan
+    return float(value)
+
+
+def _numeric_string(value):
+    """float for strings like "3.5", else NaN"""
+    if not isinstance(value, str):
+        return math.nan
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
+
+
+class _Issues:
+    def __init__(self):
+        self.items = []
+
+    def add(self, severity, code, path, message, fix=None):
+        self.items.append({'severity': severity, 'code': code, 'path': path, 'message': message, 'fix': fix})
+
+    def blocking(self, repair):
+        """Issues that reject the job: errors, unless repair fixed them"""
+        return [i for i in self.items if i['severity'] == 'error' and not (repair and i['fix'])]
+
+
+# ============= SCHEMA =============
+
+def _room_fields(rooms, issues):
+    """Normalized copies of the room objects and their indices in the input"""
+    normalized, index = [], []
+    seen_ids = set()
+    for i, raw in enumerate(rooms):
+        path = f"rooms[{i}]"
+        if not isinstance(raw, dict):
+            issues.add('error', 'room.not_object', path, "room must be an object", "room dropped")
+            continue
+        room = copy.deepcopy(raw)
+
+        room_id = room.get('id')
+        if not isinstance(room_id, str) or not room_id:
+            room['id'] = f"room_{i}"
+            issues.add('warning', 'room.missing_id', f"{path}.id", "room has no id", f"id set to '{room['id']}'")
+        elif room_id in seen_ids:
+            room['id'] = f"{room_id}_{i}"
+            issues.add('error', 'room.duplicate_id', f"{path}.id",
+                       f"id '{room_id}' is used by another room (shared walls would be skipped)",
+                       f"id changed to '{room['id']}'")
+        seen_ids.add(room['id'])
+
+        if room.get('type', 'living') not in ROOM_TYPES:
+            issues.add('warning', 'room.unknown_type', f"{path}.type",
+                       f"unknown room type '{room.get('type')}' gets no furniture")
+
+        # A missing or invalid height falls back to the default (_check_rooms)
+        for field in ('width', 'length', 'height'):
+            if field not in room:
+                if field != 'height':
+                    issues.add('error', 'room.missing_size', f"{path}.{field}", f"{field} is missing")
+            elif not math.isnan(_numeric_string(room[field])):
+                issues.add('warning', 'room.string_size', f"{path}.{field}", f"{field} is the string {room[field]!r}",
+                           "converted to a number")
+                room[field] = _numeric_string(room[field])
+            elif field != 'height' and math.isnan(_number(room[field])):
+                issues.add('error', 'room.invalid_size', f"{path}.{field}", f"{field} must be a number, got {room[field]!r}")
+
+        position = room.get('position', {'x': 0, 'y': 0})
+        if not isinstance(position, dict) or any(math.isnan(_number(position.get(k, 0))) for k in ('x', 'y')):
+            issues.add('error', 'room.invalid_position', f"{path}.position", "position must be {x: number, y: number}")
+            position = {}
+        room['position'] = {'x': _number(position.get('x', 0)), 'y': _number(position.get('y', 0))}
+
+        for kind in ('doors', 'windows'):
+            if not isinstance(room.get(kind, []), list):
+                issues.add('error', 'room.invalid_openings', f"{path}.{kind}", f"{kind} must be a list", f"{kind} dropped")
+                room[kind] = []
+            room.setdefault(kind, [])
+        room.setdefault('outdoor', False)
+        normalized.append(room)
+        index.append(i)
+    return normalized, index
+
+
+# ============= GEOMETRY =============
+
+def _trim_overlap(lo, size, i, j, axis, overlap):
+    """Trim room i or j along `axis` so they only touch; returns (room, new origin, new size) or None"""
+    candidates = sorted((i, j), key=lambda k: overlap / size[k, axis])
+    for k in candidates:
+        other = j if k == i else i
+        k_lo, k_hi = lo[k, axis], lo[k, axis] + size[k, axis]
+        o_lo, o_hi = lo[other, axis], lo[other, axis] + size[other, axis]
+        if k_lo + k_hi < o_lo + o_hi:
+            new_lo, new_hi = k_lo, o_lo     # k is before the other room: cut its far end
+        else:
+            new_lo, new_hi = o_hi, k_hi     # k is after: cut its near end
+        if new_hi - new_lo >= MIN_ROOM_SIZE:
+            return k, new_lo, new_hi - new_lo
+    return None
+
+
+def _check_rooms(rooms, index, issues):
+    """Vectorized size and overlap checks; fixes sizes in place. Returns indices of rooms to drop."""
+    x = np.array([r['position']['x'] for r in rooms])
+    y = np.array([r['position']['y'] for r in rooms])
+    w = np.array([_number(r.get('width', math.nan)) for r in rooms])
+    l = np.array([_number(r.get('length', math.nan)) for r in rooms])
+    h = np.array([_number(r.get('height', math.nan)) for r in rooms])
+    outdoor = np.array([bool(r['outdoor']) or r.get('type') in OUTDOOR_TYPES for r in rooms])
+    drop = set()
+
+    # Negative sizes: the room extends the other way from its position
+    for size, origin, field, axis in ((w, x, 'width', 'x'), (l, y, 'length', 'y')):
+        for i in np.flatnonzero(size < 0):
+            issues.add('error', 'room.negative_size', f"rooms[{index[i]}].{field}", f"{field} is {size[i]:g}",
+                       f"flipped: {axis} moved by {size[i]:g}, {field} {-size[i]:g}")
+            origin[i] += size[i]
+            size[i] = -size[i]
+
+    small = np.flatnonzero((w < MIN_ROOM_SIZE) | (l < MIN_ROOM_SIZE))
+    for i in small:
+        issues.add('error', 'room.too_small', f"rooms[{index[i]}]", f"room is {w[i]:g} x {l[i]:g} m", "room dropped")
+        drop.add(int(i))
+    for i in np.flatnonzero((w > MAX_ROOM_SIZE) | (l > MAX_ROOM_SIZE)):
+        issues.add('error', 'room.too_large', f"rooms[{index[i]}]",
+                   f"room is {w[i]:g} x {l[i]:g} m (over {MAX_ROOM_SIZE:g} m - centimetres?)")
+
+    # A missing height is the usual default; only bad values are reported
+    missing_height = ~(h > 0)
+    for i in np.flatnonzero(missing_height):
+        if 'height' in rooms[i]:
+            # Outdoor rooms have no walls, so their height does not matter
+            severity = 'info' if outdoor[i] else 'warning'
+            issues.add(severity, 'room.invalid_height', f"rooms[{index[i]}].height",
+                       f"height is {rooms[i]['height']!r}", f"height set to {DEFAULT_ROOM_HEIGHT}")
+    h[missing_height] = DEFAULT_ROOM_HEIGHT
+    for i in np.flatnonzero(h > MAX_ROOM_HEIGHT):
+        issues.add('warning', 'room.tall', f"rooms[{index[i]}].height", f"height {h[i]:g} m is unusually tall")
+
+    # Pairwise overlap beyond the adjacency tolerance. Outdoor overlaps are
+    # reported; indoor ones are trimmed one pair at a time until none are left.
+    keep = np.ones(len(rooms), dtype=bool)
+    keep[list(drop)] = False
+    lo = np.stack([x, y], axis=1)
+    size = np.stack([w, l], axis=1)
+    unresolved = set()
+    while True:
+        hi = lo + size
+        overlap = np.minimum(hi[:, None, :], hi[None, :, :]) - np.maximum(lo[:, None, :], lo[None, :, :])
+        overlapping = np.triu((overlap > ADJACENT_TOLERANCE).all(axis=2), k=1) & keep[:, None] & keep[None, :]
+        indoor = ~outdoor[:, None] & ~outdoor[None, :]
+        pairs = [(i, j) for i, j in zip(*np.nonzero(overlapping & indoor)) if (i, j) not in unresolved]
+        if not pairs:
+            break
+        i, j = pairs[0]
+        axis = int(np.argmin(overlap[i, j]))
+        message = (f"'{rooms[i]['id']}' overlaps '{rooms[j]['id']}' by "
+                   f"{overlap[i, j, 0]:.2f} x {overlap[i, j, 1]:.2f} m")
+        trim = _trim_overlap(lo, size, i, j, axis, overlap[i, j, axis])
+        if trim is None:
+            issues.add('error', 'room.overlap', f"rooms[{index[i]}]", message)
+            unresolved.add((i, j))
+            continue
+        k, new_lo, new_size = trim
+        field = ('width', 'length')[axis]
+        issues.add('error', 'room.overlap', f"rooms[{index[i]}]", message,
+                   f"'{rooms[k]['id']}' trimmed to {field} {new_size:.2f} m")
+        lo[k, axis], size[k, axis] = new_lo, new_size
+    for i, j in zip(*np.nonzero(overlapping & ~indoor)):
+        issues.add('warning', 'room.overlap', f"rooms[{index[i]}]",
+                   f"outdoor '{rooms[i]['id']}' overlaps '{rooms[j]['id']}' by "
+                   f"{overlap[i, j, 0]:.2f} x {overlap[i, j, 1]:.2f} m")
+    x, y, w, l = lo[:, 0], lo[:, 1], size[:, 0], size[:, 1]
+
+    for i, room in enumerate(rooms):
+        room['position'] = {'x': float(x[i]), 'y': float(y[i])}
+        if not math.isnan(w[i]):
+            room['width'] = float(w[i])
+        if not math.isnan(l[i]):
+            room['length'] = float(l[i])
+        room['height'] = float(h[i])
+    return drop
+
+
+def _check_openings(rooms, index, issues, skip):
+    """Vectorized fit of doors and windows into their walls; fixes them in place.
+
+    Rooms in `skip` (dropped, or without a valid size) are not checked.
+    """
+    rows = []   # (room index, kind, opening index, opening dict)
+    for i, room in enumerate(rooms):
+        if i in skip:
+            continue
+        for kind in ('doors', 'windows'):
+            for k, opening in enumerate(room[kind]):
+                path = f"rooms[{index[i]}].{kind}[{k}]"
+                if not isinstance(opening, dict) or opening.get('wall') not in WALL_SIDES:
+                    wall = opening.get('wall') if isinstance(opening, dict) else None
+                    issues.add('error', 'opening.invalid_wall', path,
+                               f"wall must be one of {', '.join(WALL_SIDES)}, got {wall!r}", "opening dropped")
+                    if isinstance(opening, dict):
+                        opening['_drop'] = True
+                    continue
+                if room['outdoor'] or room.get('type') in OUTDOOR_TYPES:
+                    issues.add('warning', 'opening.ignored', path, "outdoor rooms have no walls; opening is ignored")
+                if kind == 'doors' and opening.get('type', 'standard') not in DOOR_TYPES:
+                    issues.add('warning', 'opening.unknown_type', f"{path}.type",
+                               f"unknown door type '{opening.get('type')}' is built as a standard door")
+                rows.append((i, kind, k, opening))
+    if not rows:
+        return
+
+    defaults = {'doors': DOOR_DEFAULTS, 'windows': WINDOW_DEFAULTS}
+    is_door = np.array([kind == 'doors' for _, kind, _, _ in rows])
+    fields = {}
+    for field in ('position', 'width', 'height', 'bottom'):
+        values = np.array([_number(o.get(field, defaults[kind].get(field, 0.0))) for _, kind, _, o in rows])
+        fallback = np.array([defaults[kind].get(field, 0.0) for _, kind, _, _ in rows])
+        bad = np.isnan(values) | ((values <= 0) if field in ('width', 'height') else False)
+        for n in np.flatnonzero(bad):
+            i, kind, k, o = rows[n]
+            issues.add('warning', 'opening.invalid_value', f"rooms[{index[i]}].{kind}[{k}].{field}",
+                       f"{field} is {o.get(field)!r}", f"{field} set to {fallback[n]:g}")
+        fields[field] = np.where(bad, fallback, values)
+
+    room_index = np.array([i for i, _, _, _ in rows])
+    along_x = np.array([o['wall'] in ('front', 'back') for _, _, _, o in rows])
+    widths = np.array([_number(r.get('width', math.nan)) for r in rooms])
+    lengths = np.array([_number(r.get('length', math.nan)) for r in rooms])
+    wall_len = np.where(along_x, widths[room_index], lengths[room_index])
+    room_h = np.array([r['height'] for r in rooms])[room_index]
+
+    width, position, height, bottom = fields['width'], fields['position'], fields['height'], fields['bottom']
+    usable = wall_len - 2 * OPENING_MARGIN
+    drop = ~(usable >= MIN_OPENING_WIDTH)
+    too_wide = ~drop & (width > usable)
+    new_width = np.where(too_wide, usable, width)
+
+    half = new_width / 2
+    center = position * wall_len
+    new_center = np.clip(center, OPENING_MARGIN + half, wall_len - OPENING_MARGIN - half)
+    outside = ~drop & (np.abs(new_center - center) > 1e-6)
+    new_position = np.where(outside, new_center / np.where(wall_len > 0, wall_len, 1), position)
+
+    max_height = np.where(is_door, room_h - HEAD_CLEARANCE, room_h - OPENING_MARGIN - np.maximum(bottom, 0))
+    too_tall = ~drop & (height > max_height)
+    new_height = np.where(too_tall, max_height, height)
+    low_window = ~is_door & (bottom < 0)
+    drop |= ~is_door & (new_height < MIN_WINDOW_HEIGHT)
+
+    for n, (i, kind, k, opening) in enumerate(rows):
+        path = f"rooms[{index[i]}].{kind}[{k}]"
+        if drop[n]:
+            issues.add('error', 'opening.does_not_fit', path,
+                       f"{opening['wall']} wall ({wall_len[n]:.2f} m x {room_h[n]:.2f} m) has no room for it",
+                       "opening dropped")
+            opening['_drop'] = True
+            continue
+        if too_wide[n]:
+            issues.add('error', 'opening.wider_than_wall', f"{path}.width",
+                       f"{width[n]:g} m on a {wall_len[n]:.2f} m wall", f"width set to {new_width[n]:.2f}")
+        if outside[n]:
+            issues.add('error', 'opening.outside_wall', f"{path}.position",
+                       f"opening at {position[n]:g} extends past the wall end", f"position set to {new_position[n]:.3f}")
+        if too_tall[n]:
+            issues.add('error', 'opening.too_tall', f"{path}.height",
+                       f"{height[n]:g} m does not fit under the {room_h[n]:g} m ceiling", f"height set to {new_height[n]:.2f}")
+        if low_window[n]:
+            issues.add('warning', 'opening.below_floor', f"{path}.bottom", f"bottom is {bottom[n]:g}", "bottom set to 0")
+        opening.update(position=float(new_position[n]), width=float(new_width[n]), height=float(new_height[n]))
+        if kind == 'windows':
+            opening['bottom'] = float(max(bottom[n], 0.0))
+
+    # The builder cuts one opening per wall: the first door, or the window on exterior walls
+    for i, room in enumerate(rooms):
+        if i in skip:
+            continue
+        for wall in WALL_SIDES:
+            doors = [k for k, d in enumerate(room['doors']) if isinstance(d, dict) and d.get('wall') == wall]
+            windows = [k for k, w in enumerate(room['windows']) if isinstance(w, dict) and w.get('wall') == wall]
+            for k in doors[1:]:
+                issues.add('warning', 'opening.ignored', f"rooms[{index[i]}].doors[{k}]",
+                           f"only the first door on the {wall} wall is built")
+            for k in windows[1:]:
+                issues.add('warning', 'opening.ignored', f"rooms[{index[i]}].windows[{k}]",
+                           f"only the first window on the {wall} wall is built")
+            if doors and windows:
+                issues.add('warning', 'opening.conflict', f"rooms[{index[i]}].{wall}",
+                           "wall has a door and a window; exterior walls build the window, interior walls the door")
+
+
+# ============= ENTRY POINTS =============
+
+def check_blueprint(data, repair=False):
+    """Validate a blueprint (a house with `rooms`, or a single room object).
+
+    Returns {'valid', 'errors', 'warnings', 'fixed', 'issues', 'blueprint'};
+    with repair, 'blueprint' is the normalized copy to build from, snapped
+    to whole millimetres (house_layout.snap_blueprint).
+    """
+    issues = _Issues()
+    blueprint = None
+
+    if not isinstance(data, dict):
+        issues.add('error', 'blueprint.not_object', '', "blueprint must be a JSON object")
+    else:
+        rooms = data.get('rooms', [data])
+        if not isinstance(rooms, list) or not rooms:
+            issues.add('error', 'blueprint.no_rooms', 'rooms', "blueprint has no rooms")
+        else:
+            present, index = _room_fields(rooms, issues)
+            if present:
+                dropped = _check_rooms(present, index, issues)
+                unsized = {n for n, r in enumerate(present)
+                           if math.isnan(_number(r.get('width'))) or math.isnan(_number(r.get('length')))}
+                _check_openings(present, index, issues, dropped | unsized)
+                kept = [r for n, r in enumerate(present) if n not in dropped]
+                for room in kept:
+                    for kind in ('doors', 'windows'):
+                        room[kind] = [o for o in room[kind] if isinstance(o, dict) and not o.get('_drop')]
+                if not kept:
+                    issues.add('error', 'blueprint.no_rooms', 'rooms', "no buildable rooms left")
+                blueprint = dict({k: v for k, v in data.items() if k != 'rooms'} if 'rooms' in data else {}, rooms=kept)
+            else:
+                issues.add('error', 'blueprint.no_rooms', 'rooms', "blueprint has no rooms")
+
+    blocking = issues.blocking(repair)
+    if repair and not blocking:
+        blueprint = snap_blueprint(blueprint)
+    return {
+        'valid': not blocking,
+        'errors': len(blocking),
+        'warnings': sum(1 for i in issues.items if i['severity'] == 'warning'),
+        'fixed': sum(1 for i in issues.items if i['fix']) if repair else 0,
+        'issues': issues.items,
+        'blueprint': blueprint if repair and not blocking else None,
+    }
+
+
+def format_issues(report):
+    marks = {'error': '❌', 'warning': '⚠️ ', 'info': 'ℹ️ '}
+    lines = []
+    for issue in report['issues']:
+        fix = f" -> {issue['fix']}" if issue['fix'] and report['blueprint'] is not None else ""
+        lines.append(f"{marks[issue['severity']]} {issue['path'] or 'blueprint'}: {issue['message']} [{issue['code']}]{fix}")
+    return "\n".join(lines)
+
+
+def load_blueprint(path):
+    """Read, validate and repair a blueprint for a script entry point; exits if it is rejected.
+
+    Issues go to stderr so stdout stays clean for JSON output (--plan).
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+    report = check_blueprint(data, repair=True)
+    if report['issues']:
+        print(format_issues(report), file=sys.stderr)
+    if not report['valid']:
+        print(f"❌ Blueprint rejected: {report['errors']} error(s)", file=sys.stderr)
+        sys.exit(EXIT_INVALID)
+    return report['blueprint']
+
+
+def main():
+    argv = sys.argv[1:]
+    if not argv or argv[0].startswith('--'):
+        print("Usage: python3 blueprint_check.py input.json [--fix fixed.json] [--report issues.json]")
+        sys.exit(1)
+
+    with open(argv[0], 'r') as f:
+        data = json.load(f)
+    fix_path = option_value(argv, '--fix')
+    report = check_blueprint(data, repair=bool(fix_path))
+    if report['issues']:
+        print(format_issues(report))
+    write_report(option_value(argv, '--report'), {k: v for k, v in report.items() if k != 'blueprint'})
+
+    if not report['valid']:
+        print(f"❌ Blueprint rejected: {report['errors']} error(s)")
+        sys.exit(EXIT_INVALID)
+    if fix_path:
+        with open(fix_path, 'w') as f:
+            json.dump(report['blueprint'], f, indent=2, ensure_ascii=False)
+        print(f"✅ Blueprint OK ({report['fixed']} fix(es)) -> {fix_path}")
+    else:
+        print("✅ Blueprint OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Build control shared by the Blender scripts: cooperative cancellation,
+per-phase time budgets and memory instrumentation.
+
+A job is cancelled by SIGTERM/SIGINT or by creating a sentinel file. Builders
+call `control.check()` between units of work (e.g. rooms), which raises once the
+job is cancelled or the current phase has overrun its budget. Calls that block
+inside Blender for a long time (Cycles render, glTF export) are wrapped in
+`control.blocking()`, where a watchdog thread terminates the process instead.
+Before it does, the watchdog calls `control.on_abort` so the job can still
+write its report.
+The watchdog also samples RSS so every phase records its peak memory.
+Export budgets (triangles and bytes of the exported model, --budget) are
+carried here too; the builder degrades the scene until its export fits.
+
+Plain Python - no bpy import - so it can be reused outside Blender.
+"""
+
+import json
+import os
+import resource
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+EXIT_CANCELLED = 130
+EXIT_TIMEOUT = 124
+
+# Time the main thread gets to reach a check() before the watchdog exits hard
+GRACE_SECONDS = 0.75
+
+
+class BuildCancelled(Exception):
+    """Raised when the job was cancelled by signal or sentinel file."""
+
+    def __init__(self, phase, reason):
+        super().__init__(f"cancelled during '{phase}' ({reason})")
+        self.phase = phase
+        self.reason = reason
+
+
+class PhaseTimeout(Exception):
+    """Raised when a phase runs longer than its budget."""
+
+    def __init__(self, phase, budget, elapsed):
+        super().__init__(f"phase '{phase}' overran its budget: {elapsed:.1f}s > {budget:.1f}s")
+        self.phase = phase
+        self.budget = budget
+        self.elapsed = elapsed
+
+
+def parse_budgets(spec):
+    """Parse 'rooms=20,export=30' into {'rooms': 20.0, 'export': 30.0}"""
+    budgets = {}
+    if not spec:
+        return budgets
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        name, _, seconds = part.partition('=')
+        if not seconds:
+            raise ValueError(f"Invalid phase budget '{part}', expected phase=seconds")
+        budgets[name.strip()] = float(seconds)
+    return budgets
+
+
+# Export budget keys as written on the command line
+EXPORT_BUDGET_KEYS = {'tris': 'triangles', 'triangles': 'triangles', 'bytes': 'bytes'}
+
+# Count suffixes: k/m for thousands/millions, kb/mb for bytes
+SUFFIXES = {'k': 1e3, 'm': 1e6, 'kb': 2**10, 'mb': 2**20}
+
+
+def parse_export_budget(spec):
+    """Parse 'tris=150k,bytes=5mb' into {'triangles': 150000, 'bytes': 5242880}"""
+    budget = {}
+    if not spec:
+        return budget
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        name, _, value = part.partition('=')
+        key = EXPORT_BUDGET_KEYS.get(name.strip().lower())
+        value = value.strip().lower()
+        suffix = next((s for s in sorted(SUFFIXES, key=len, reverse=True) if value.endswith(s)), '')
+        try:
+            if key is None:
+                raise ValueError(name)
+            budget[key] = int(float(value[:len(value) - len(suffix)]) * SUFFIXES.get(suffix, 1))
+        except ValueError:
+            raise ValueError(f"Invalid export budget '{part}', expected tris=N or bytes=N[kb|mb]") from None
+    return budget
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    """Process-lifetime peak RSS in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KB on Linux
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+
+
+def write_report(path, result):
+    """Write a job result as JSON (no-op without a path)"""
+    if not path:
+        return
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=2)
+
+
+def option_value(argv, flag, default=None):
+    """Return the value following `flag` in argv, e.g. --timeout rooms=20"""
+    if flag in argv:
+        i = argv.index(flag)
+        if i + 1 < len(argv):
+            return argv[i + 1]
+    return default
+
+
+class BuildControl:
+    """Tracks phases, budgets and cancellation for one build/render job."""
+
+    def __init__(self, cancel_file=None, budgets=None, memory_budget_mb=None, poll_interval=0.25,
+                 export_budget=None):
+        self.cancel_file = cancel_file
+        self.budgets = dict(budgets or {})
+        self.memory_budget_mb = memory_budget_mb
+        self.export_budget = dict(export_budget or {})
+        self.poll_interval = poll_interval
+        self.phases = []
+        self.current = None
+        self.cancel_reason = None
+        self.abort = None
+        # Called by the watchdog right before it exits hard (e.g. to write the report)
+        self.on_abort = None
+        self._phase_start = None
+        self._record = None
+        self._blocking = False
+        self._lock = threading.Lock()
+        self._watchdog = None
+        self._stop = threading.Event()
+        self._wakeup = None
+
+    @classmethod
+    def from_argv(cls, argv):
+        """Build from --cancel-file PATH, --timeout phase=seconds,..., --memory-budget MB and --budget tris=N,bytes=N"""
+        memory_budget = option_value(argv, '--memory-budget')
+        return cls(
+            cancel_file=option_value(argv, '--cancel-file'),
+            budgets=parse_budgets(option_value(argv, '--timeout')),
+            memory_budget_mb=float(memory_budget) if memory_budget else None,
+            export_budget=parse_export_budget(option_value(argv, '--budget')),
+        )
+
+    # ---------- cancellation ----------
+
+    def cancel(self, reason):
+        with self._lock:
+            if self.cancel_reason is None:
+                self.cancel_reason = reason
+
+    @property
+    def cancelled(self):
+        if self.cancel_reason is None and self.cancel_file and os.path.exists(self.cancel_file):
+            self.cancel(f"sentinel file {self.cancel_file}")
+        return self.cancel_reason is not None
+
+    def install_signal_handlers(self):
+        """Cancel on SIGTERM/SIGINT. Must be called from the main thread.
+
+        Python-level handlers only run between bytecodes, which never happens
+        while Blender is inside a render. The wakeup fd is written by the C
+        handler immediately, so the watchdog sees the signal even then.
+        """
+        def handler(signum, frame):
+            self.cancel(f"signal {signal.Signals(signum).name}")
+
+        signal.signal(signal.SIGTERM, handler)
+        signal.signal(signal.SIGINT, handler)
+        r, w = os.pipe()
+        os.set_blocking(r, False)
+        os.set_blocking(w, False)
+        signal.set_wakeup_fd(w)
+        self._wakeup = r
+
+    # ---------- memory ----------
+
+    def sample_memory(self):
+        """Sample RSS into the current phase's peak and return it in MB"""
+        rss = current_rss_mb()
+        record = self._record
+        if record is not None and rss > record['peak_rss_mb']:
+            record['peak_rss_mb'] = round(rss, 1)
+        return rss
+
+    def memory_pressure(self):
+        """Current RSS as a fraction of the memory budget (0 without a budget)"""
+        if not self.memory_budget_mb:
+            return 0.0
+        return self.sample_memory() / self.memory_budget_mb
+
+    # ---------- phases ----------
+
+    def elapsed(self):
+        if self._phase_start is None:
+            return 0.0
+        return time.monotonic() - self._phase_start
+
+    def overran(self):
+        budget = self.budgets.get(self.current)
+        return budget is not None and self.elapsed() > budget
+
+    def check(self):
+        """Raise BuildCancelled/PhaseTimeout if the job should stop now."""
+        self.sample_memory()
+        if self.cancelled:
+            self.abort = ('cancelled', self.current, self.cancel_reason)
+            raise BuildCancelled(self.current, self.cancel_reason)
+        if self.overran():
+            budget, elapsed = self.budgets[self.current], self.elapsed()
+            self.abort = ('timeout', self.current, f"{elapsed:.1f}s > budget {budget:.1f}s")
+            raise PhaseTimeout(self.current, budget, elapsed)
+
+    @contextmanager
+    def phase(self, name):
+        """Time a phase, track its peak RSS and enforce its budget on entry and exit."""
+        self.check()
+        outer = (self.current, self._phase_start, self._record)
+        record = {'phase': name, 'seconds': None, 'peak_rss_mb': 0.0}
+        self.phases.append(record)
+        self.current, self._phase_start, self._record = name, time.monotonic(), record
+        try:
+            self.sample_memory()
+            yield record
+            self.check()
+        finally:
+            self.sample_memory()
+            record['seconds'] = round(self.elapsed(), 3)
+            self.current, self._phase_start, self._record = outer
+
+    @contextmanager
+    def blocking(self):
+        """Mark a long native call; the watchdog exits immediately inside it."""
+        self.check()
+        self._blocking = True
+        try:
+            yield
+        finally:
+            self._blocking = False
+        self.check()
+
+    # ---------- watchdog ----------
+
+    def start(self):
+        """Install signal handlers (main thread only) and start the watchdog."""
+        if threading.current_thread() is threading.main_thread():
+            self.install_signal_handlers()
+        self._watchdog = threading.Thread(target=self._watch, name='build-watchdog', daemon=True)
+        self._watchdog.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _drain_wakeup(self):
+        if self._wakeup is None:
+            return
+        try:
+            data = os.read(self._wakeup, 64)
+        except (BlockingIOError, OSError):
+            return
+        for signum in data:
+            self.cancel(f"signal {signal.Signals(signum).name}")
+
+    def _watch(self):
+        pending_since = None
+        while not self._stop.wait(self.poll_interval):
+            self._drain_wakeup()
+            self.sample_memory()
+            if self.cancelled:
+                kind, detail, code = 'cancelled', self.cancel_reason, EXIT_CANCELLED
+            elif self.overran():
+                budget = self.budgets[self.current]
+                kind, detail, code = 'timeout', f"{self.elapsed():.1f}s > budget {budget:.1f}s", EXIT_TIMEOUT
+            else:
+                pending_since = None
+                continue
+            if pending_since is None:
+                pending_since = time.monotonic()
+            # Outside blocking calls the main thread gets a chance to abort cleanly
+            if self.abort is None and (self._blocking or time.monotonic() - pending_since > GRACE_SECONDS):
+                self.abort = (kind, self.current, detail)
+                print(self.abort_message(), file=sys.stderr, flush=True)
+                if self.on_abort:
+                    try:
+                        self.on_abort()
+                    except Exception as e:
+                        print(f"⚠️  Could not finish after abort: {e}", file=sys.stderr, flush=True)
+                os._exit(code)
+
+    # ---------- reporting ----------
+
+    def abort_message(self):
+        kind, phase, detail = self.abort
+        if kind == 'timeout':
+            return f"❌ Timeout: phase '{phase}' overran ({detail})"
+        return f"❌ Cancelled during phase '{phase}' ({detail})"
+
+    def exit_code(self):
+        if self.abort and self.abort[0] == 'timeout':
+            return EXIT_TIMEOUT
+        return EXIT_CANCELLED
+
+    def summary(self):
+        """Phase timings, memory and abort status for job results."""
+        result = {
+            'phases': self.phases,
+            'status': 'ok',
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            'memory_budget_mb': self.memory_budget_mb,
+        }
+        if self.export_budget:
+            result['export_budget'] = self.export_budget
+        if self.abort:
+            kind, phase, detail = self.abort
+            result.update(status=kind, phase=phase, detail=detail)
+        return result
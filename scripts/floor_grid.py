@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Occupancy grid of a floorplan for fast spatial queries.
+
+A house is rasterized once into NumPy arrays of 10 cm cells: the room index
+of each cell, and masks for walls, door openings, the clearance kept free in
+front of doors and furniture footprints. Spatial questions asked by the
+builders then become array lookups instead of rectangle math over all rooms:
+
+    grid = FloorGrid(load_rooms(blueprint))
+    grid.room_at(2.0, 3.5)                          # Room or None
+    grid.free_floor_near(0.5, 6.0, room='living', clearance=0.3)
+    grid.is_exterior_edge(0, 0, 4.2, 0)
+    grid.line_of_sight((1.0, 1.0), (5.0, 3.0))
+    grid.viewpoint('living')                        # camera eye and target
+
+Coordinates in and out are metres; the grid itself is in integer
+millimetres (see house_layout).
+
+Plain Python + NumPy - no bpy.
+"""
+
+import math
+
+import numpy as np
+
+from house_layout import MM, WALL_SIDES, get_wall_mm, is_outdoor, load_rooms, room_bounds_mm, to_mm
+
+CELL_MM = 100
+
+# Builders' wall thickness
+WALL_THICKNESS_MM = 120
+
+# Floor kept free on both sides of a door
+DOOR_CLEARANCE_MM = 900
+
+# Empty cells around the house, so edges always have an outside
+PADDING_CELLS = 2
+
+class FloorGrid:
+    def __init__(self, rooms, cell_mm=CELL_MM):
+        self.rooms = list(rooms)
+        self.cell_mm = cell_mm
+        self._index = {room.id: n for n, room in enumerate(self.rooms)}
+
+        bounds = room_bounds_mm(self.rooms)
+        pad = PADDING_CELLS * cell_mm
+        if len(bounds):
+            low, high = bounds[:, :2].min(axis=0) - pad, bounds[:, 2:].max(axis=0) + pad
+        else:
+            low, high = np.array([-pad, -pad]), np.array([pad, pad])
+        self.origin_mm = low
+        nx, ny = (-(-(high - low) // cell_mm)).tolist()
+        # Cell centres in millimetres
+        self.xs = low[0] + (np.arange(nx) + 0.5) * cell_mm
+        self.ys = low[1] + (np.arange(ny) + 0.5) * cell_mm
+
+        self.room_index = np.full((ny, nx), -1, dtype=np.int32)
+        self.walls = np.zeros((ny, nx), dtype=bool)
+        self.doors = np.zeros((ny, nx), dtype=bool)
+        self.door_zone = np.zeros((ny, nx), dtype=bool)
+        self.furniture = np.zeros((ny, nx), dtype=bool)
+
+        # Outdoor rooms first, so indoor rooms win where they overlap
+        outdoor = [is_outdoor(room) for room in self.rooms]
+        for n in sorted(range(len(self.rooms)), key=lambda n: not outdoor[n]):
+            self.room_index[self._rect(*bounds[n])] = n
+        self.indoor = np.isin(self.room_index, [n for n, o in enumerate(outdoor) if not o])
+
+        half_wall = WALL_THICKNESS_MM // 2
+        for room, is_out in zip(self.rooms, outdoor):
+            if is_out:
+                continue
+            for side in WALL_SIDES:
+                self.walls |= self._band(*get_wall_mm(room, side), half_wall)
+            for door in room.doors:
+                opening = self._opening_mm(room, door)
+                if opening:
+                    self.doors |= self._band(*opening, half_wall + cell_mm)
+                    self.door_zone |= self._band(*opening, DOOR_CLEARANCE_MM)
+
+    @classmethod
+    def from_blueprint(cls, data, cell_mm=CELL_MM):
+        return cls(load_rooms(data), cell_mm)
+
+    # ============= RASTERIZATION =============
+
+    def _rect(self, x1, y1, x2, y2):
+        """Cells whose centre is inside [x1, x2] x [y1, y2] (millimetres)"""
+        cols = (self.xs >= min(x1, x2)) & (self.xs <= max(x1, x2))
+        rows = (self.ys >= min(y1, y2)) & (self.ys <= max(y1, y2))
+        return rows[:, None] & cols[None, :]
+
+    def _band(self, x1, y1, x2, y2, half_width):
+        """Cells within half_width of an axis-aligned segment"""
+        if y1 == y2:
+            return self._rect(x1, y1 - half_width, x2, y2 + half_width)
+        return self._rect(x1 - half_width, y1, x2 + half_width, y2)
+
+    @staticmethod
+    def _opening_mm(room, door):
+        """Door opening as a segment along its wall, clipped like the builders clip it"""
+        wall = get_wall_mm(room, door.get('wall'))
+        if not wall:
+            return None
+        x1, y1, x2, y2 = wall
+        length = abs(x2 - x1) + abs(y2 - y1)
+        center = door.get('position', 0.5) * length
+        start = max(50, center - to_mm(door.get('width', 0.9)) / 2)
+        end = min(length - 50, center + to_mm(door.get('width', 0.9)) / 2)
+        if end <= start:
+            return None
+        dx, dy = (x2 - x1) / length, (y2 - y1) / length
+        return (x1 + dx * start, y1 + dy * start, x1 + dx * end, y1 + dy * end)
+
+    # ============= LOOKUPS =============
+
+    def cells(self, points):
+        """(row, col) index arrays of points in metres, clipped to the grid"""
+        points = np.asarray(points, dtype=float).reshape(-1, 2) * MM
+        cols = np.clip(((points[:, 0] - self.origin_mm[0]) // self.cell_mm).astype(int), 0, len(self.xs) - 1)
+        rows = np.clip(((points[:, 1] - self.origin_mm[1]) // self.cell_mm).astype(int), 0, len(self.ys) - 1)
+        return rows, cols
+
+    def cell_center(self, row, col):
+        return (float(self.xs[col]) / MM, float(self.ys[row]) / MM)
+
+    def room_at(self, x, y):
+        rows, cols = self.cells((x, y))
+        n = self.room_index[rows[0], cols[0]]
+        return self.rooms[n] if n >= 0 else None
+
+    def room_mask(self, room):
+        return self.room_index == self._index[room]
+
+    def occupy(self, x, y, width, length):
+        """Mark a furniture footprint centred at (x, y) as taken"""
+        self.furniture |= self._rect(to_mm(x - width / 2), to_mm(y - length / 2),
+                                     to_mm(x + width / 2), to_mm(y + length / 2))
+
+    # ============= QUERIES =============
+
+    def free_floor(self, room=None, clearance=0.0):
+        """Mask of floor cells clear of walls, door clearances and furniture by `clearance` metres"""
+        blocked = self.walls | self.door_zone | self.furniture | (self.room_index < 0)
+        if room is not None:
+            blocked |= ~self.room_mask(room)
+        reach = math.ceil(clearance * MM / self.cell_mm)
+        return ~_dilate(blocked, reach)
+
+    def free_floor_near(self, x, y, room=None, clearance=0.0):
+        """Centre of the free floor cell nearest to (x, y), or None if there is none"""
+        rows, cols = np.nonzero(self.free_floor(room, clearance))
+        if not rows.size:
+            return None
+        d2 = (self.xs[cols] - x * MM) ** 2 + (self.ys[rows] - y * MM) ** 2
+        best = np.argmin(d2)
+        return self.cell_center(rows[best], cols[best])
+
+    def indoor_center(self):
+        """Indoor cell nearest the centroid of the indoor floor (the centroid itself may be outside)"""
+        rows, cols = np.nonzero(self.indoor)
+        if not rows.size:
+            return None
+        cx, cy = self.xs[cols].mean(), self.ys[rows].mean()
+        best = np.argmin((self.xs[cols] - cx) ** 2 + (self.ys[rows] - cy) ** 2)
+        return self.cell_center(rows[best], cols[best])
+
+    def is_exterior_edge(self, x1, y1, x2, y2):
+        """True if most of an edge has indoor floor on one side only"""
+        steps = max(2, math.ceil(math.hypot(x2 - x1, y2 - y1) * MM / self.cell_mm))
+        t = (np.arange(steps) + 0.5) / steps
+        points = np.column_stack([x1 + (x2 - x1) * t, y1 + (y2 - y1) * t])
+        length = math.hypot(x2 - x1, y2 - y1) or 1.0
+        offset = np.array([-(y2 - y1), x2 - x1]) / length * (WALL_THICKNESS_MM / 2 + self.cell_mm) / MM
+        inside_a = self.indoor[self.cells(points + offset)]
+        inside_b = self.indoor[self.cells(points - offset)]
+        return bool(np.mean(inside_a != inside_b) > 0.5)
+
+    def visible(self, origin, targets):
+        """For each target point, whether the straight line from origin crosses no wall (doors are open)"""
+        targets = np.asarray(targets, dtype=float).reshape(-1, 2)
+        origin = np.asarray(origin, dtype=float)
+        if not len(targets):
+            return np.zeros(0, dtype=bool)
+        longest = np.hypot(*(targets - origin).T).max()
+        # Half-cell steps so a wall one cell thick is never stepped over
+        steps = max(2, math.ceil(longest * MM / (self.cell_mm / 2)) + 1)
+        t = np.linspace(0.0, 1.0, steps)
+        samples = origin + (targets - origin)[:, None, :] * t[None, :, None]
+        rows, cols = self.cells(samples.reshape(-1, 2))
+        blocking = self.walls & ~self.doors
+        # The endpoints may sit inside a wall band (e.g. a point on a wall); only what lies between counts
+        hits = blocking[rows, cols].reshape(len(targets), steps)[:, 1:-1]
+        return ~hits.any(axis=1)
+
+    def line_of_sight(self, p0, p1):
+        return bool(self.visible(p0, [p1])[0])
+
+    def viewpoint(self, room, clearance=0.3, candidates=16):
+        """Camera (eye, target) in metres for an interior shot of a room.
+
+        The eye is the free floor cell that sees the most of the room's floor,
+        preferring cells far from the room centre (a corner looking across);
+        the target is the room's centre.
+        """
+        floor = self.room_mask(room)
+        rows, cols = np.nonzero(floor)
+        if not rows.size:
+            return None
+        target = (float(self.xs[cols].mean()) / MM, float(self.ys[rows].mean()) / MM)
+
+        free_rows, free_cols = np.nonzero(self.free_floor(room, clearance))
+        if not free_rows.size:
+            return (target, target)
+        eyes = np.column_stack([self.xs[free_cols], self.ys[free_rows]]) / MM
+        distance = np.hypot(*(eyes - target).T)
+        # Candidates spread over the distance ranking, farthest first
+        pick = np.argsort(-distance)[np.linspace(0, len(eyes) - 1, min(candidates, len(eyes))).astype(int)]
+        step = max(1, rows.size // 64)
+        floor_points = np.column_stack([self.xs[cols], self.ys[rows]])[::step] / MM
+        seen = np.array([self.visible(eyes[n], floor_points).sum() for n in pick])
+        best = pick[np.lexsort((-distance[pick], -seen))[0]]
+        return (tuple(eyes[best].tolist()), target)
+
+def _dilate(mask, reach):
+    """Grow a mask by `reach` cells in every direction (square neighbourhood)"""
+    if reach <= 0:
+        return mask
+    grown = mask.copy()
+    for axis in (0, 1):
+        layer = grown.copy()
+        for shift in range(1, reach + 1):
+            if axis == 0:
+                grown[shift:, :] |= layer[:-shift, :]
+                grown[:-shift, :] |= layer[shift:, :]
+            else:
+                grown[:, shift:] |= layer[:, :-shift]
+                grown[:, :-shift] |= layer[:, shift:]
+    return grown
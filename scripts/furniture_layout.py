@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Where the full-tier furniture of a room goes.
+
+Every piece of furniture is an item modelled once at its ITEM_SIZES
+footprint, standing on the floor around its origin. A room gets a list of
+placements: which item, where its origin goes and the width (x) and length
+(y) to stretch it to. render_house_v3 builds each placement from primitives
+or links it from the furniture library (furniture_library.py); both read
+the same placements, so they put the furniture in the same spots.
+
+    for placement in room_furniture(room):
+        print(placement.item, placement.x, placement.y, scale(placement))
+
+Decor (rugs, plants, umbrellas) and structure (pergolas, stairs) are not
+furniture items and stay with the builders.
+
+Prebuilt items (the .blend library and the per-item GLBs that
+glb_assemble.py splices into house GLBs) are named by LIBRARY_VERSION.
+
+Plain Python - no bpy.
+"""
+
+import os
+from collections import namedtuple
+
+# Bump when builder changes make prebuilt furniture (.blend library, item GLBs) stale
+LIBRARY_VERSION = 1
+
+# (width, length) each item is modelled at, metres along x and y
+ITEM_SIZES = {
+    'sofa': (2.2, 0.9),
+    'coffee_table': (0.9, 0.5),
+    'bed': (1.6, 2.0),
+    'nightstand': (0.4, 0.4),
+    'toilet': (0.4, 0.6),
+    'bathroom_sink': (0.5, 0.4),
+    'bathtub': (1.5, 0.7),
+    'kitchen_counter': (3.0, 0.6),
+    'kitchen_sink': (0.5, 0.4),
+    'lounger': (0.7, 1.8),
+}
+
+# name: object name in the scene; width/length: the size to stretch the item to
+Placement = namedtuple('Placement', 'item name x y width length')
+
+
+def place(item, name, x, y, width=None, length=None):
+    default_width, default_length = ITEM_SIZES[item]
+    return Placement(item, name, x, y, width or default_width, length or default_length)
+
+
+def scale(placement):
+    """(x, y, z) scale that stretches the modelled item to the placement's size"""
+    width, length = ITEM_SIZES[placement.item]
+    return (placement.width / width, placement.length / length, 1.0)
+
+
+def item_glb_path(directory, item):
+    """Pre-exported GLB of one item for the current library version"""
+    return os.path.join(os.path.abspath(directory), f"furniture-v{LIBRARY_VERSION}-{item}.glb")
+
+
+def room_furniture(room):
+    """Furniture placements for a room (a house_layout Room), by room type"""
+    cx, cy = room.center
+    if room.type == 'living':
+        return [place('sofa', 'Sofa', cx - 0.3, room.y + 1.2),
+                place('coffee_table', 'CoffeeTable', cx, cy)]
+    if room.type == 'bedroom':
+        return [place('bed', 'Bed', cx, room.y + room.length * 0.4)] + \
+               [place('nightstand', 'Nightstand', cx + side * 1.0, room.y + 0.6) for side in (-1, 1)]
+    if room.type == 'bathroom':
+        placements = [place('toilet', 'Toilet', room.x + 0.4, room.y + 0.5),
+                      place('bathroom_sink', 'Sink', room.x + room.width - 0.4, room.y + 0.4)]
+        # Bathtub only when the room is large enough
+        if room.length >= 2.0 and room.width >= 1.5:
+            placements.append(place('bathtub', 'Bathtub', room.x + room.width / 2, room.y2 - 0.5,
+                                    width=min(room.width - 0.3, 1.5)))
+        return placements
+    if room.type == 'kitchen':
+        # Counter along the back wall, with the sink set into it
+        return [place('kitchen_counter', 'KitchenCounter', cx, room.y + 0.4, width=min(room.width - 0.4, 3.0)),
+                place('kitchen_sink', 'KitchenSink', cx, room.y + 0.4)]
+    if room.type in ['deck', 'balcony']:
+        return [place('lounger', 'Lounger', room.x + offset, room.y + room.length * 0.6) for offset in (1.5, 3.0)]
+    # Hallways and stairs have no furniture
+    return []
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Prebuilt furniture, linked from a .blend library instead of built per job.
+
+The library holds one mesh per furniture item (furniture_layout.ITEM_SIZES),
+made once by joining the parts that render_house_v3's procedural builders
+create at the origin. Builds load the meshes with bpy.data.libraries.load
+and place each item as one object moved and stretched to its placement
+(see furniture_layout.py). Linked meshes are read from the library file
+and shared by every object that uses them, so furniture costs a handful of
+objects per house and no geometry work.
+
+Library files are named by furniture_layout.LIBRARY_VERSION, bumped when
+the builders change so stale libraries are rebuilt instead of reused:
+
+    path = library_path(cache_dir)          # .../furniture-v1.blend
+    meshes = load_library(path)             # {item: mesh}
+    place(meshes, placement)
+
+export_item_glbs writes each item as its own GLB for glb_assemble.py.
+"""
+
+import os
+
+import bpy
+
+import scene_outputs
+from furniture_layout import LIBRARY_VERSION, item_glb_path, scale
+
+# Item meshes in the library are named MESH_PREFIX + item
+MESH_PREFIX = "Furniture_"
+
+
+def library_path(directory):
+    """Library file for the current version in a directory"""
+    return os.path.join(os.path.abspath(directory), f"furniture-v{LIBRARY_VERSION}.blend")
+
+
+def write_library(path, parts):
+    """Join each item's parts into one mesh at the origin and save them as a library.
+
+    parts: {item: [mesh objects]} as the builders made them, positioned
+    around the origin. The item meshes and their materials are written.
+    """
+    meshes = set()
+    for item, objects in parts.items():
+        bpy.ops.object.select_all(action='DESELECT')
+        for obj in objects:
+            obj.select_set(True)
+        bpy.context.view_layer.objects.active = objects[0]
+        if len(objects) > 1:
+            bpy.ops.object.join()
+        # Bake the transforms so the mesh sits around the origin
+        bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
+        mesh = objects[0].data
+        mesh.name = MESH_PREFIX + item
+        meshes.add(mesh)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write next to the target and rename, so concurrent jobs never read half a file
+    temp_path = f"{path[:-len('.blend')]}-{os.getpid()}.blend"
+    bpy.data.libraries.write(temp_path, meshes, fake_user=True, compress=True)
+    os.replace(temp_path, path)
+    print(f"🪑 Furniture library saved: {path} ({len(meshes)} items)")
+
+
+def load_library(path, link=True):
+    """Load every item mesh of a library; returns {item: mesh}.
+
+    With link the meshes (and their materials) stay in the library file;
+    otherwise they are appended, so a saved .blend does not need the library.
+    """
+    with bpy.data.libraries.load(path, link=link) as (data_from, data_to):
+        names = [name for name in data_from.meshes if name.startswith(MESH_PREFIX)]
+        data_to.meshes = list(names)
+    print(f"📚 Furniture library {'linked' if link else 'appended'}: {path}")
+    # Appended meshes may have been renamed; the requested names still say which item is which
+    return {name[len(MESH_PREFIX):]: mesh for name, mesh in zip(names, data_to.meshes) if mesh}
+
+
+def place(meshes, placement):
+    """Object using the placement's item mesh, moved and stretched to the placement"""
+    obj = bpy.data.objects.new(placement.name, meshes[placement.item])
+    obj.location = (placement.x, placement.y, 0)
+    obj.scale = scale(placement)
+    bpy.context.collection.objects.link(obj)
+    return obj
+
+
+def export_item_glbs(meshes, directory):
+    """Export each item at the origin as its own GLB (furniture_layout.item_glb_path); returns {item: path}"""
+    paths = {}
+    for item, mesh in meshes.items():
+        path = paths[item] = item_glb_path(directory, item)
+        if os.path.exists(path):
+            continue
+        obj = bpy.data.objects.new(MESH_PREFIX + item, mesh)
+        bpy.context.collection.objects.link(obj)
+        bpy.ops.object.select_all(action='DESELECT')
+        obj.select_set(True)
+        # Write next to the target and rename, as for the library
+        temp_path = f"{path[:-len('.glb')]}-{os.getpid()}.glb"
+        # Optimized once here, since the assembler copies the item data as it is
+        scene_outputs.export_glb(temp_path, optimize=True, selected=True)
+        os.replace(temp_path, path)
+        bpy.data.objects.remove(obj)
+    return paths
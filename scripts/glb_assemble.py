@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+House GLBs assembled from a furniture-free house GLB and pre-exported
+furniture GLBs.
+
+Blender's exporter re-encodes the same sofa for every house. Instead, each
+furniture item is exported once per library version to its own GLB
+(furniture_library.export_item_glbs, named by furniture_layout.item_glb_path),
+and houses are exported without their furniture. The assembler splices
+each item GLB used by the house into the house's BIN chunk unchanged and
+adds one node per placement, moved and stretched by the same placements
+render_house_v3 builds from (furniture_layout.room_furniture). Only the
+house itself goes through the exporter per job.
+
+Materials of an item that the house already has (same name and the same
+definition) are shared; the others are added. Items with textures are not
+supported, since the library has none.
+
+With a shared asset directory, item data is not copied into the house at
+all: each item's BIN chunk is written once to that directory as a
+versioned, content-hashed .bin (shared_buffer) and the house references
+it by URI as an extra glTF buffer. Every house then points at the same
+files, so a CDN and the browser cache serve them once per user instead of
+once per house. The URI is relative to the house file, or under a base
+URL when the assets are served from elsewhere. Materials are a few lines
+of JSON per house and stay inline.
+
+    python3 glb_assemble.py house.glb blueprint.json furniture_dir [out.glb] [--shared DIR] [--shared-url URL]
+
+Plain Python + NumPy - no bpy.
+"""
+
+import hashlib
+import os
+import sys
+
+import numpy as np
+
+from blueprint_check import load_blueprint
+from build_control import option_value
+from furniture_layout import LIBRARY_VERSION, item_glb_path, room_furniture, scale
+from glb_optimize import read_accessor
+from glb_tools import build_glb, parse_glb, read_glb
+from house_layout import load_rooms
+
+
+def _single_buffer(gltf, what):
+    if len(gltf.get('buffers', [])) > 1 or any(b.get('uri') for b in gltf.get('buffers', [])):
+        raise ValueError(f"{what}: only single-buffer GLBs can be assembled")
+
+
+def shared_buffer(binary, item, directory):
+    """Write an item's BIN data to a content-hashed file in directory, unless it is there already; returns its path"""
+    digest = hashlib.sha256(binary).hexdigest()[:16]
+    path = os.path.join(os.path.abspath(directory), f"furniture-v{LIBRARY_VERSION}-{item}-{digest}.bin")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        # Write next to the target and rename, so concurrent jobs never serve half a file
+        temp_path = f"{path}.{os.getpid()}"
+        with open(temp_path, 'wb') as f:
+            f.write(binary)
+        os.replace(temp_path, path)
+    return path
+
+
+def splice_mesh(gltf, blob, part, name, uri=None):
+    """Append the mesh of a one-mesh GLB (part = (gltf, binary)) to gltf/blob; returns its mesh index.
+
+    With uri, the part's BIN data stays out of blob: it is referenced as an
+    external buffer at that URI instead.
+    """
+    part_gltf, part_binary = part
+    _single_buffer(part_gltf, name)
+    if part_gltf.get('textures') or part_gltf.get('images'):
+        raise ValueError(f"{name}: furniture GLBs with textures are not supported")
+    if len(part_gltf.get('meshes', [])) != 1:
+        raise ValueError(f"{name}: expected one mesh, found {len(part_gltf.get('meshes', []))}")
+
+    # Buffer views point into the part's BIN chunk, now appended to ours or an external buffer
+    buffers = gltf.setdefault('buffers', [])
+    if uri is None:
+        if not buffers or 'uri' in buffers[0]:
+            # A GLB's BIN chunk is buffer 0; make room for it before any external buffers
+            buffers.insert(0, {'byteLength': 0})
+            for view in gltf.get('bufferViews', []):
+                view['buffer'] += 1
+        blob.extend(b'\0' * (-len(blob) % 4))
+        buffer, base = 0, len(blob)
+        blob.extend(part_binary)
+    else:
+        # Without a BIN chunk the external buffers come first
+        buffer, base = len(buffers), 0
+        buffers.append({'uri': uri, 'byteLength': len(part_binary)})
+    views = gltf.setdefault('bufferViews', [])
+    view_base = len(views)
+    for view in part_gltf.get('bufferViews', []):
+        views.append(dict(view, buffer=buffer, byteOffset=base + view.get('byteOffset', 0)))
+
+    accessors = gltf.setdefault('accessors', [])
+    accessor_base = len(accessors)
+    for accessor in part_gltf.get('accessors', []):
+        accessor = dict(accessor)
+        if 'bufferView' in accessor:
+            accessor['bufferView'] += view_base
+        if 'sparse' in accessor:
+            accessor['sparse'] = {key: dict(value, bufferView=value['bufferView'] + view_base)
+                                  if key in ('indices', 'values') else value
+                                  for key, value in accessor['sparse'].items()}
+        accessors.append(accessor)
+
+    materials = gltf.setdefault('materials', [])
+    material_index = []
+    for material in part_gltf.get('materials', []):
+        if material in materials:
+            material_index.append(materials.index(material))
+        else:
+            material_index.append(len(materials))
+            materials.append(material)
+
+    mesh = dict(part_gltf['meshes'][0])
+    primitives = []
+    for primitive in mesh['primitives']:
+        primitive = dict(primitive, attributes={k: v + accessor_base for k, v in primitive['attributes'].items()})
+        if 'indices' in primitive:
+            primitive['indices'] += accessor_base
+        if 'material' in primitive:
+            primitive['material'] = material_index[primitive['material']]
+        if 'targets' in primitive:
+            primitive['targets'] = [{k: v + accessor_base for k, v in target.items()}
+                                    for target in primitive['targets']]
+        primitives.append(primitive)
+    mesh['primitives'] = primitives
+
+    for extension in part_gltf.get('extensionsUsed', []):
+        if extension not in gltf.setdefault('extensionsUsed', []):
+            gltf['extensionsUsed'].append(extension)
+    gltf.setdefault('meshes', []).append(mesh)
+    return len(gltf['meshes']) - 1
+
+
+def assemble(gltf, binary, placements, items, uris=None):
+    """Add furniture to a parsed house GLB; returns (gltf, binary, stats).
+
+    placements: [(room id, furniture_layout.Placement)]; items: {item: (gltf,
+    binary) of its GLB}. Each item's mesh is added once, however many
+    placements use it. uris: {item: URI of its shared .bin} to reference
+    item data instead of copying it.
+    """
+    _single_buffer(gltf, "house")
+    uris = uris or {}
+    blob = bytearray(binary)
+    meshes = {}
+    nodes = gltf.setdefault('nodes', [])
+    scene = gltf.setdefault('scenes', [{'nodes': []}])[gltf.get('scene', 0)]
+    for room_id, placement in placements:
+        if placement.item not in meshes:
+            meshes[placement.item] = splice_mesh(gltf, blob, items[placement.item], placement.item,
+                                                 uris.get(placement.item))
+        # glTF is Y-up: Blender's (x, y, z) is (x, z, -y)
+        sx, sy, sz = scale(placement)
+        scene.setdefault('nodes', []).append(len(nodes))
+        nodes.append({
+            'name': placement.name,
+            'mesh': meshes[placement.item],
+            'translation': [placement.x, 0.0, -placement.y],
+            'scale': [sx, sz, sy],
+            # Same room tag the builder gives its objects (scene_stats.tag_objects)
+            'extras': {'room_id': room_id},
+        })
+    if blob:
+        gltf['buffers'][0]['byteLength'] = len(blob)
+    stats = {'items': len(meshes), 'nodes': len(placements), 'bytes_added': len(blob) - len(binary),
+             'shared_bytes': sum(b['byteLength'] for b in gltf.get('buffers', []) if b.get('uri'))}
+    return gltf, bytes(blob), stats
+
+
+def assemble_glb(path, placements, directory, output_path=None, shared_dir=None, shared_url=None):
+    """Add furniture from the item GLBs in a directory to a house GLB (in place unless output_path is given).
+
+    With shared_dir, item data goes to content-hashed .bin files there,
+    referenced relative to the house file or under shared_url.
+    """
+    output_path = output_path or path
+    items = {item: read_glb(item_glb_path(directory, item)) for item in {p.item for _, p in placements}}
+    uris = {}
+    if shared_dir:
+        for item, (_, binary) in items.items():
+            shared_path = shared_buffer(binary, item, shared_dir)
+            if shared_url:
+                uris[item] = f"{shared_url.rstrip('/')}/{os.path.basename(shared_path)}"
+            else:
+                relative = os.path.relpath(shared_path, os.path.dirname(os.path.abspath(output_path)))
+                uris[item] = relative.replace(os.sep, '/')
+    with open(path, 'rb') as f:
+        gltf, binary, stats = assemble(*parse_glb(f.read()), placements, items, uris)
+    out = build_glb(gltf, binary)
+    with open(output_path, 'wb') as f:
+        f.write(out)
+    stats['bytes'] = len(out)
+    print(f"🧩 Furniture spliced: {stats['nodes']} pieces from {stats['items']} items, "
+          f"+{stats['bytes_added'] // 1024} KB" + (f", {stats['shared_bytes'] // 1024} KB shared" if uris else ""))
+    return stats
+
+
+def item_counts(part):
+    """(mesh name, vertices, triangles, material names) of a one-mesh item GLB.
+
+    Vertices are distinct positions, as Blender counts them: the GLB splits
+    them wherever normals or materials differ.
+    """
+    gltf, binary = part
+    accessors = gltf.get('accessors', [])
+    mesh = gltf['meshes'][0]
+    primitives = mesh['primitives']
+    positions = [read_accessor(gltf, binary, p['attributes']['POSITION']) for p in primitives]
+    vertices = len(np.unique(np.concatenate(positions), axis=0)) if positions else 0
+    triangles = sum(accessors[p['indices']]['count'] // 3 for p in primitives if 'indices' in p)
+    materials = {gltf['materials'][p['material']].get('name', '') for p in primitives if 'material' in p}
+    return mesh.get('name', ''), vertices, triangles, materials
+
+
+def spliced_meshes(placements, directory):
+    """(room id, mesh name, vertices, triangles, material names) per placement, for scene_stats.
+
+    Spliced furniture never is in the Blender scene, so the scene counts
+    take it from here.
+    """
+    counts = {item: item_counts(read_glb(item_glb_path(directory, item)))
+              for item in {p.item for _, p in placements}}
+    return [(room_id, *counts[placement.item]) for room_id, placement in placements]
+
+
+def blueprint_placements(data):
+    """[(room id, placement)] of every room's furniture, for a blueprint built with full furniture"""
+    return [(room.id, placement) for room in load_rooms(data) for placement in room_furniture(room)]
+
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    paths = [arg for n, arg in enumerate(argv) if not arg.startswith('--')
+             and (n == 0 or argv[n - 1] not in ('--shared', '--shared-url'))]
+    if len(paths) < 3:
+        print("Usage: python3 glb_assemble.py house.glb blueprint.json furniture_dir [out.glb] "
+              "[--shared DIR] [--shared-url URL]")
+        sys.exit(1)
+    try:
+        assemble_glb(paths[0], blueprint_placements(load_blueprint(paths[1])), paths[2],
+                     paths[3] if len(paths) > 3 else None,
+                     option_value(argv, '--shared'), option_value(argv, '--shared-url'))
+    except (OSError, ValueError) as e:
+        print(f"❌ {os.path.basename(paths[0])}: {e}")
+        sys.exit(1)
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+GLB post-processing for faster client rendering and smaller files.
+
+Blender's glTF exporter writes vertices in whatever order the mesh had
+them, near-duplicates included, and triangles in face order, plus UVs
+that no material samples. For every triangle primitive this pass:
+
+- strips attributes nothing reads: TEXCOORD_n no material texture uses,
+  and TANGENT without a normal map;
+- welds vertices whose attributes agree within WELD_TOLERANCE (per
+  attribute kind), and drops the triangles that collapse;
+- reorders triangles for the post-transform vertex cache (Tipsify, Sander
+  et al. 2007);
+- renumbers vertices in first-use order, so vertex fetch reads forward
+  through memory, and writes the smallest index type that fits.
+
+Accessors and buffer views nothing references any more are dropped, and
+the BIN chunk is repacked; buffer views that extensions point at (Draco
+primitives, embedded images) are kept and renumbered. Primitives with
+morph targets or extensions are left as they are. Files with more than one
+buffer, or with meshopt compression (which addresses the buffer by offset,
+not through buffer views), are refused.
+
+Works on single-buffer GLBs from any source, so it runs on the web side as
+well as right after the Blender export (scene_outputs.export_glb(path,
+optimize=True)):
+
+    python3 glb_optimize.py model.glb [out.glb]
+
+Plain Python + NumPy - no bpy.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from glb_tools import parse_glb, build_glb
+
+COMPONENT_DTYPES = {5120: np.int8, 5121: np.uint8, 5122: np.int16, 5123: np.uint16, 5125: np.uint32,
+                    5126: np.float32}
+TYPE_SIZES = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4, 'MAT2': 4, 'MAT3': 9, 'MAT4': 16}
+UNSIGNED_BYTE, UNSIGNED_SHORT, UNSIGNED_INT = 5121, 5123, 5125
+ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER = 34962, 34963
+TRIANGLES = 4
+
+# Float attributes closer than this are the same vertex (metres for POSITION)
+WELD_TOLERANCE = {'POSITION': 1e-5, 'NORMAL': 1e-3, 'TANGENT': 1e-3, 'TEXCOORD': 1e-5, 'COLOR': 1 / 512}
+
+# Extensions whose data is addressed by buffer offset, which repacking would break
+OFFSET_EXTENSIONS = {'EXT_meshopt_compression', 'KHR_meshopt_compression'}
+
+# Post-transform cache size Tipsify optimizes for and the cache miss ratio is measured with
+CACHE_SIZE = 16
+
+
+# ============= ACCESSORS =============
+
+def read_accessor(gltf, binary, index):
+    """Accessor data as an (count, components) array, or None when it is sparse or has no data"""
+    accessor = gltf['accessors'][index]
+    if 'sparse' in accessor or 'bufferView' not in accessor:
+        return None
+    view = gltf['bufferViews'][accessor['bufferView']]
+    dtype = np.dtype(COMPONENT_DTYPES[accessor['componentType']])
+    components = TYPE_SIZES[accessor['type']]
+    count = accessor['count']
+    size = dtype.itemsize * components
+    if not count:
+        return np.zeros((0, components), dtype=dtype)
+    start = view.get('byteOffset', 0) + accessor.get('byteOffset', 0)
+    stride = view.get('byteStride') or size
+    raw = np.frombuffer(binary, dtype=np.uint8, count=stride * (count - 1) + size, offset=start)
+    if stride == size:
+        return raw.view(dtype).reshape(count, components).copy()
+    # Interleaved: gather each element's bytes first
+    rows = np.lib.stride_tricks.as_strided(raw, shape=(count, size), strides=(stride, 1))
+    return rows.copy().view(dtype).reshape(count, components)
+
+
+def _append_accessor(gltf, blob, array, template, target):
+    """Add array as a new accessor (in its own buffer view at the end of blob); returns its index"""
+    blob.extend(b'\0' * (-len(blob) % 4))
+    data = np.ascontiguousarray(array).tobytes()
+    view = {'buffer': 0, 'byteOffset': len(blob), 'byteLength': len(data), 'target': target}
+    blob.extend(data)
+    gltf['bufferViews'].append(view)
+
+    accessor = {key: value for key, value in template.items()
+                if key not in ('bufferView', 'byteOffset', 'count', 'min', 'max', 'sparse')}
+    accessor.update(bufferView=len(gltf['bufferViews']) - 1, count=len(array))
+    if 'min' in template and len(array):
+        accessor['min'] = array.min(axis=0).tolist()
+        accessor['max'] = array.max(axis=0).tolist()
+    gltf['accessors'].append(accessor)
+    return len(gltf['accessors']) - 1
+
+
+# ============= ATTRIBUTES =============
+
+def _texture_coords(material):
+    """TEXCOORD sets a material's textures sample (core and extension textures alike)"""
+    sets = set()
+
+    def walk(node):
+        for key, value in node.items():
+            if not isinstance(value, dict):
+                continue
+            if key.endswith('Texture') and 'index' in value:
+                transform = value.get('extensions', {}).get('KHR_texture_transform', {})
+                sets.add(transform.get('texCoord', value.get('texCoord', 0)))
+            else:
+                walk(value)
+
+    walk(material)
+    return sets
+
+
+def unused_attributes(gltf, primitive):
+    """Attribute semantics of a primitive that no part of its material reads"""
+    materials = gltf.get('materials', [])
+    material = materials[primitive['material']] if 'material' in primitive else {}
+    sets = _texture_coords(material)
+    unused = []
+    for semantic in primitive['attributes']:
+        if semantic.startswith('TEXCOORD_') and int(semantic[9:]) not in sets:
+            unused.append(semantic)
+        elif semantic == 'TANGENT' and 'normalTexture' not in material:
+            unused.append(semantic)
+    return unused
+
+
+# ============= WELDING =============
+
+def weld(attributes, indices):
+    """Merge vertices whose attributes match within WELD_TOLERANCE; returns (attributes, indices)"""
+    keys = []
+    for semantic, data in attributes.items():
+        if data.dtype.kind == 'f':
+            tolerance = WELD_TOLERANCE.get(semantic.split('_')[0], 1e-5)
+            keys.append(np.round(data / tolerance).astype(np.int64))
+        else:
+            keys.append(data.astype(np.int64))
+    _, first, remap = np.unique(np.hstack(keys), axis=0, return_index=True, return_inverse=True)
+    remap = remap.reshape(-1)
+    triangles = remap[indices].reshape(-1, 3)
+    solid = ((triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2])
+             & (triangles[:, 2] != triangles[:, 0]))
+    return {semantic: data[first] for semantic, data in attributes.items()}, triangles[solid].reshape(-1)
+
+
+# ============= ORDERING =============
+
+def tipsify(indices, vertex_count, cache_size=CACHE_SIZE):
+    """Triangle order for a FIFO vertex cache (Sander, Nehab and Barczak 2007); returns the new indices"""
+    triangles = indices.reshape(-1, 3)
+    if not len(triangles):
+        return indices
+    # Triangles around each vertex
+    corner_vertices = triangles.reshape(-1)
+    order = np.argsort(corner_vertices, kind='stable')
+    starts = np.concatenate([[0], np.cumsum(np.bincount(corner_vertices, minlength=vertex_count))]).tolist()
+    around = (order // 3).tolist()
+
+    live = np.bincount(corner_vertices, minlength=vertex_count).tolist()
+    cache_time = [0] * vertex_count
+    emitted = [False] * len(triangles)
+    tris = triangles.tolist()
+    dead_end = []
+    output = []
+    stamp = cache_size + 1
+    cursor = 0
+    vertex = 0
+    while vertex >= 0:
+        candidates = []
+        for t in around[starts[vertex]:starts[vertex + 1]]:
+            if emitted[t]:
+                continue
+            for v in tris[t]:
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if stamp - cache_time[v] > cache_size:
+                    cache_time[v] = stamp
+                    stamp += 1
+            emitted[t] = True
+            output.append(t)
+
+        # Next fanning vertex: a candidate still in cache after its remaining triangles, oldest first
+        vertex, best = -1, -1
+        for v in candidates:
+            if live[v] > 0:
+                priority = 0
+                if stamp - cache_time[v] + 2 * live[v] <= cache_size:
+                    priority = stamp - cache_time[v]
+                if priority > best:
+                    vertex, best = v, priority
+        if vertex < 0:
+            while dead_end:
+                v = dead_end.pop()
+                if live[v] > 0:
+                    vertex = v
+                    break
+        if vertex < 0:
+            while cursor < vertex_count and live[cursor] == 0:
+                cursor += 1
+            vertex = cursor if cursor < vertex_count else -1
+    return triangles[output].reshape(-1)
+
+
+def fetch_order(attributes, indices):
+    """Renumber vertices in order of first use; unused vertices are dropped"""
+    _, first = np.unique(indices, return_index=True)
+    used = indices[np.sort(first)]
+    remap = np.zeros(len(attributes['POSITION']), dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    return {semantic: data[used] for semantic, data in attributes.items()}, remap[indices]
+
+
+def cache_miss_ratio(indices, cache_size=CACHE_SIZE):
+    """Average vertex transforms per triangle with a FIFO cache (ACMR; 3.0 is no reuse)"""
+    if not len(indices):
+        return 0.0
+    cache = []
+    misses = 0
+    for v in indices.tolist():
+        if v not in cache:
+            misses += 1
+            cache.append(v)
+            if len(cache) > cache_size:
+                cache.pop(0)
+    return misses / (len(indices) // 3)
+
+
+# ============= REPACKING =============
+
+def _referenced_accessors(gltf):
+    refs = set()
+    for mesh in gltf.get('meshes', []):
+        for primitive in mesh.get('primitives', []):
+            refs.update(primitive.get('attributes', {}).values())
+            if 'indices' in primitive:
+                refs.add(primitive['indices'])
+            for target in primitive.get('targets', []):
+                refs.update(target.values())
+    for skin in gltf.get('skins', []):
+        if 'inverseBindMatrices' in skin:
+            refs.add(skin['inverseBindMatrices'])
+    for animation in gltf.get('animations', []):
+        for sampler in animation.get('samplers', []):
+            refs.update((sampler['input'], sampler['output']))
+    for node in gltf.get('nodes', []):
+        refs.update(_instancing(node).values())
+    return refs
+
+
+def _instancing(node):
+    # Per-instance attribute accessors of EXT_mesh_gpu_instancing
+    return node.get('extensions', {}).get('EXT_mesh_gpu_instancing', {}).get('attributes', {})
+
+
+def _remap_accessors(gltf, remap):
+    for mesh in gltf.get('meshes', []):
+        for primitive in mesh.get('primitives', []):
+            primitive['attributes'] = {k: remap[v] for k, v in primitive.get('attributes', {}).items()}
+            if 'indices' in primitive:
+                primitive['indices'] = remap[primitive['indices']]
+            primitive_targets = primitive.get('targets')
+            if primitive_targets:
+                primitive['targets'] = [{k: remap[v] for k, v in target.items()} for target in primitive_targets]
+    for skin in gltf.get('skins', []):
+        if 'inverseBindMatrices' in skin:
+            skin['inverseBindMatrices'] = remap[skin['inverseBindMatrices']]
+    for animation in gltf.get('animations', []):
+        for sampler in animation.get('samplers', []):
+            sampler['input'], sampler['output'] = remap[sampler['input']], remap[sampler['output']]
+    for node in gltf.get('nodes', []):
+        attributes = _instancing(node)
+        for semantic, index in attributes.items():
+            attributes[semantic] = remap[index]
+
+
+def _extension_view_owners(node, inside=False):
+    """Objects inside any 'extensions' that name a buffer view, e.g. KHR_draco_mesh_compression"""
+    if isinstance(node, dict):
+        if inside and isinstance(node.get('bufferView'), int):
+            yield node
+        for key, value in node.items():
+            yield from _extension_view_owners(value, inside or key == 'extensions')
+    elif isinstance(node, list):
+        for value in node:
+            yield from _extension_view_owners(value, inside)
+
+
+def compact(gltf, binary):
+    """Drop unreferenced accessors and buffer views and repack the buffer; returns the new BIN bytes"""
+    keep = sorted(_referenced_accessors(gltf))
+    remap = {old: new for new, old in enumerate(keep)}
+    gltf['accessors'] = [gltf['accessors'][i] for i in keep]
+    _remap_accessors(gltf, remap)
+
+    view_refs = []
+    for accessor in gltf['accessors']:
+        if 'bufferView' in accessor:
+            view_refs.append((accessor, 'bufferView'))
+        for part in ('indices', 'values'):
+            if part in accessor.get('sparse', {}):
+                view_refs.append((accessor['sparse'][part], 'bufferView'))
+    for image in gltf.get('images', []):
+        if 'bufferView' in image:
+            view_refs.append((image, 'bufferView'))
+    view_refs.extend((owner, 'bufferView') for owner in _extension_view_owners(gltf))
+
+    views = {}
+    packed = bytearray()
+    new_views = []
+    for owner, key in view_refs:
+        old = owner[key]
+        if old not in views:
+            view = dict(gltf['bufferViews'][old])
+            start = view.get('byteOffset', 0)
+            packed.extend(b'\0' * (-len(packed) % 4))
+            view['byteOffset'] = len(packed)
+            packed.extend(binary[start:start + view['byteLength']])
+            views[old] = len(new_views)
+            new_views.append(view)
+        owner[key] = views[old]
+    # glTF allows neither empty arrays nor empty buffers
+    for key, items in (('accessors', gltf['accessors']), ('bufferViews', new_views)):
+        if items:
+            gltf[key] = items
+        else:
+            gltf.pop(key, None)
+    if packed:
+        gltf.setdefault('buffers', [{}])[0]['byteLength'] = len(packed)
+    else:
+        gltf.pop('buffers', None)
+    return bytes(packed)
+
+
+# ============= OPTIMIZE =============
+
+def _optimizable(gltf, primitive):
+    return (primitive.get('mode', TRIANGLES) == TRIANGLES and 'targets' not in primitive
+            and 'extensions' not in primitive and 'POSITION' in primitive.get('attributes', {}))
+
+
+def optimize_primitive(gltf, binary, blob, primitive):
+    """Strip, weld and reorder one primitive in place (new accessors go to blob); returns its stats or None"""
+    attributes = {}
+    for semantic, index in primitive['attributes'].items():
+        data = read_accessor(gltf, binary, index)
+        if data is None:
+            return None
+        attributes[semantic] = data
+    vertex_count = len(attributes['POSITION'])
+    if 'indices' in primitive:
+        indices = read_accessor(gltf, binary, primitive['indices'])
+        if indices is None:
+            return None
+        indices = indices.reshape(-1).astype(np.int64)
+    else:
+        indices = np.arange(vertex_count, dtype=np.int64)
+    indices = indices[:len(indices) - len(indices) % 3]
+    before = {'vertices': vertex_count, 'triangles': len(indices) // 3, 'acmr': cache_miss_ratio(indices)}
+
+    stripped = unused_attributes(gltf, primitive)
+    for semantic in stripped:
+        del attributes[semantic]
+    attributes, indices = weld(attributes, indices)
+    indices = tipsify(indices, len(attributes['POSITION']))
+    attributes, indices = fetch_order(attributes, indices)
+
+    templates = {semantic: gltf['accessors'][index] for semantic, index in primitive['attributes'].items()}
+    primitive['attributes'] = {semantic: _append_accessor(gltf, blob, data, templates[semantic], ARRAY_BUFFER)
+                               for semantic, data in attributes.items()}
+    # Smallest index type that fits (the largest value of each is reserved for primitive restart)
+    vertex_count = len(attributes['POSITION'])
+    component = (UNSIGNED_BYTE if vertex_count < 0xFF else UNSIGNED_SHORT if vertex_count < 0xFFFF
+                 else UNSIGNED_INT)
+    primitive['indices'] = _append_accessor(
+        gltf, blob, indices.astype(COMPONENT_DTYPES[component]).reshape(-1, 1),
+        {'componentType': component, 'type': 'SCALAR'}, ELEMENT_ARRAY_BUFFER)
+    return {'before': before, 'stripped': stripped,
+            'after': {'vertices': vertex_count, 'triangles': len(indices) // 3,
+                      'acmr': cache_miss_ratio(indices)}}
+
+
+def optimize(gltf, binary):
+    """Optimize every triangle primitive of a parsed GLB; returns (gltf, binary, stats)"""
+    if len(gltf.get('buffers', [])) > 1 or any(b.get('uri') for b in gltf.get('buffers', [])):
+        raise ValueError("Only single-buffer GLBs can be optimized")
+    compressed = OFFSET_EXTENSIONS & set(gltf.get('extensionsUsed', []))
+    if compressed:
+        raise ValueError(f"GLBs using {', '.join(sorted(compressed))} cannot be optimized")
+    blob = bytearray(binary)
+    totals = {'primitives': 0, 'skipped': 0, 'stripped': {}}
+    for key in ('vertices', 'triangles', 'acmr'):
+        totals[key] = [0, 0]
+    for mesh in gltf.get('meshes', []):
+        for primitive in mesh.get('primitives', []):
+            stats = optimize_primitive(gltf, binary, blob, primitive) if _optimizable(gltf, primitive) else None
+            if stats is None:
+                totals['skipped'] += 1
+                continue
+            totals['primitives'] += 1
+            for n, side in enumerate(('before', 'after')):
+                totals['vertices'][n] += stats[side]['vertices']
+                totals['triangles'][n] += stats[side]['triangles']
+                # Weighted by triangles, so the total is the ACMR of the whole file
+                totals['acmr'][n] += stats[side]['acmr'] * stats[side]['triangles']
+            for semantic in stats['stripped']:
+                totals['stripped'][semantic] = totals['stripped'].get(semantic, 0) + 1
+    totals['acmr'] = [round(acmr / max(triangles, 1), 3)
+                      for acmr, triangles in zip(totals['acmr'], totals['triangles'])]
+    return gltf, compact(gltf, bytes(blob)), totals
+
+
+def optimize_glb(path, output_path=None):
+    """Optimize a GLB file (in place unless output_path is given); returns the stats"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    gltf, binary, stats = optimize(*parse_glb(data))
+    out = build_glb(gltf, binary)
+    with open(output_path or path, 'wb') as f:
+        f.write(out)
+    stats['bytes'] = [len(data), len(out)]
+    print(f"🧹 GLB optimized: {stats['vertices'][0]} -> {stats['vertices'][1]} vertices, "
+          f"ACMR {stats['acmr'][0]} -> {stats['acmr'][1]}, {len(data) // 1024} -> {len(out) // 1024} KB")
+    return stats
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 glb_optimize.py model.glb [out.glb]")
+        sys.exit(1)
+    try:
+        optimize_glb(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    except (OSError, ValueError) as e:
+        print(f"❌ {os.path.basename(sys.argv[1])}: {e}")
+        sys.exit(1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Plain-Python helpers for binary glTF (.glb) files produced by the Blender scripts.
+
+No bpy import, so these also run on the render queue / web side.
+Usage: python3 glb_tools.py model.glb   (prints the buffer view breakdown)
+"""
+
+import json
+import struct
+import sys
+
+GLB_MAGIC = 0x46546C67   # 'glTF'
+CHUNK_JSON = 0x4E4F534A  # 'JSON'
+CHUNK_BIN = 0x004E4942   # 'BIN\0'
+
+
+def read_glb(path):
+    """Return (gltf_json, bin_bytes) for a GLB file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return parse_glb(data)
+
+
+def parse_glb(data):
+    magic, version, length = struct.unpack_from('<III', data, 0)
+    if magic != GLB_MAGIC:
+        raise ValueError("Not a GLB file")
+    if version != 2:
+        raise ValueError(f"Unsupported GLB version {version}")
+
+    gltf, binary = None, b''
+    offset = 12
+    while offset < length:
+        chunk_len, chunk_type = struct.unpack_from('<II', data, offset)
+        chunk = data[offset + 8:offset + 8 + chunk_len]
+        if chunk_type == CHUNK_JSON:
+            gltf = json.loads(chunk.decode('utf-8'))
+        elif chunk_type == CHUNK_BIN:
+            binary = bytes(chunk)
+        offset += 8 + chunk_len
+    if gltf is None:
+        raise ValueError("GLB has no JSON chunk")
+    return gltf, binary
+
+
+def build_glb(gltf, binary):
+    """Serialize glTF JSON and a BIN chunk into GLB bytes"""
+    json_chunk = json.dumps(gltf, separators=(',', ':')).encode('utf-8')
+    json_chunk += b' ' * (-len(json_chunk) % 4)
+    chunks = struct.pack('<II', len(json_chunk), CHUNK_JSON) + json_chunk
+    if binary:
+        bin_chunk = bytes(binary) + b'\0' * (-len(binary) % 4)
+        chunks += struct.pack('<II', len(bin_chunk), CHUNK_BIN) + bin_chunk
+    return struct.pack('<III', GLB_MAGIC, 2, 12 + len(chunks)) + chunks
+
+
+def write_glb(path, gltf, binary):
+    with open(path, 'wb') as f:
+        f.write(build_glb(gltf, binary))
+
+
+def buffer_view_usage(gltf):
+    """Map bufferView index -> (usage, mesh name)
+
+    usage is the attribute semantic (POSITION, NORMAL, TEXCOORD_0, ...),
+    'indices' or 'image'.
+    """
+    accessors = gltf.get('accessors', [])
+    usage = {}
+    for mesh in gltf.get('meshes', []):
+        for prim in mesh.get('primitives', []):
+            refs = list(prim.get('attributes', {}).items())
+            if 'indices' in prim:
+                refs.append(('indices', prim['indices']))
+            for semantic, accessor in refs:
+                view = accessors[accessor].get('bufferView')
+                if view is not None:
+                    usage.setdefault(view, (semantic, mesh.get('name', '')))
+    for image in gltf.get('images', []):
+        if 'bufferView' in image:
+            usage.setdefault(image['bufferView'], ('image', image.get('name', '')))
+    return usage
+
+
+def glb_triangles(gltf):
+    """Triangles the default scene draws: each mesh's triangles times the nodes that use it"""
+    accessors = gltf.get('accessors', [])
+
+    def mesh_triangles(mesh):
+        total = 0
+        for prim in mesh.get('primitives', []):
+            ref = prim['indices'] if 'indices' in prim else prim.get('attributes', {}).get('POSITION')
+            count = accessors[ref]['count'] if ref is not None else 0
+            mode = prim.get('mode', 4)
+            # TRIANGLES, TRIANGLE_STRIP, TRIANGLE_FAN; points and lines draw none
+            total += count // 3 if mode == 4 else max(0, count - 2) if mode in (5, 6) else 0
+        return total
+
+    meshes = [mesh_triangles(mesh) for mesh in gltf.get('meshes', [])]
+    nodes = gltf.get('nodes', [])
+    scenes = gltf.get('scenes', [])
+    stack = list(scenes[gltf.get('scene', 0)].get('nodes', [])) if scenes else []
+    total = 0
+    while stack:
+        node = nodes[stack.pop()]
+        if 'mesh' in node:
+            total += meshes[node['mesh']]
+        stack.extend(node.get('children', []))
+    return total
+
+
+def glb_stats(path):
+    """Byte sizes of a GLB: total, JSON/BIN chunks, external buffers and each buffer view, plus its triangles"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    gltf, binary = parse_glb(data)
+    usage = buffer_view_usage(gltf)
+
+    views = []
+    by_usage = {}
+    for i, view in enumerate(gltf.get('bufferViews', [])):
+        kind, mesh = usage.get(i, ('other', ''))
+        views.append({'index': i, 'usage': kind, 'mesh': mesh, 'bytes': view['byteLength']})
+        by_usage[kind] = by_usage.get(kind, 0) + view['byteLength']
+
+    return {
+        'total_bytes': len(data),
+        'json_bytes': len(json.dumps(gltf, separators=(',', ':'))),
+        'triangles': glb_triangles(gltf),
+        'bin_bytes': len(binary),
+        # Buffers the GLB references by URI (shared assets), not part of total_bytes
+        'external_bytes': sum(b['byteLength'] for b in gltf.get('buffers', []) if b.get('uri')),
+        'by_usage': dict(sorted(by_usage.items(), key=lambda kv: -kv[1])),
+        'buffer_views': views,
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 glb_tools.py model.glb")
+        sys.exit(1)
+    stats = glb_stats(sys.argv[1])
+    print(f"{sys.argv[1]}: {stats['total_bytes']} bytes "
+          f"(JSON {stats['json_bytes']}, BIN {stats['bin_bytes']}, {len(stats['buffer_views'])} buffer views)")
+    for kind, size in stats['by_usage'].items():
+        print(f"  {kind:<12} {size:>10}")
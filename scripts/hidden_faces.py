@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Pre-export pass that deletes faces nobody can see.
+
+A face is hidden when it is covered by other solid geometry: box bottoms
+resting on floors, furniture backs pressed into walls, board ends against
+the next board. For every face, points just in front of it (its centre,
+slightly inset corners and a spread every SAMPLE_SPACING over the face)
+are tested against the other objects. Each object
+has a BVH (mathutils.bvhtree), and a point counts as covered when it lies
+behind the nearest surface of another object. Only faces with every test
+point covered are deleted.
+
+Points below ground_z can be counted as covered too, for scenes that are
+only ever seen from above. It is off by default: the houses have no
+ground plane, so Cycles lights them from below as well, and opening the
+bottoms of the wall shell lets that light into the rooms.
+
+Single-sided slabs (floors, ceilings; flat horizontal meshes) stand for
+the SLAB_THICKNESS slabs they replaced (slabs.py): for furniture and
+decor they cover that layer behind them and nothing further, so box
+bottoms standing on the floor go but nothing far under a floor is culled
+by accident. Other objects only count the thin layer right behind a slab:
+opening the bottom and top of the wall shell, or the foot of door leaves
+and glass in door openings, changes the lighting. Meshes
+shared by several objects are left alone, since a face hidden in one
+instance may show in another.
+
+Savings are reported per category (see scene_stats.categorize). Byte
+savings are estimated from what the glTF exporter writes for flat-shaded
+faces.
+"""
+
+import math
+
+import bmesh
+import bpy
+import numpy as np
+from mathutils import Vector
+from mathutils.bvhtree import BVHTree
+
+from scene_stats import categorize
+from slabs import extend_through_slabs
+
+# Test points sit this far in front of the face
+EPSILON = 0.002
+
+# Largest gap between test points on a face, so big faces are not judged by a few spots
+SAMPLE_SPACING = 0.25
+
+# How far towards the face centre the corner test points are pulled
+CORNER_INSET = 0.05
+
+# glTF cost of a flat-shaded face: position + normal + UV per corner, uint16 indices
+BYTES_PER_CORNER = 32
+BYTES_PER_TRIANGLE = 6
+
+
+def _world_faces(obj):
+    """World-space vertices, face corner indices, face normals and face triangles of a mesh object"""
+    matrix = obj.matrix_world
+    normal_matrix = matrix.inverted_safe().transposed().to_3x3()
+    mesh = obj.data
+    verts = [matrix @ v.co for v in mesh.vertices]
+    polygons = [tuple(p.vertices) for p in mesh.polygons]
+    normals = [(normal_matrix @ p.normal).normalized() for p in mesh.polygons]
+    mesh.calc_loop_triangles()
+    triangles = [[] for _ in polygons]
+    for tri in mesh.loop_triangles:
+        triangles[tri.polygon_index].append(tuple(tri.vertices))
+    return verts, polygons, normals, triangles
+
+
+def _test_points(verts, polygon, normal, triangles):
+    """Points just in front of a face: inset corners plus an even spread over its triangles"""
+    corners = [verts[i] for i in polygon]
+    center = sum(corners, Vector()) / len(corners)
+    samples = [center] + [c + (center - c) * CORNER_INSET for c in corners]
+    for tri in triangles:
+        a, b, c = (verts[i] for i in tri)
+        steps = math.ceil(max((b - a).length, (c - b).length, (a - c).length) / SAMPLE_SPACING)
+        if steps < 2:
+            continue
+        # Centroids of the steps x steps sub-triangles
+        for i in range(steps):
+            for j in range(steps - i):
+                for u, v in (((i + 1 / 3) / steps, (j + 1 / 3) / steps),
+                             ((i + 2 / 3) / steps, (j + 2 / 3) / steps)):
+                    if u + v < 1:
+                        samples.append(a + (b - a) * u + (c - a) * v)
+    return [s + normal * EPSILON for s in samples]
+
+
+def remove_hidden_faces(objects=None, ground_z=None):
+    """Delete faces covered by other objects; returns savings per category and totals"""
+    objects = [obj for obj in (objects if objects is not None else bpy.context.scene.objects)
+               if obj.type == 'MESH' and len(obj.data.polygons)]
+    geometry = [_world_faces(obj) for obj in objects]
+    trees = [BVHTree.FromPolygons(verts, polygons) for verts, polygons, _, _ in geometry]
+    bounds = np.array([[min(v[a] for v in verts) for a in range(3)] + [max(v[a] for v in verts) for a in range(3)]
+                       for verts, _, _, _ in geometry]).reshape(-1, 6)
+    bounds[:, :3] -= 2 * EPSILON
+    bounds[:, 3:] += 2 * EPSILON
+    # Flat horizontal meshes are slabs: extend their bounds through the slab they stand for
+    # (padded by 4 * EPSILON above, so flat means under EPSILON of real height)
+    facing = [0 if high - low >= 5 * EPSILON else (1 if sum(normal.z for normal in normals) > 0 else -1)
+              for low, high, (_, _, normals, _) in zip(bounds[:, 2], bounds[:, 5], geometry)]
+    slab_bounds = extend_through_slabs(bounds, facing)
+
+    def covered(point, owner, through_slabs):
+        if ground_z is not None and point.z < ground_z:
+            return True
+        xyz = np.array(point)
+        lo, hi = (slab_bounds[:, :3], slab_bounds[:, 3:]) if through_slabs else (bounds[:, :3], bounds[:, 3:])
+        inside = np.flatnonzero((lo <= xyz).all(axis=1) & (hi >= xyz).all(axis=1))
+        for n in inside:
+            if n == owner:
+                continue
+            location, normal, _, _ = trees[n].find_nearest(point)
+            if location is not None and (location - point).dot(normal) > 1e-7:
+                return True
+        return False
+
+    savings = {}
+    removed_objects = []
+    for owner, (obj, (verts, polygons, normals, triangles)) in enumerate(zip(objects, geometry)):
+        if obj.data.users > 1:
+            continue
+        through_slabs = categorize(obj) in ('furniture', 'decor')
+        hidden = [i for i, (polygon, normal, tris) in enumerate(zip(polygons, normals, triangles))
+                  if all(covered(point, owner, through_slabs) for point in _test_points(verts, polygon, normal, tris))]
+        if not hidden:
+            continue
+
+        category = savings.setdefault(categorize(obj), {'faces': 0, 'triangles': 0, 'est_bytes': 0})
+        corners = sum(len(polygons[i]) for i in hidden)
+        triangles = sum(len(polygons[i]) - 2 for i in hidden)
+        category['faces'] += len(hidden)
+        category['triangles'] += triangles
+        category['est_bytes'] += corners * BYTES_PER_CORNER + triangles * BYTES_PER_TRIANGLE
+
+        if len(hidden) == len(polygons):
+            removed_objects.append(obj)
+            continue
+        bm = bmesh.new()
+        bm.from_mesh(obj.data)
+        bm.faces.ensure_lookup_table()
+        bmesh.ops.delete(bm, geom=[bm.faces[i] for i in hidden], context='FACES')
+        bm.to_mesh(obj.data)
+        bm.free()
+
+    for obj in removed_objects:
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(mesh)
+
+    totals = {key: sum(c[key] for c in savings.values()) for key in ('faces', 'triangles', 'est_bytes')}
+    totals['objects_removed'] = len(removed_objects)
+    print(f"🙈 Hidden faces removed: {totals['faces']} faces, {totals['triangles']} triangles, "
+          f"~{totals['est_bytes'] / 1024:.0f} KB")
+    return {'totals': totals, 'by_category': savings}
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Blueprint layout logic shared by the house builder and the planner.
+
+Plain Python - no bpy import - so the same room, adjacency and wall decisions
+can be evaluated without starting Blender (see house_plan.py).
+
+Geometry is carried in integer millimetres (Room.x_mm etc.) so adjacency,
+shared-wall dedupe and cache keys compare exactly; the float metre
+attributes the builders use are derived from them. snap_blueprint() is the
+normalization stage that snaps a blueprint to millimetres and welds edges
+that are meant to coincide.
+"""
+
+import copy
+import hashlib
+import json
+
+import numpy as np
+
+# ============= MILLIMETRES =============
+
+MM = 1000
+
+DEFAULT_ROOM_HEIGHT = 2.8
+
+# Rooms whose facing walls are closer than this are treated as adjacent
+ADJACENT_TOLERANCE_MM = 300
+ADJACENT_TOLERANCE = ADJACENT_TOLERANCE_MM / MM
+
+# Room edges closer than this are snapped onto one edge
+WELD_MM = 50
+
+# Walls shorter than this are not built
+MIN_WALL_MM = 50
+
+def to_mm(metres):
+    """Metres -> whole millimetres"""
+    return int(round(float(metres) * MM))
+
+def weld_edges(values, weld_mm=WELD_MM):
+    """Snap integer edge coordinates that are within weld_mm of a neighbour.
+
+    Sorted values are grouped while consecutive gaps stay within weld_mm;
+    each group takes its most common value (the smallest on a tie).
+    """
+    values = np.asarray(values, dtype=np.int64)
+    if values.size == 0 or weld_mm <= 0:
+        return values
+    unique, counts = np.unique(values, return_counts=True)
+    group = np.concatenate([[0], np.cumsum(np.diff(unique) > weld_mm)])
+    # Most common value per group: order by (group, -count, value) and take each group's first
+    order = np.lexsort((unique, -counts, group))
+    first = order[np.concatenate([[True], np.diff(group[order]) > 0])]
+    return unique[first][group][np.searchsorted(unique, values)]
+
+# ============= ROOM CLASS =============
+
+class Room:
+    def __init__(self, data):
+        self.id = data.get('id', 'room')
+        self.name = data.get('name', 'Room')
+        self.type = data.get('type', 'living')
+        self.width_mm = to_mm(data.get('width', 4))
+        self.length_mm = to_mm(data.get('length', 5))
+        # Missing or non-positive heights fall back silently; blueprint_check reports them
+        height = data.get('height', DEFAULT_ROOM_HEIGHT)
+        self.height_mm = to_mm(height if height > 0 else DEFAULT_ROOM_HEIGHT)
+        self.outdoor = data.get('outdoor', False)
+        pos = data.get('position', {'x': 0, 'y': 0})
+        self.x_mm = to_mm(pos.get('x', 0))
+        self.y_mm = to_mm(pos.get('y', 0))
+        self.doors = data.get('doors', [])
+        self.windows = data.get('windows', [])
+
+    @property
+    def x2_mm(self):
+        return self.x_mm + self.width_mm
+
+    @property
+    def y2_mm(self):
+        return self.y_mm + self.length_mm
+
+    @property
+    def x(self):
+        return self.x_mm / MM
+
+    @property
+    def y(self):
+        return self.y_mm / MM
+
+    @property
+    def x2(self):
+        return self.x2_mm / MM
+
+    @property
+    def y2(self):
+        return self.y2_mm / MM
+
+    @property
+    def width(self):
+        return self.width_mm / MM
+
+    @property
+    def length(self):
+        return self.length_mm / MM
+
+    @property
+    def height(self):
+        return self.height_mm / MM
+
+    @property
+    def center(self):
+        return (self.x + self.width/2, self.y + self.length/2)
+
+def is_outdoor(room):
+    """Outdoor rooms get no walls or ceiling"""
+    return room.outdoor or room.type in ['deck', 'balcony']
+
+def load_rooms(data):
+    """Rooms of a blueprint; a single room object is treated as a one-room house"""
+    return [Room(r) for r in data.get('rooms', [data])]
+
+def room_bounds_mm(rooms):
+    """(N, 4) int64 array of x, y, x2, y2 in millimetres"""
+    return np.array([(r.x_mm, r.y_mm, r.x2_mm, r.y2_mm) for r in rooms], dtype=np.int64).reshape(-1, 4)
+
+# ============= NORMALIZATION =============
+
+def _snap_opening(opening, wall_mm):
+    """Snap an opening's sizes to millimetres and its centre to a whole millimetre along the wall"""
+    for field in ('width', 'height', 'bottom'):
+        if isinstance(opening.get(field), (int, float)) and not isinstance(opening.get(field), bool):
+            opening[field] = to_mm(opening[field]) / MM
+    position = opening.get('position')
+    if isinstance(position, (int, float)) and not isinstance(position, bool) and wall_mm > 0:
+        opening['position'] = round(position * wall_mm) / wall_mm
+
+def snap_blueprint(data, weld_mm=WELD_MM):
+    """Copy of a blueprint with room geometry in whole millimetres.
+
+    Positions, sizes and heights are rounded to millimetres, room edges within
+    weld_mm of each other are welded onto one edge, and door and window sizes
+    and centres are snapped too. Inputs that differ by less than that give
+    the same blueprint, so they build the same walls and hash the same.
+    Expects rooms that passed blueprint_check.
+    """
+    data = copy.deepcopy(data)
+    rooms = [r for r in data.get('rooms', [data]) if isinstance(r, dict)]
+    if not rooms:
+        return data
+
+    layout = [Room(r) for r in rooms]
+    bounds = room_bounds_mm(layout)
+    xs = weld_edges(bounds[:, [0, 2]].ravel(), weld_mm).reshape(-1, 2)
+    ys = weld_edges(bounds[:, [1, 3]].ravel(), weld_mm).reshape(-1, 2)
+
+    for room, (x, x2), (y, y2) in zip(rooms, xs.tolist(), ys.tolist()):
+        if x2 <= x or y2 <= y:
+            # Welding collapsed the room; keep it as rounded
+            x, y = to_mm(room.get('position', {}).get('x', 0)), to_mm(room.get('position', {}).get('y', 0))
+            x2, y2 = x + to_mm(room.get('width', 4)), y + to_mm(room.get('length', 5))
+        room['position'] = dict(room.get('position') or {}, x=x / MM, y=y / MM)
+        room['width'], room['length'] = (x2 - x) / MM, (y2 - y) / MM
+        if isinstance(room.get('height'), (int, float)) and not isinstance(room.get('height'), bool):
+            room['height'] = to_mm(room['height']) / MM
+
+        along = {'front': x2 - x, 'back': x2 - x, 'left': y2 - y, 'right': y2 - y}
+        for opening in room.get('doors', []) + room.get('windows', []):
+            if isinstance(opening, dict):
+                _snap_opening(opening, along.get(opening.get('wall'), 0))
+    return data
+
+# Fields that do not change the built scene
+COSMETIC_FIELDS = ('name', 'meta')
+
+def canonical_blueprint(data):
+    """A blueprint as the builders see it, with geometry in integer millimetres.
+
+    Room sizes, positions and door/window sizes become *_mm integers and
+    opening positions become centre offsets along the wall; names and
+    metadata are dropped. Used as the basis for cache keys.
+    """
+    def opening_mm(opening, wall_mm):
+        entry = {k: v for k, v in opening.items() if k not in ('width', 'height', 'bottom', 'position')}
+        entry.update({f'{k}_mm': to_mm(opening[k]) for k in ('width', 'height', 'bottom') if k in opening})
+        if 'position' in opening:
+            entry['center_mm'] = int(round(opening['position'] * wall_mm))
+        return entry
+
+    rooms = []
+    for data_room, room in zip(data.get('rooms', [data]), load_rooms(data)):
+        along = {'front': room.width_mm, 'back': room.width_mm, 'left': room.length_mm, 'right': room.length_mm}
+        entry = {k: v for k, v in data_room.items()
+                 if k not in COSMETIC_FIELDS + ('position', 'width', 'length', 'height', 'doors', 'windows')}
+        entry.update(
+            mm=[room.x_mm, room.y_mm, room.width_mm, room.length_mm, room.height_mm],
+            doors=[opening_mm(d, along.get(d.get('wall'), 0)) for d in room.doors],
+            windows=[opening_mm(w, along.get(w.get('wall'), 0)) for w in room.windows],
+        )
+        rooms.append(entry)
+
+    canonical = {k: v for k, v in data.items() if k not in COSMETIC_FIELDS + ('rooms',)} if 'rooms' in data else {}
+    canonical['rooms'] = rooms
+    return canonical
+
+def blueprint_key(data, **options):
+    """Stable hash of a blueprint's canonical form and build options"""
+    payload = json.dumps({'blueprint': canonical_blueprint(data), 'options': options},
+                         sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+# ============= WALLS =============
+
+WALL_SIDES = ['front', 'back', 'left', 'right']
+OPPOSITE_SIDE = {'front': 'back', 'back': 'front', 'left': 'right', 'right': 'left'}
+
+def get_wall_mm(room, wall_name):
+    """Get start and end coordinates for a wall, in millimetres"""
+    if wall_name == 'front':
+        return (room.x_mm, room.y_mm, room.x2_mm, room.y_mm)
+    elif wall_name == 'back':
+        return (room.x_mm, room.y2_mm, room.x2_mm, room.y2_mm)
+    elif wall_name == 'left':
+        return (room.x_mm, room.y_mm, room.x_mm, room.y2_mm)
+    elif wall_name == 'right':
+        return (room.x2_mm, room.y_mm, room.x2_mm, room.y2_mm)
+    return None
+
+def get_wall_coords(room, wall_name):
+    """Get start and end coordinates for a wall"""
+    coords = get_wall_mm(room, wall_name)
+    return tuple(v / MM for v in coords) if coords else None
+
+def find_adjacent_room(room, wall_name, all_rooms, bounds=None):
+    """Find if another room is adjacent on this wall (the first one, in blueprint order).
+
+    bounds is room_bounds_mm(all_rooms), passed in when checking many walls.
+    """
+    bounds = room_bounds_mm(all_rooms) if bounds is None else bounds
+    x, y, x2, y2 = bounds.T
+
+    if wall_name == 'right':
+        facing, overlap = x - room.x2_mm, (y < room.y2_mm) & (y2 > room.y_mm)
+    elif wall_name == 'left':
+        facing, overlap = x2 - room.x_mm, (y < room.y2_mm) & (y2 > room.y_mm)
+    elif wall_name == 'back':
+        facing, overlap = y - room.y2_mm, (x < room.x2_mm) & (x2 > room.x_mm)
+    elif wall_name == 'front':
+        facing, overlap = y2 - room.y_mm, (x < room.x2_mm) & (x2 > room.x_mm)
+    else:
+        return None
+
+    others = np.array([other.id != room.id for other in all_rooms], dtype=bool)
+    found = np.flatnonzero((np.abs(facing) < ADJACENT_TOLERANCE_MM) & overlap & others)
+    return all_rooms[found[0]] if found.size else None
+
+def get_door_on_wall(room, wall_name):
+    for door in room.doors:
+        if door.get('wall') == wall_name:
+            return door
+    return None
+
+def get_window_on_wall(room, wall_name):
+    for window in room.windows:
+        if window.get('wall') == wall_name:
+            return window
+    return None
+
+def wall_key(x1, y1, x2, y2):
+    """Key identifying a wall regardless of which room creates it (millimetre coordinates)"""
+    return tuple(sorted([(int(x1), int(y1)), (int(x2), int(y2))]))
+
+def plan_room_walls(room, all_rooms, created_walls):
+    """Decide which walls a room creates and what goes in them.
+
+    Returns a list of dicts with side, coords (metres), mm, length_mm, interior
+    flag and the door or window to cut (at most one). `created_walls` is
+    updated so shared walls are only created once.
+    """
+    walls = []
+    if is_outdoor(room):
+        return walls
+
+    bounds = room_bounds_mm(all_rooms)
+    for wall_name in WALL_SIDES:
+        mm = get_wall_mm(room, wall_name)
+        if not mm:
+            continue
+
+        key = wall_key(*mm)
+        if key in created_walls:
+            continue
+        created_walls.add(key)
+
+        adjacent = find_adjacent_room(room, wall_name, all_rooms, bounds)
+        wall = {'side': wall_name, 'coords': tuple(v / MM for v in mm), 'mm': mm,
+                'length_mm': abs(mm[2] - mm[0]) + abs(mm[3] - mm[1]), 'door': None, 'window': None}
+
+        if adjacent and not adjacent.outdoor:
+            wall['interior'] = True
+            wall['door'] = get_door_on_wall(room, wall_name) or get_door_on_wall(adjacent, OPPOSITE_SIDE[wall_name])
+        else:
+            wall['interior'] = False
+            wall['window'] = get_window_on_wall(room, wall_name)
+            if not wall['window']:
+                wall['door'] = get_door_on_wall(room, wall_name)
+        walls.append(wall)
+
+    return walls
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Dry-run planner for render_house_v3.py: predicts the cost of a house build
+without touching bpy.
+
+Rooms, adjacency and wall decisions come from house_layout, and the wall
+shell and floor/ceiling slabs from wall_shell.py and slabs.py, the same
+code the builder uses. Furniture is counted per primitive the way the v3
+builders create it. GLB size and build time are estimated from
+coefficients fitted to real build reports (`--report` output of
+render_house_v3.py).
+
+Recalibrate whenever builder changes move the GLB size, and check that
+the estimates stay within GLB_BYTES_TOLERANCE of the reports:
+
+Usage:
+  python3 render_house_v3.py --plan input.json [--tier shell|basic|detailed|high] [--no-ceilings] [--furniture-library DIR]
+  python3 house_plan.py --calibrate report1.json report2.json ...
+  python3 house_plan.py --check report1.json report2.json ...
+"""
+
+import json
+import os
+import sys
+
+import furniture_layout
+from house_layout import MIN_WALL_MM, load_rooms
+import plants
+import slabs
+from tessellation import circle_segments
+import wall_shell
+
+COEFFICIENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plan_coefficients.json')
+
+# GLB size estimates must land within this fraction of the real size, or within
+# GLB_BYTES_SLACK for small scenes, where the fixed JSON overhead dominates
+GLB_BYTES_TOLERANCE = 0.15
+GLB_BYTES_SLACK = 16 * 1024
+
+# Quality tiers of the house engine. Knobs:
+#   furniture      'none' | 'basic' (a few boxes per room) | 'full'
+#   openings       'holes' (cut only) | 'full' (door leaves, frames, glass)
+#   trim           floor trim around indoor rooms
+#   segment_scale  detail multiplier for cylinder/sphere segment counts (see tessellation.py)
+#   decor          plants, rugs, umbrellas
+#   merge_planks   deck floors as one slab instead of planks
+#   ceilings       ceiling slab (also dropped by --no-ceilings)
+TIERS = {
+    'shell': {'furniture': 'none', 'openings': 'holes', 'trim': False,
+              'segment_scale': 0.5, 'decor': False, 'merge_planks': True, 'ceilings': True},
+    'basic': {'furniture': 'basic', 'openings': 'holes', 'trim': False,
+              'segment_scale': 0.5, 'decor': False, 'merge_planks': True, 'ceilings': True},
+    'detailed': {'furniture': 'full', 'openings': 'full', 'trim': True,
+                 'segment_scale': 0.75, 'decor': False, 'merge_planks': False, 'ceilings': True},
+    'high': {'furniture': 'full', 'openings': 'full', 'trim': True,
+             'segment_scale': 1.0, 'decor': True, 'merge_planks': False, 'ceilings': True},
+}
+DEFAULT_TIER = 'high'
+DEFAULT_DETAIL = TIERS[DEFAULT_TIER]
+
+def tier_detail(tier):
+    """Detail knobs for a tier name"""
+    if tier not in TIERS:
+        raise ValueError(f"Unknown tier '{tier}' (expected one of: {', '.join(TIERS)})")
+    return dict(TIERS[tier])
+
+# ============= PRIMITIVE COSTS =============
+
+def segments(radius, detail):
+    return circle_segments(radius, detail['segment_scale'])
+
+class Tally:
+    """Running totals of mesh objects, vertices, triangles and materials"""
+
+    def __init__(self):
+        self.objects = 0
+        self.vertices = 0
+        self.triangles = 0
+        self.materials = set()
+        self.by_category = {}
+
+    def add(self, category, material, vertices, triangles, count=1):
+        self.objects += count
+        self.vertices += vertices * count
+        self.triangles += triangles * count
+        self.materials.add(material)
+        cat = self.by_category.setdefault(category, {'objects': 0, 'triangles': 0})
+        cat['objects'] += count
+        cat['triangles'] += triangles * count
+
+    def box(self, category, material, count=1):
+        self.add(category, material, 8, 12, count)
+
+    def cylinder(self, category, material, segments, count=1):
+        # Side quads plus two n-gon caps
+        self.add(category, material, 2 * segments, 4 * segments - 4, count)
+
+    def sphere(self, category, material, segments, rings, count=1):
+        self.add(category, material, segments * (rings - 1) + 2, 2 * segments * (rings - 1), count)
+
+    def box_array(self, category, material, boxes):
+        # One object holding `boxes` boxes (create_box_array)
+        if boxes:
+            self.add(category, material, 8 * boxes, 12 * boxes)
+
+    def cylinder_array(self, category, material, segments, cylinders):
+        if cylinders:
+            self.add(category, material, 2 * segments * cylinders, (4 * segments - 4) * cylinders)
+
+    def mesh(self, category, materials, vertices, triangles):
+        # One object with several material slots
+        self.add(category, materials[0], vertices, triangles)
+        self.materials.update(materials)
+
+    def merge(self, other):
+        self.objects += other.objects
+        self.vertices += other.vertices
+        self.triangles += other.triangles
+        self.materials |= other.materials
+        for category, counts in other.by_category.items():
+            cat = self.by_category.setdefault(category, {'objects': 0, 'triangles': 0})
+            cat['objects'] += counts['objects']
+            cat['triangles'] += counts['triangles']
+
+# ============= BUILDERS (mirrors render_house_v3) =============
+
+def plan_floor(t, room, walls, detail):
+    if room.type in ['deck', 'balcony']:
+        planks = 1 if detail['merge_planks'] else int(room.length / 0.16)
+        t.box_array('structure', 'DeckWood', planks)
+        return
+    if not room.outdoor and detail['trim']:
+        t.box_array('structure', 'WoodLight', len(wall_shell.baseboard_boxes(room, walls)))
+
+def plan_slabs(t, rooms, skip_ceilings):
+    for material, slab in slabs.floor_slabs(rooms).items():
+        t.add('structure', material, len(slab['vertices']), slab['triangles'])
+    ceiling = slabs.ceiling_slab(rooms, skip_ceilings)
+    if ceiling:
+        t.add('structure', 'Ceiling', len(ceiling['vertices']), ceiling['triangles'])
+
+def plan_openings(t, walls, detail):
+    # Frames are part of the wall shell; each opening adds its glass or door leaf
+    if detail['openings'] != 'full':
+        return
+    for wall in walls:
+        assembly = wall_shell.opening_assembly(wall)
+        if not assembly:
+            continue
+        t.box_array('openings', 'Glass', len(assembly['glass']))
+        if assembly['leaf']:
+            # Panel plus a handle on each face (create_door_leaf)
+            n = segments(0.015, detail)
+            t.mesh('openings', ['WoodLight', 'Brass'], 8 + 4 * n, 12 + 2 * (4 * n - 4))
+
+# Material names per wall_shell slot (INTERIOR, EXTERIOR, DOOR_FRAME, SLIDING_FRAME, WINDOW_FRAME)
+SHELL_MATERIALS = ['Wall', 'WallExterior', 'WoodDark', 'Chrome', 'WoodLight']
+
+def plan_shell(t, walls, rooms, detail):
+    # The same mesh the builder makes, so counts are exact
+    shell = wall_shell.build_shell(walls, rooms, frames=detail['openings'] == 'full')
+    if shell:
+        t.mesh('structure', [SHELL_MATERIALS[slot] for slot in sorted(set(shell['face_materials'].tolist()))],
+               len(shell['vertices']), shell['triangles'])
+
+def plan_potted_plant(t):
+    # One instance of a fixed-size variant (plants.py)
+    t.mesh('decor', ['Terracotta', 'PlantGreen'], plants.PLANT_VERTICES, plants.PLANT_TRIANGLES)
+
+def plan_basic_furniture(t, room):
+    if room.type == 'living':
+        t.box('furniture', 'FabricGray', 2)
+        t.box('furniture', 'WoodLight')
+    elif room.type == 'bedroom':
+        t.box('furniture', 'WoodDark', 2)
+        t.box('furniture', 'FabricWhite')
+    elif room.type == 'kitchen':
+        t.box('furniture', 'CabinetWood')
+        t.box('furniture', 'Marble')
+    elif room.type == 'bathroom':
+        t.box('furniture', 'Porcelain', 2)
+
+def plan_item(t, item, detail):
+    # One furniture item as its builder makes it (FURNITURE_BUILDERS in render_house_v3)
+    if item == 'sofa':
+        t.box('furniture', 'FabricGray', 4)
+        t.box('furniture', 'FabricBlue', 6)
+    elif item == 'coffee_table':
+        t.box('furniture', 'WoodLight', 5)
+    elif item == 'bed':
+        t.box('furniture', 'WoodDark', 3)
+        t.box('furniture', 'FabricWhite', 3)
+        t.box('furniture', 'FabricBeige')
+    elif item == 'nightstand':
+        t.box('furniture', 'WoodDark')
+        t.box('furniture', 'Brass')
+    elif item == 'toilet':
+        t.cylinder('furniture', 'Porcelain', segments(0.2, detail))
+        t.cylinder('furniture', 'Porcelain', segments(0.18, detail))
+        t.box('furniture', 'Porcelain')
+    elif item == 'bathroom_sink':
+        t.box('furniture', 'Porcelain', 2)
+        t.cylinder('furniture', 'Chrome', segments(0.02, detail))
+    elif item == 'bathtub':
+        t.box('furniture', 'Porcelain')
+        t.box('furniture', 'Glass')
+    elif item == 'kitchen_counter':
+        t.box('furniture', 'CabinetWood', 2)
+        t.box('furniture', 'Marble')
+    elif item == 'kitchen_sink':
+        t.box('furniture', 'Chrome')
+    elif item == 'lounger':
+        t.box('furniture', 'WoodDark')
+        t.box('furniture', 'FabricBlue')
+
+def plan_library_item(t, item):
+    # One object using the item's library mesh: all its parts joined, built at the default detail
+    parts = Tally()
+    plan_item(parts, item, DEFAULT_DETAIL)
+    t.mesh('furniture', sorted(parts.materials), parts.vertices, parts.triangles)
+
+def plan_furniture(t, room, detail, furniture_library=False):
+    if room.type == 'stairs':
+        # Structure, built at every tier
+        t.box_array('structure', 'WoodDark', 14)
+        t.cylinder_array('structure', 'Chrome', segments(0.025, detail), 3)
+        t.cylinder('structure', 'Chrome', segments(0.03, detail))  # handrail
+        return
+    if detail['furniture'] == 'none':
+        return
+    if detail['furniture'] == 'basic':
+        plan_basic_furniture(t, room)
+        return
+    for placement in furniture_layout.room_furniture(room):
+        if furniture_library:
+            plan_library_item(t, placement.item)
+        else:
+            plan_item(t, placement.item, detail)
+    if room.type == 'living' and detail['decor']:
+        t.cylinder('decor', 'RugBlue', segments(1.2, detail))
+        plan_potted_plant(t)
+    elif room.type in ['deck', 'balcony']:
+        if detail['decor']:
+            t.cylinder('decor', 'WoodDark', segments(0.03, detail))
+            t.cylinder('decor', 'Umbrella', 8)
+            for _ in range(3):
+                plan_potted_plant(t)
+        t.box_array('structure', 'WoodDark', 12)   # pergola posts, beams, rafters
+
+# ============= PLAN =============
+
+def load_coefficients(path=COEFFICIENTS_PATH):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def estimate_glb_bytes(coefficients, objects, triangles):
+    size = coefficients['glb_bytes']
+    # Linear fits can dip below zero for scenes smaller than any calibration build
+    return max(0, round(size['base'] + size['per_object'] * objects + size['per_triangle'] * triangles))
+
+def plan_rooms(rooms, skip_ceilings=False, detail=None, coefficients=None, furniture_library=False):
+    """Predicted objects, triangles, materials, GLB bytes and build seconds.
+
+    furniture_library: furniture is linked from the library (furniture_library.py).
+    """
+    detail = dict(DEFAULT_DETAIL, **(detail or {}))
+    coefficients = coefficients or load_coefficients()
+
+    total = Tally()
+    per_room = {}
+    room_walls = wall_shell.plan_walls(rooms)
+    all_walls = [wall for walls in room_walls.values() for wall in walls]
+    for room in rooms:
+        t = Tally()
+        plan_floor(t, room, all_walls, detail)
+        plan_openings(t, [w for w in room_walls[room.id] if w['length_mm'] >= MIN_WALL_MM], detail)
+        plan_furniture(t, room, detail, furniture_library)
+        per_room[room.id] = {'objects': t.objects, 'triangles': t.triangles}
+        total.merge(t)
+    plan_shell(total, all_walls, rooms, detail)
+    plan_slabs(total, rooms, skip_ceilings or not detail['ceilings'])
+
+    time = coefficients['build_seconds']
+    return {
+        'rooms': len(rooms),
+        'objects': total.objects,
+        'vertices': total.vertices,
+        'triangles': total.triangles,
+        'materials': len(total.materials),
+        'furniture': total.by_category.get('furniture', {}).get('objects', 0),
+        'by_category': total.by_category,
+        'per_room': per_room,
+        'est_glb_bytes': estimate_glb_bytes(coefficients, total.objects, total.triangles),
+        'est_build_seconds': max(0.0, round(time['base'] + time['per_object'] * total.objects
+                                            + time['per_object_sq'] * total.objects ** 2, 2)),
+    }
+
+def plan_house(data, skip_ceilings=False, detail=None, coefficients=None, furniture_library=False):
+    return plan_rooms(load_rooms(data), skip_ceilings, detail, coefficients, furniture_library)
+
+def plan_tiers(data, skip_ceilings=False, coefficients=None):
+    """Plans for every tier, cheapest first"""
+    return {tier: plan_house(data, skip_ceilings, TIERS[tier], coefficients) for tier in TIERS}
+
+# ============= CALIBRATION =============
+
+def least_squares(rows, targets):
+    """Solve the normal equations for a small linear model (no numpy needed)"""
+    n = len(rows[0])
+    a = [[sum(r[i] * r[j] for r in rows) for j in range(n)] for i in range(n)]
+    b = [sum(r[i] * y for r, y in zip(rows, targets)) for i in range(n)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda k: abs(a[k][col]))
+        a[col], a[pivot] = a[pivot], a[col]
+        b[col], b[pivot] = b[pivot], b[col]
+        if abs(a[col][col]) < 1e-12:
+            raise ValueError("Reports do not vary enough to fit the model")
+        for k in range(col + 1, n):
+            f = a[k][col] / a[col][col]
+            for j in range(col, n):
+                a[k][j] -= f * a[col][j]
+            b[k] -= f * b[col]
+    x = [0.0] * n
+    for i in reversed(range(n)):
+        x[i] = (b[i] - sum(a[i][j] * x[j] for j in range(i + 1, n))) / a[i][i]
+    return x
+
+def calibrate(report_paths):
+    """Fit GLB size and build time coefficients from build reports"""
+    size_rows, sizes, time_rows, times = [], [], [], []
+    for path in report_paths:
+        with open(path, 'r') as f:
+            report = json.load(f)
+        totals = report['stats']['totals']
+        objects, triangles = totals['meshes'], totals['triangles']
+        size_rows.append([1.0, objects, triangles])
+        sizes.append(report['stats']['glb']['total_bytes'])
+        time_rows.append([1.0, objects, objects ** 2])
+        times.append(sum(p['seconds'] for p in report['phases']))
+
+    if len(report_paths) < 3:
+        raise ValueError("Need at least 3 reports to calibrate")
+    b0, b1, b2 = least_squares(size_rows, sizes)
+    t0, t1, t2 = least_squares(time_rows, times)
+    return {
+        'glb_bytes': {'base': round(b0, 1), 'per_object': round(b1, 2), 'per_triangle': round(b2, 3)},
+        'build_seconds': {'base': round(t0, 3), 'per_object': round(t1, 5), 'per_object_sq': round(t2, 8)},
+        'calibrated_from': len(report_paths),
+    }
+
+def check_estimates(report_paths, coefficients=None):
+    """GLB size estimates against build reports; returns [(path, estimated, actual, within tolerance)]"""
+    coefficients = coefficients or load_coefficients()
+    results = []
+    for path in report_paths:
+        with open(path, 'r') as f:
+            report = json.load(f)
+        totals = report['stats']['totals']
+        estimated = estimate_glb_bytes(coefficients, totals['meshes'], totals['triangles'])
+        actual = report['stats']['glb']['total_bytes']
+        ok = abs(estimated - actual) <= max(GLB_BYTES_TOLERANCE * actual, GLB_BYTES_SLACK)
+        results.append((path, estimated, actual, ok))
+    return results
+
+def main():
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in ('--calibrate', '--check') or len(argv) < 2:
+        print("Usage: python3 house_plan.py --calibrate|--check report1.json report2.json ...")
+        sys.exit(1)
+    if argv[0] == '--check':
+        results = check_estimates(argv[1:])
+        for path, estimated, actual, ok in results:
+            print(f"{'✅' if ok else '❌'} {os.path.basename(path)}: estimated {estimated} bytes, "
+                  f"actual {actual} ({estimated / actual - 1:+.0%})")
+        if not all(ok for *_, ok in results):
+            print(f"❌ GLB size estimates off by more than {GLB_BYTES_TOLERANCE:.0%} "
+                  f"(or {GLB_BYTES_SLACK // 1024} KB): recalibrate")
+            sys.exit(1)
+        return
+    coefficients = calibrate(argv[1:])
+    with open(COEFFICIENTS_PATH, 'w') as f:
+        json.dump(coefficients, f, indent=2)
+        f.write('\n')
+    print(f"Wrote {COEFFICIENTS_PATH}")
+
+if __name__ == "__main__":
+    main()
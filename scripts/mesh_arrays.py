@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Blender meshes from flat NumPy arrays: vertex positions, loop vertex
+indices and per-face corner counts, as the array geometry of the builders
+(render_house_v3, plants, slabs, wall_shell) produces them. One foreach_set
+per attribute instead of an operator call per element.
+"""
+
+import bpy
+import numpy as np
+
+
+def mesh_from_arrays(name, verts, loops, face_sizes, face_materials=None):
+    """Create a mesh datablock; face_materials are per-face material slot indices"""
+    face_sizes = np.asarray(face_sizes, dtype=np.int32)
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(verts, dtype=np.float32).ravel())
+    mesh.loops.add(len(loops))
+    mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(loops, dtype=np.int32))
+    mesh.polygons.add(len(face_sizes))
+    loop_starts = np.concatenate(([0], np.cumsum(face_sizes)[:-1])).astype(np.int32)
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    mesh.polygons.foreach_set("loop_total", face_sizes)
+    if face_materials is not None:
+        mesh.polygons.foreach_set("material_index", np.ascontiguousarray(face_materials, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    mesh.validate()
+    return mesh
+
+
+def create_mesh_from_arrays(name, verts, loops, face_sizes, material, face_materials=None):
+    """Create one mesh object in the current collection from flat arrays.
+
+    material may be a list of materials, indexed per face by face_materials.
+    """
+    mesh = mesh_from_arrays(name, verts, loops, face_sizes, face_materials)
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.collection.objects.link(obj)
+    for mat in (material if isinstance(material, list) else [material]):
+        if mat:
+            mesh.materials.append(mat)
+    return obj
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Opt-in tracer for bpy.ops calls made during a build.
+
+While active, `bpy.ops` is replaced by a proxy that times every operator call
+and attributes it to the script functions on the call stack: the immediate
+caller (e.g. create_box) and, inclusively, every helper above it (create_sofa,
+place_furniture, ...). The result is a ranked hot-spot table.
+
+    with OpsTracer() as tracer:
+        create_house(data, output_path)
+    print(tracer.format_table())
+"""
+
+import os
+import sys
+import time
+
+import bpy
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Stack frames above these are not attributed to helpers
+ROOT_FUNCTIONS = {'main', '<module>'}
+
+
+class _TracedOperator:
+    def __init__(self, op, idname, tracer):
+        self._op = op
+        self._idname = idname
+        self._tracer = tracer
+
+    def __call__(self, *args, **kwargs):
+        helpers = self._tracer.call_stack()
+        start = time.perf_counter()
+        try:
+            return self._op(*args, **kwargs)
+        finally:
+            self._tracer.record(self._idname, helpers, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        # poll(), idname(), get_rna_type() ...
+        return getattr(self._op, name)
+
+
+class _TracedSubmodule:
+    def __init__(self, submodule, name, tracer):
+        self._submodule = submodule
+        self._name = name
+        self._tracer = tracer
+
+    def __getattr__(self, name):
+        return _TracedOperator(getattr(self._submodule, name), f"{self._name}.{name}", self._tracer)
+
+
+class _TracedOps:
+    def __init__(self, ops, tracer):
+        self._ops = ops
+        self._tracer = tracer
+
+    def __getattr__(self, name):
+        return _TracedSubmodule(getattr(self._ops, name), name, self._tracer)
+
+    def __dir__(self):
+        return dir(self._ops)
+
+
+class OpsTracer:
+    """Counts calls and time per operator, per helper and per (helper, operator)."""
+
+    def __init__(self, script_dir=SCRIPT_DIR):
+        self.script_dir = script_dir
+        self.operators = {}
+        self.helpers = {}
+        self.pairs = {}
+        self._ops = None
+
+    def __enter__(self):
+        self._ops = bpy.ops
+        bpy.ops = _TracedOps(self._ops, self)
+        return self
+
+    def __exit__(self, *exc):
+        bpy.ops = self._ops
+        return False
+
+    def call_stack(self):
+        """Script function names from the immediate caller outwards"""
+        names = []
+        frame = sys._getframe(2)
+        while frame is not None:
+            code = frame.f_code
+            if code.co_name in ROOT_FUNCTIONS:
+                break
+            if code.co_filename.startswith(self.script_dir) and code.co_name not in names:
+                names.append(code.co_name)
+            frame = frame.f_back
+        return names
+
+    def record(self, idname, helpers, seconds):
+        _add(self.operators, idname, seconds)
+        for i, helper in enumerate(helpers):
+            entry = _add(self.helpers, helper, seconds, self_calls=0, self_seconds=0.0)
+            if i == 0:
+                entry['self_calls'] += 1
+                entry['self_seconds'] += seconds
+        caller = helpers[0] if helpers else '?'
+        _add(self.pairs, (caller, idname), seconds)
+
+    def report(self, top=20):
+        """Ranked hot spots as plain data (for job results)"""
+        def ranked(table, label):
+            rows = sorted(table.items(), key=lambda kv: -kv[1]['seconds'])[:top]
+            return [dict(_rounded(stats), **{label: key}) for key, stats in rows]
+
+        pairs = sorted(self.pairs.items(), key=lambda kv: -kv[1]['seconds'])[:top]
+        return {
+            'total_calls': sum(s['calls'] for s in self.operators.values()),
+            'total_seconds': round(sum(s['seconds'] for s in self.operators.values()), 3),
+            'operators': ranked(self.operators, 'operator'),
+            'helpers': ranked(self.helpers, 'helper'),
+            'call_sites': [dict(_rounded(stats), helper=h, operator=op) for (h, op), stats in pairs],
+        }
+
+    def format_table(self, top=15):
+        report = self.report(top)
+        lines = [f"bpy.ops: {report['total_calls']} calls, {report['total_seconds']:.2f}s",
+                 f"{'operator':<36}{'calls':>8}{'seconds':>10}"]
+        for row in report['operators']:
+            lines.append(f"{row['operator']:<36}{row['calls']:>8}{row['seconds']:>10.3f}")
+        lines.append(f"{'helper (inclusive)':<36}{'calls':>8}{'seconds':>10}{'self s':>10}")
+        for row in report['helpers']:
+            lines.append(f"{row['helper']:<36}{row['calls']:>8}{row['seconds']:>10.3f}{row['self_seconds']:>10.3f}")
+        return "\n".join(lines)
+
+
+def _add(table, key, seconds, **extra):
+    entry = table.setdefault(key, dict(calls=0, seconds=0.0, **extra))
+    entry['calls'] += 1
+    entry['seconds'] += seconds
+    return entry
+
+
+def _rounded(stats):
+    return {k: round(v, 4) if isinstance(v, float) else v for k, v in stats.items()}
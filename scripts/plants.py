@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Low-poly potted plants, built once per job and placed as instances.
+
+A plant is a six-sided pot and two jittered icosahedron blobs of foliage,
+modelled at unit height. PLANT_VARIANTS seeded variants exist; each is one
+mesh datablock with a pot and a foliage material slot, created the first
+time it is needed (or found in bpy.data, e.g. in a loaded snapshot). Every
+placement is an object linking that mesh, scaled to the plant's height,
+so a plant costs one object and PLANT_TRIANGLES triangles, and the GLB
+stores each variant's geometry once.
+
+    add_plant("Plant_living", 0.5, 4.5, 0.8, [pot_material, leaf_material])
+
+The geometry (plant_geometry) is plain Python + NumPy, so the planner can
+count it without bpy.
+"""
+
+import numpy as np
+
+try:
+    import bpy
+    from mesh_arrays import mesh_from_arrays
+except ImportError:
+    # Plain CPython (no Blender): only the geometry is available
+    bpy = None
+
+PLANT_VARIANTS = 4
+
+# Unit-height proportions, as the sphere-cluster plants had them
+POT_SIDES = 6
+POT_HEIGHT = 0.3
+POT_TOP_RADIUS = 0.2
+POT_BOTTOM_RADIUS = 0.15
+FOLIAGE = [((0.0, 0.0, 0.6), 0.35), ((0.05, -0.03, 0.7), 0.25)]   # blob centre, radius
+
+# How far each foliage vertex may move in or out, as a fraction of the blob radius
+JITTER = 0.2
+
+POT, LEAVES = 0, 1
+
+_PHI = (1 + 5 ** 0.5) / 2
+ICOSAHEDRON_VERTICES = np.array([(-1, _PHI, 0), (1, _PHI, 0), (-1, -_PHI, 0), (1, -_PHI, 0),
+                                 (0, -1, _PHI), (0, 1, _PHI), (0, -1, -_PHI), (0, 1, -_PHI),
+                                 (_PHI, 0, -1), (_PHI, 0, 1), (-_PHI, 0, -1), (-_PHI, 0, 1)]) / np.hypot(1, _PHI)
+ICOSAHEDRON_FACES = np.array([(0, 11, 5), (0, 5, 1), (0, 1, 7), (0, 7, 10), (0, 10, 11),
+                              (1, 5, 9), (5, 11, 4), (11, 10, 2), (10, 7, 6), (7, 1, 8),
+                              (3, 9, 4), (3, 4, 2), (3, 2, 6), (3, 6, 8), (3, 8, 9),
+                              (4, 9, 5), (2, 4, 11), (6, 2, 10), (8, 6, 7), (9, 8, 1)])
+
+# Pot sides and two caps, plus the foliage blobs
+PLANT_TRIANGLES = 2 * POT_SIDES + 2 * (POT_SIDES - 2) + len(FOLIAGE) * len(ICOSAHEDRON_FACES)
+PLANT_VERTICES = 2 * POT_SIDES + len(FOLIAGE) * len(ICOSAHEDRON_VERTICES)
+
+
+# ============= GEOMETRY =============
+
+def _pot():
+    angles = 2 * np.pi * np.arange(POT_SIDES) / POT_SIDES
+    ring = np.column_stack([np.cos(angles), np.sin(angles)])
+    verts = np.concatenate([np.column_stack([ring * POT_BOTTOM_RADIUS, np.zeros(POT_SIDES)]),
+                            np.column_stack([ring * POT_TOP_RADIUS, np.full(POT_SIDES, POT_HEIGHT)])])
+    k = np.arange(POT_SIDES)
+    sides = np.stack([k, (k + 1) % POT_SIDES, POT_SIDES + (k + 1) % POT_SIDES, POT_SIDES + k], axis=1).ravel()
+    loops = np.concatenate([sides, POT_SIDES + k, k[::-1]])     # sides, top (soil), bottom
+    face_sizes = np.concatenate([np.full(POT_SIDES, 4), [POT_SIDES, POT_SIDES]])
+    return verts, loops, face_sizes
+
+
+def plant_geometry(variant):
+    """Unit-height plant: (vertices, loops, face_sizes, face_materials), the same for the same variant"""
+    rng = np.random.default_rng(variant)
+    verts, loops, face_sizes = _pot()
+    parts = [(verts, loops, face_sizes, np.full(len(face_sizes), POT))]
+    offset = len(verts)
+    for center, radius in FOLIAGE:
+        jitter = 1 + rng.uniform(-JITTER, JITTER, (len(ICOSAHEDRON_VERTICES), 1))
+        squash = rng.uniform(0.8, 1.1, 3)
+        shift = rng.uniform(-0.04, 0.04, 3)
+        blob = np.asarray(center) + shift + ICOSAHEDRON_VERTICES * jitter * squash * radius
+        parts.append((blob, ICOSAHEDRON_FACES.ravel() + offset, np.full(len(ICOSAHEDRON_FACES), 3),
+                      np.full(len(ICOSAHEDRON_FACES), LEAVES)))
+        offset += len(blob)
+    return tuple(np.concatenate([part[i] for part in parts]) for i in range(4))
+
+
+def variant_at(x, y):
+    """Variant for a placement, fixed by its position so rebuilds look the same"""
+    # Tuples of ints hash the same in every process (only str/bytes hashing is salted)
+    return hash((round(x * 1000), round(y * 1000))) % PLANT_VARIANTS
+
+
+# ============= BLENDER =============
+
+def plant_mesh(variant, materials):
+    """The variant's mesh datablock, created on first use"""
+    name = f"PlantVariant{variant}"
+    mesh = bpy.data.meshes.get(name)
+    if mesh:
+        return mesh
+    mesh = mesh_from_arrays(name, *plant_geometry(variant))
+    for material in materials:
+        mesh.materials.append(material)
+    return mesh
+
+
+def add_plant(name, x, y, height, materials, variant=None):
+    """Place a plant of the given height standing at (x, y); materials are [pot, leaves]"""
+    variant = variant_at(x, y) if variant is None else variant
+    obj = bpy.data.objects.new(name, plant_mesh(variant, materials))
+    obj.location = (x, y, 0)
+    obj.scale = (height, height, height)
+    bpy.context.collection.objects.link(obj)
+    return obj
@@ -1,15 +1,64 @@
 #!/usr/bin/env python3
 """
-Blender script v3 - High Quality House Rendering
+Blender script v3 - House engine with quality tiers
 Features: Real doors, windows, detailed furniture, deck with pergola, bathroom fixtures, plants
+
+Tiers (--tier): shell (walls, floors, openings cut), basic (plus simple
+furniture), detailed (plus door/window frames, trim and full furniture) and
+high (plus decor and full tessellation, the default). render_house_v2.py,
+render_house_gltf.py and render_house_gltf_old.py are entry points for
+the basic and detailed tiers.
+
+With --furniture-library DIR, full furniture is linked from a prebuilt
+library in DIR (furniture_library.py) instead of built from primitives;
+the library is built there on first use. Adding --splice-furniture leaves
+the furniture out of the scene and splices pre-exported item GLBs into the
+exported house instead (glb_assemble.py). --shared-assets DIR (which
+implies splicing) keeps the item data out of the house altogether: it is
+written once to DIR as content-hashed .bin files that every house
+references by URI, relative to the GLB or under --shared-assets-url URL.
+
+--budget tris=N,bytes=N (e.g. tris=150k,bytes=5mb) caps the exported model:
+the build degrades step by step (DEGRADATION_STEPS) until the GLB fits,
+rebuilding when the measured export is still over, and reports the steps.
 """
 
-import bpy
+import contextlib
+import os
 import sys
 import json
 import math
 from random import uniform, seed
 
+import numpy as np
+
+try:
+    import bpy
+except ImportError:
+    # Plain CPython (no Blender): only --plan is available
+    bpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from build_control import BuildControl, BuildCancelled, PhaseTimeout, option_value, write_report
+from blueprint_check import load_blueprint
+from floor_grid import FloorGrid
+import furniture_layout
+import glb_assemble
+from glb_tools import glb_stats
+from house_layout import MM, is_outdoor, load_rooms
+from tessellation import circle_segments, sphere_segments
+import house_plan
+import plants
+import slabs
+import wall_shell
+if bpy:
+    import furniture_library
+    import hidden_faces
+    from mesh_arrays import create_mesh_from_arrays
+    import scene_outputs
+    import scene_stats
+    from ops_tracer import OpsTracer
+
 seed(42)  # Reproducible randomness
 
 # ============= CLEAR SCENE =============
@@ -19,6 +68,7 @@ def clear_scene():
     bpy.ops.object.delete(use_global=False)
     for material in bpy.data.materials:
         bpy.data.materials.remove(material)
+    materials_cache.clear()
     for mesh in bpy.data.meshes:
         bpy.data.meshes.remove(mesh)
 
@@ -31,6 +81,12 @@ def get_or_create_material(name, color, roughness=0.5, metallic=0.0, alpha=1.0):
     if cache_key in materials_cache:
         return materials_cache[cache_key]
     
+    # Loaded with the furniture library, made by this function when the library was built
+    mat = bpy.data.materials.get(name)
+    if mat:
+        materials_cache[cache_key] = mat
+        return mat
+    
     mat = bpy.data.materials.new(name=name)
     mat.use_nodes = True
     nodes = mat.node_tree.nodes
@@ -126,6 +182,112 @@ def mat_cabinet_wood():
 def mat_umbrella():
     return get_or_create_material('Umbrella', (0.95, 0.95, 0.92), 0.8)
 
+# ============= DETAIL SETTINGS =============
+
+# Knobs shared with the planner (see house_plan.TIERS)
+TIERS = house_plan.TIERS
+DEFAULT_TIER = house_plan.DEFAULT_TIER
+DEFAULT_DETAIL = house_plan.DEFAULT_DETAIL
+detail = dict(DEFAULT_DETAIL)
+degraded = []
+
+# Occupancy grid of the house being built (see floor_grid.py)
+floor_grid = None
+
+# Item meshes of the furniture library, when the build uses one (see furniture_library.py)
+furniture = None
+
+# Furniture left out of the scene for glb_assemble to splice into the GLB, [(room id, placement)],
+# or None when it is built
+spliced_furniture = None
+
+# Applied in this order when a job does not fit its memory or export budget
+DEGRADATION_STEPS = [
+    ('low_tessellation', {'segment_scale': 0.5}),
+    ('skip_decor', {'decor': False}),
+    ('merge_planks', {'merge_planks': True}),
+    ('simplify_furniture', {'furniture': 'basic'}),
+    ('skip_ceilings', {'ceilings': False}),
+]
+
+# Measured: 2000 operator-created boxes add ~115 MB RSS
+MB_PER_OBJECT = 0.06
+
+def degrade(reason, budget='memory'):
+    """Apply the next degradation step for a budget ('memory' or 'export'); returns False when none are left"""
+    done = {d['step'] for d in degraded}
+    for step, settings in DEGRADATION_STEPS:
+        # Skip steps the tier already implies (a tier without furniture is simpler than basic)
+        if step in done or all(detail[k] == v or (k, detail[k]) == ('furniture', 'none')
+                               for k, v in settings.items()):
+            continue
+        detail.update(settings)
+        degraded.append({'step': step, 'reason': reason, 'budget': budget})
+        print(f"⚠️  Degrading: {step} ({reason})")
+        return True
+    return False
+
+def snapshot_allowed():
+    """Whether the scene may be saved as a snapshot under its input key.
+
+    Memory degradation depends on the RSS during the build, which the key
+    cannot capture: a degraded scene would be reused for normal builds.
+    The export budget is part of the key (scene_outputs.house_snapshot_key).
+    """
+    steps = [d['step'] for d in degraded if d['budget'] == 'memory']
+    if steps:
+        print(f"⚠️  Snapshot not saved: scene degraded for memory ({', '.join(steps)})")
+        return False
+    return True
+
+def snapshot_info(rooms, tier):
+    """What a house snapshot keeps to be rendered later (scene_outputs.save_snapshot)"""
+    # Interior camera spots, kept with the snapshot so --view works without the blueprint
+    views = {room.id: floor_grid.viewpoint(room.id) for room in rooms if not is_outdoor(room)}
+    return {'kind': 'house', 'tier': tier, 'views': {k: v for k, v in views.items() if v}}
+
+def restore_degradation(entries):
+    """Re-apply the degradation steps of an earlier build of the same job"""
+    settings = dict(DEGRADATION_STEPS)
+    for entry in entries:
+        detail.update(settings[entry['step']])
+        degraded.append(entry)
+
+def fit_memory_budget(rooms, control, skip_ceilings=False):
+    """Degrade up front until the estimated scene fits the memory budget"""
+    if not control.memory_budget_mb:
+        return
+    while True:
+        objects = house_plan.plan_rooms(rooms, skip_ceilings, detail, furniture_library=bool(furniture))['objects']
+        estimate = control.sample_memory() + MB_PER_OBJECT * objects
+        if estimate <= control.memory_budget_mb:
+            return
+        if not degrade(f"estimated {estimate:.0f} MB > budget {control.memory_budget_mb:.0f} MB"):
+            return
+
+def fit_export_budget(rooms, control, skip_ceilings=False):
+    """Degrade up front until the planned triangles fit the export budget (bytes are measured after export)"""
+    limit = control.export_budget.get('triangles')
+    if not limit:
+        return
+    # Spliced furniture is the library's items, as the planner counts them
+    library = furniture is not None or spliced_furniture is not None
+    while True:
+        triangles = house_plan.plan_rooms(rooms, skip_ceilings, detail, furniture_library=library)['triangles']
+        if triangles <= limit or not degrade(f"planned {triangles} triangles > budget {limit}", 'export'):
+            return
+
+def export_overrun(control, glb_path):
+    """(measured, reason) for an exported GLB; reason is None when it fits the export budget.
+
+    Bytes include shared buffers the GLB references, since a first visit downloads them too.
+    """
+    stats = glb_stats(glb_path)
+    measured = {'triangles': stats['triangles'], 'bytes': stats['total_bytes'] + stats['external_bytes']}
+    over = [f"{measured[key]} {key} > budget {limit}"
+            for key, limit in control.export_budget.items() if measured[key] > limit]
+    return measured, '; '.join(over) or None
+
 # ============= GEOMETRY HELPERS =============
 
 def create_box(name, x, y, z, w, h, d, material):
@@ -139,8 +301,9 @@ def create_box(name, x, y, z, w, h, d, material):
         obj.data.materials.append(material)
     return obj
 
-def create_cylinder(name, x, y, z, radius, height, material=None, segments=32):
-    """Create a cylinder"""
+def create_cylinder(name, x, y, z, radius, height, material=None):
+    """Create a cylinder, with as many segments as its radius needs (see tessellation.py)"""
+    segments = circle_segments(radius, detail['segment_scale'])
     bpy.ops.mesh.primitive_cylinder_add(radius=radius, depth=height, vertices=segments, location=(x, y, z))
     obj = bpy.context.active_object
     obj.name = name
@@ -148,8 +311,9 @@ def create_cylinder(name, x, y, z, radius, height, material=None, segments=32):
         obj.data.materials.append(material)
     return obj
 
-def create_uv_sphere(name, x, y, z, radius, material, segments=16, rings=8):
+def create_uv_sphere(name, x, y, z, radius, material):
     """Create a UV sphere (for plants, etc)"""
+    segments, rings = sphere_segments(radius, detail['segment_scale'])
     bpy.ops.mesh.primitive_uv_sphere_add(radius=radius, segments=segments, ring_count=rings, location=(x, y, z))
     obj = bpy.context.active_object
     obj.name = name
@@ -157,67 +321,73 @@ def create_uv_sphere(name, x, y, z, radius, material, segments=16, rings=8):
         obj.data.materials.append(material)
     return obj
 
-# ============= ROOM CLASS =============
-
-class Room:
-    def __init__(self, data):
-        self.id = data.get('id', 'room')
-        self.name = data.get('name', 'Room')
-        self.type = data.get('type', 'living')
-        self.width = float(data.get('width', 4))
-        self.length = float(data.get('length', 5))
-        self.height = float(data.get('height', 2.8)) if data.get('height', 2.8) > 0 else 2.8
-        self.outdoor = data.get('outdoor', False)
-        pos = data.get('position', {'x': 0, 'y': 0})
-        self.x = float(pos.get('x', 0))
-        self.y = float(pos.get('y', 0))
-        self.doors = data.get('doors', [])
-        self.windows = data.get('windows', [])
-    
-    @property
-    def x2(self):
-        return self.x + self.width
-    
-    @property
-    def y2(self):
-        return self.y + self.length
-    
-    @property
-    def center(self):
-        return (self.x + self.width/2, self.y + self.length/2)
+# ============= ARRAY GEOMETRY =============
+# Repeated elements (planks, rafters, steps) are built as ONE mesh per feature
+# from NumPy arrays instead of one operator call and object per element.
+
+# Unit cube corners and outward quads, in primitive_cube_add's order
+BOX_CORNERS = np.array([(x, y, z) for x in (-0.5, 0.5) for y in (-0.5, 0.5) for z in (-0.5, 0.5)], dtype=np.float32)
+BOX_FACES = np.array([(0, 1, 3, 2), (2, 3, 7, 6), (6, 7, 5, 4),
+                      (4, 5, 1, 0), (2, 6, 4, 0), (7, 3, 1, 5)], dtype=np.int32)
+
+def box_geometry(centers, sizes):
+    """Vertices, loops and face sizes of axis-aligned boxes.
+
+    centers: (N, 3) box centers; sizes: (N, 3) or (3,) extents along x, y, z.
+    """
+    centers = np.asarray(centers, dtype=np.float32).reshape(-1, 3)
+    sizes = np.broadcast_to(np.asarray(sizes, dtype=np.float32), centers.shape)
+    verts = centers[:, None, :] + BOX_CORNERS[None, :, :] * sizes[:, None, :]
+    loops = BOX_FACES[None, :, :] + 8 * np.arange(len(centers), dtype=np.int32)[:, None, None]
+    return verts.reshape(-1, 3), loops.ravel(), np.full(6 * len(centers), 4)
+
+def cylinder_geometry(centers, radius, height):
+    """Vertices, loops and face sizes of upright cylinders (same radius/height)"""
+    centers = np.asarray(centers, dtype=np.float32).reshape(-1, 3)
+    n = circle_segments(radius, detail['segment_scale'])
+    angles = 2 * np.pi * np.arange(n) / n
+    ring = np.stack([radius * np.cos(angles), radius * np.sin(angles)], axis=1)
+    unit = np.concatenate([np.column_stack([ring, np.full(n, -height / 2)]),
+                           np.column_stack([ring, np.full(n, height / 2)])]).astype(np.float32)
+
+    k = np.arange(n)
+    sides = np.stack([k, (k + 1) % n, n + (k + 1) % n, n + k], axis=1).ravel()
+    faces = np.concatenate([sides, n + k, k[::-1]])     # side quads, top cap, bottom cap
+    face_sizes = np.concatenate([np.full(n, 4), [n, n]])
+
+    count = len(centers)
+    verts = centers[:, None, :] + unit[None, :, :]
+    loops = faces[None, :] + 2 * n * np.arange(count)[:, None]
+    return verts.reshape(-1, 3), loops.ravel(), np.tile(face_sizes, count)
+
+def create_box_array(name, centers, sizes, material):
+    """Create many axis-aligned boxes as a single mesh object (see box_geometry).
+
+    Returns None when there are no boxes.
+    """
+    if not len(centers):
+        return None
+    return create_mesh_from_arrays(name, *box_geometry(centers, sizes), material)
+
+def create_cylinder_array(name, centers, radius, height, material):
+    """Create many upright cylinders (same radius/height) as a single mesh object"""
+    if not len(centers):
+        return None
+    return create_mesh_from_arrays(name, *cylinder_geometry(centers, radius, height), material)
 
 # ============= FLOORS =============
 
-def create_floor(room):
-    """Create detailed floor for a room"""
-    cx, cy = room.center
-    
+def create_floor(room, walls):
+    """Deck planks or baseboards for a room (floor slabs are merged per material, see create_slabs)"""
     if room.type in ['deck', 'balcony']:
         create_deck_floor(room)
         return
     
-    if room.type in ['bathroom']:
-        mat = mat_tile_white()
-    elif room.type in ['kitchen']:
-        mat = mat_tile_beige()
-    else:
-        mat = mat_wood_floor()
-    
-    # Main floor
-    create_box(f"Floor_{room.id}", cx, cy, 0.01, room.width, 0.02, room.length, mat)
-    
-    # Add floor trim/baseboards
-    if not room.outdoor:
-        trim_h = 0.08
-        trim_d = 0.015
-        trim_mat = mat_wood_light()
-        
-        # Front and back
-        create_box(f"Trim_{room.id}_F", cx, room.y + trim_d/2, trim_h/2, room.width, trim_h, trim_d, trim_mat)
-        create_box(f"Trim_{room.id}_B", cx, room.y2 - trim_d/2, trim_h/2, room.width, trim_h, trim_d, trim_mat)
-        # Left and right
-        create_box(f"Trim_{room.id}_L", room.x + trim_d/2, cy, trim_h/2, trim_d, trim_h, room.length, trim_mat)
-        create_box(f"Trim_{room.id}_R", room.x2 - trim_d/2, cy, trim_h/2, trim_d, trim_h, room.length, trim_mat)
+    # Baseboards: one mesh per room, open at doors (walls: all planned walls of the house)
+    if not room.outdoor and detail['trim']:
+        boxes = wall_shell.baseboard_boxes(room, walls) / MM
+        create_box_array(f"Trim_{room.id}", (boxes[:, :3] + boxes[:, 3:]) / 2, boxes[:, 3:] - boxes[:, :3],
+                         mat_wood_light())
 
 def create_deck_floor(room):
     """Create wooden deck floor with planks"""
@@ -225,711 +395,158 @@ def create_deck_floor(room):
     plank_gap = 0.01
     mat = mat_deck_wood()
     
-    num_planks = int(room.length / (plank_width + plank_gap))
-    
-    for i in range(num_planks):
-        y = room.y + 0.08 + i * (plank_width + plank_gap)
-        create_box(
-            f"DeckPlank_{room.id}_{i}",
-            room.x + room.width/2, y, 0.02,
-            room.width - 0.1, 0.025, plank_width,
-            mat
-        )
-
-def create_ceiling(room, skip_ceilings=False):
-    """Create ceiling for a room"""
-    if room.outdoor or room.type in ['deck', 'balcony'] or skip_ceilings:
+    if detail['merge_planks']:
+        create_box(f"DeckFloor_{room.id}", room.x + room.width/2, room.y + room.length/2, 0.02,
+                   room.width - 0.1, 0.025, room.length - 0.1, mat)
         return
-    cx, cy = room.center
-    create_box(f"Ceiling_{room.id}", cx, cy, room.height - 0.01, room.width, 0.02, room.length, mat_ceiling())
+    
+    num_planks = int(room.length / (plank_width + plank_gap))
+    plank_y = room.y + 0.08 + np.arange(num_planks) * (plank_width + plank_gap)
+    centers = np.column_stack([np.full(num_planks, room.x + room.width/2), plank_y, np.full(num_planks, 0.02)])
+    create_box_array(f"DeckPlanks_{room.id}", centers, (room.width - 0.1, plank_width, 0.025), mat)
+
+# ============= SLABS =============
+
+FLOOR_MATERIALS = {'WoodFloor': mat_wood_floor, 'TileWhite': mat_tile_white, 'TileBeige': mat_tile_beige}
+
+def create_slab(name, slab, material):
+    """One mesh for a slab (see slabs.py); the room of each face is kept for picking"""
+    obj = create_mesh_from_arrays(name, slab['vertices'], slab['loops'], slab['face_sizes'], material)
+    room_index = obj.data.attributes.new("room_index", 'INT', 'FACE')
+    room_index.data.foreach_set("value", np.arange(len(slab['face_rooms']), dtype=np.int32))
+    # Exported as glTF extras: room id -> face index and footprint (x0, y0, x1, y1)
+    obj["rooms"] = {room_id: {'index': n, 'bounds': slab['room_bounds'][room_id]}
+                    for n, room_id in enumerate(slab['face_rooms'])}
+    return obj
 
-# ============= WALLS =============
+def create_slabs(rooms, skip_ceilings=False):
+    """Floors merged into one mesh per material, and all ceilings into one mesh"""
+    for material, slab in slabs.floor_slabs(rooms).items():
+        create_slab(f"Floor_{material}", slab, FLOOR_MATERIALS[material]())
+    ceiling = slabs.ceiling_slab(rooms, skip_ceilings)
+    if ceiling:
+        create_slab("Ceilings", ceiling, mat_ceiling())
 
-def create_wall_segment(name, x1, y1, x2, y2, z_bottom, z_top, thickness=0.12, exterior=False, z_offset=0):
-    """Create a wall segment between two points"""
-    dx = x2 - x1
-    dy = y2 - y1
-    length = math.sqrt(dx*dx + dy*dy)
-    
-    if length < 0.05:
-        return None
-    
-    angle = math.atan2(dy, dx)
-    cx = (x1 + x2) / 2
-    cy = (y1 + y2) / 2
-    cz = (z_bottom + z_top) / 2
-    height = z_top - z_bottom
-    
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(cx, cy, cz))
-    wall = bpy.context.active_object
-    wall.name = name
-    wall.scale = (length, thickness, height)
-    wall.rotation_euler = (0, 0, angle)
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    
-    mat = mat_wall_exterior() if exterior else mat_wall()
-    wall.data.materials.append(mat)
-    return wall
+# ============= WALLS =============
 
-def create_wall_with_opening_bmesh(name, x1, y1, x2, y2, wall_height, opening_start, opening_end, opening_bottom, opening_top, thickness=0.12, exterior=False):
-    """
-    Create a single wall mesh with an opening (door or window) using BMesh.
-    This prevents Z-fighting by creating ONE continuous mesh instead of multiple cubes.
-    
-    Parameters:
-    - opening_start/end: distance along wall (0 to length)
-    - opening_bottom/top: Z coordinates of opening
-    """
-    import bmesh
-    
-    dx = x2 - x1
-    dy = y2 - y1
-    length = math.sqrt(dx*dx + dy*dy)
-    
-    if length < 0.05:
+def create_wall_shell(walls, rooms):
+    """All walls of the house as one watertight mesh, with the opening frames at 'full' openings (see wall_shell.py)"""
+    shell = wall_shell.build_shell(walls, rooms, frames=detail['openings'] == 'full')
+    if not shell:
         return None
-    
-    # Normalized direction and perpendicular
-    ux, uy = dx/length, dy/length
-    px, py = -uy * thickness/2, ux * thickness/2
-    
-    # Create BMesh
-    bm = bmesh.new()
-    
-    # Wall vertices (in local 2D space, we'll transform later)
-    # The wall is a flat rectangle with a rectangular hole
-    # We need 8 outer vertices + 4 inner vertices for the opening
-    
-    # Outer rectangle corners (on the XZ plane, we'll rotate to world space)
-    # Using length along X, height along Z
-    h = wall_height
-    
-    # Outer vertices (front face) - counter-clockwise from bottom-left
-    # 0: bottom-left, 1: bottom-right, 2: top-right, 3: top-left
-    # Plus vertices at opening boundaries
-    
-    # For a wall with opening, we create vertices at:
-    # Bottom edge: 0, opening_start, opening_end, length
-    # At opening_bottom: opening_start, opening_end
-    # At opening_top: opening_start, opening_end  
-    # Top edge: 0, length (we can skip intermediate if opening doesn't touch)
-    
-    # Simplify: create the wall profile as a 2D shape with hole, then extrude
-    
-    # Front face vertices (x=length coord, z=height coord)
-    verts_front = []
-    verts_back = []
-    
-    # Create outer boundary vertices (CCW)
-    outer_coords = [
-        (0, 0),  # 0
-        (length, 0),  # 1
-        (length, h),  # 2
-        (0, h),  # 3
-    ]
-    
-    # Create opening boundary vertices (CW for hole)
-    inner_coords = [
-        (opening_start, opening_bottom),  # 4
-        (opening_end, opening_bottom),  # 5
-        (opening_end, opening_top),  # 6
-        (opening_start, opening_top),  # 7
-    ]
-    
-    # Transform to world coordinates
-    def local_to_world(lx, lz, back=False):
-        """Convert local (length, height) to world (x, y, z)"""
-        # Position along the wall
-        wx = x1 + ux * lx
-        wy = y1 + uy * lx
-        # Offset perpendicular for thickness
-        if back:
-            wx -= px * 2
-            wy -= py * 2
-        else:
-            wx += px * 2
-            wy += py * 2
-        return (wx, wy, lz)
-    
-    # Create vertices
-    for lx, lz in outer_coords:
-        verts_front.append(bm.verts.new(local_to_world(lx, lz, False)))
-    for lx, lz in inner_coords:
-        verts_front.append(bm.verts.new(local_to_world(lx, lz, False)))
-    
-    for lx, lz in outer_coords:
-        verts_back.append(bm.verts.new(local_to_world(lx, lz, True)))
-    for lx, lz in inner_coords:
-        verts_back.append(bm.verts.new(local_to_world(lx, lz, True)))
-    
-    bm.verts.ensure_lookup_table()
-    
-    # Front face indices: 0-3 outer, 4-7 inner (hole)
-    # We need to create faces around the hole
-    # Split into regions: bottom, right, top, left of opening
-    
-    # Create faces for front side (with hole)
-    # Bottom region: from y=0 to y=opening_bottom, full width
-    # But we need proper triangulation. Let's use a simpler approach:
-    # Create the 4 regions around the opening as quads
-    
-    # Actually, for clean geometry, let's add more vertices to make proper quads
-    # Let's restart with a cleaner approach: 12 vertices per side
-    
-    bm.free()
-    bm = bmesh.new()
-    
-    # Vertices layout (front face, looking at -Y):
-    #  11----10-----9-----8
-    #  |                  |
-    #  0     7-----6      |
-    #  |     |     |      |
-    #  |     4-----5      |
-    #  |                  |
-    #  1-----2-----3------4... wait this is confusing
-    
-    # Simpler: create 16 vertices (8 for outer+inner connections, 4 for opening)
-    # Let me use a cleaner grid approach
-    
-    # X positions: 0, opening_start, opening_end, length
-    # Z positions: 0, opening_bottom, opening_top, wall_height
-    
-    x_coords = [0, opening_start, opening_end, length]
-    z_coords = [0, opening_bottom, opening_top, h]
-    
-    # Create grid of vertices (4x4 = 16 per side)
-    front_grid = {}
-    back_grid = {}
-    
-    for i, lx in enumerate(x_coords):
-        for j, lz in enumerate(z_coords):
-            # Front
-            wx = x1 + ux * lx + px
-            wy = y1 + uy * lx + py
-            front_grid[(i, j)] = bm.verts.new((wx, wy, lz))
-            
-            # Back
-            wx = x1 + ux * lx - px
-            wy = y1 + uy * lx - py
-            back_grid[(i, j)] = bm.verts.new((wx, wy, lz))
-    
-    bm.verts.ensure_lookup_table()
-    
-    # Create faces
-    # Front face - 9 quads minus the center one (opening)
-    for i in range(3):
-        for j in range(3):
-            # Skip the opening (i=1, j=1)
-            if i == 1 and j == 1:
-                continue
-            
-            v1 = front_grid[(i, j)]
-            v2 = front_grid[(i+1, j)]
-            v3 = front_grid[(i+1, j+1)]
-            v4 = front_grid[(i, j+1)]
-            bm.faces.new([v1, v2, v3, v4])
-    
-    # Back face - same but reversed winding
-    for i in range(3):
-        for j in range(3):
-            if i == 1 and j == 1:
-                continue
-            
-            v1 = back_grid[(i, j)]
-            v2 = back_grid[(i+1, j)]
-            v3 = back_grid[(i+1, j+1)]
-            v4 = back_grid[(i, j+1)]
-            bm.faces.new([v4, v3, v2, v1])  # Reversed
-    
-    # Side faces (left and right edges of wall)
-    # Left edge (i=0)
-    for j in range(3):
-        v1 = front_grid[(0, j)]
-        v2 = front_grid[(0, j+1)]
-        v3 = back_grid[(0, j+1)]
-        v4 = back_grid[(0, j)]
-        bm.faces.new([v1, v4, v3, v2])
-    
-    # Right edge (i=3)
-    for j in range(3):
-        v1 = front_grid[(3, j)]
-        v2 = front_grid[(3, j+1)]
-        v3 = back_grid[(3, j+1)]
-        v4 = back_grid[(3, j)]
-        bm.faces.new([v2, v3, v4, v1])
-    
-    # Top edge (j=3)
-    for i in range(3):
-        v1 = front_grid[(i, 3)]
-        v2 = front_grid[(i+1, 3)]
-        v3 = back_grid[(i+1, 3)]
-        v4 = back_grid[(i, 3)]
-        bm.faces.new([v1, v2, v3, v4])
-    
-    # Bottom edge (j=0)
-    for i in range(3):
-        v1 = front_grid[(i, 0)]
-        v2 = front_grid[(i+1, 0)]
-        v3 = back_grid[(i+1, 0)]
-        v4 = back_grid[(i, 0)]
-        bm.faces.new([v2, v1, v4, v3])
-    
-    # Opening interior faces (the "tunnel" through the wall)
-    # Bottom of opening (j=1)
-    v1 = front_grid[(1, 1)]
-    v2 = front_grid[(2, 1)]
-    v3 = back_grid[(2, 1)]
-    v4 = back_grid[(1, 1)]
-    bm.faces.new([v2, v1, v4, v3])
-    
-    # Top of opening (j=2)
-    v1 = front_grid[(1, 2)]
-    v2 = front_grid[(2, 2)]
-    v3 = back_grid[(2, 2)]
-    v4 = back_grid[(1, 2)]
-    bm.faces.new([v1, v2, v3, v4])
-    
-    # Left of opening (i=1)
-    v1 = front_grid[(1, 1)]
-    v2 = front_grid[(1, 2)]
-    v3 = back_grid[(1, 2)]
-    v4 = back_grid[(1, 1)]
-    bm.faces.new([v1, v2, v3, v4])
-    
-    # Right of opening (i=2)
-    v1 = front_grid[(2, 1)]
-    v2 = front_grid[(2, 2)]
-    v3 = back_grid[(2, 2)]
-    v4 = back_grid[(2, 1)]
-    bm.faces.new([v2, v1, v4, v3])
-    
-    # Create mesh and object
-    mesh = bpy.data.meshes.new(name)
-    bm.to_mesh(mesh)
-    bm.free()
-    
-    obj = bpy.data.objects.new(name, mesh)
-    bpy.context.collection.objects.link(obj)
-    
-    # Apply material
-    mat = mat_wall_exterior() if exterior else mat_wall()
-    obj.data.materials.append(mat)
-    
-    # Recalculate normals
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-    bpy.ops.mesh.normals_make_consistent(inside=False)
-    bpy.ops.object.mode_set(mode='OBJECT')
-    
+    # Material per wall_shell slot: INTERIOR, EXTERIOR, DOOR_FRAME, SLIDING_FRAME, WINDOW_FRAME;
+    # only the slots in use get a material
+    slots = [mat_wall, mat_wall_exterior, mat_wood_dark, mat_metal_chrome, mat_wood_light]
+    used = np.unique(shell['face_materials'])
+    return create_mesh_from_arrays("Walls", shell['vertices'], shell['loops'], shell['face_sizes'],
+                                   [slots[slot]() for slot in used], np.searchsorted(used, shell['face_materials']))
+
+def create_door_leaf(name, leaf):
+    """Hinged door leaf standing ajar, with a handle on each face, as one mesh (leaf: see wall_shell.opening_assembly)"""
+    thickness = 0.04
+    width, bottom, top = leaf['width'] / MM, leaf['bottom'] / MM, leaf['top'] / MM
+    # Modelled closed along +x from the hinge, then turned open about it
+    panel = box_geometry([(width / 2, 0, (bottom + top) / 2)], (width, thickness, top - bottom))
+    handles = cylinder_geometry([(width - 0.08, side * (thickness / 2 + 0.01), 1.0) for side in (-1, 1)],
+                                0.015, 0.1)
+    obj = create_mesh_from_arrays(name, np.concatenate([panel[0], handles[0]]),
+                                  np.concatenate([panel[1], handles[1] + len(panel[0])]),
+                                  np.concatenate([panel[2], handles[2]]),
+                                  [mat_wood_light(), mat_metal_brass()],
+                                  np.repeat([0, 1], [len(panel[2]), len(handles[2])]))
+    hinge_x, hinge_y = leaf['hinge']
+    dx, dy = leaf['direction']
+    obj.location = (hinge_x / MM, hinge_y / MM, 0)
+    obj.rotation_euler = (0, 0, math.atan2(dy, dx) + math.radians(15))
     return obj
 
-def get_wall_coords(room, wall_name):
-    """Get start and end coordinates for a wall"""
-    if wall_name == 'front':
-        return (room.x, room.y, room.x2, room.y)
-    elif wall_name == 'back':
-        return (room.x, room.y2, room.x2, room.y2)
-    elif wall_name == 'left':
-        return (room.x, room.y, room.x, room.y2)
-    elif wall_name == 'right':
-        return (room.x2, room.y, room.x2, room.y2)
-    return None
-
-def find_adjacent_room(room, wall_name, all_rooms):
-    """Find if another room is adjacent on this wall"""
-    tolerance = 0.3
-    
-    for other in all_rooms:
-        if other.id == room.id:
-            continue
-        
-        if wall_name == 'right':
-            if abs(other.x - room.x2) < tolerance:
-                if other.y < room.y2 and other.y2 > room.y:
-                    return other
-        elif wall_name == 'left':
-            if abs(other.x2 - room.x) < tolerance:
-                if other.y < room.y2 and other.y2 > room.y:
-                    return other
-        elif wall_name == 'back':
-            if abs(other.y - room.y2) < tolerance:
-                if other.x < room.x2 and other.x2 > room.x:
-                    return other
-        elif wall_name == 'front':
-            if abs(other.y2 - room.y) < tolerance:
-                if other.x < room.x2 and other.x2 > room.x:
-                    return other
-    
-    return None
-
-def get_door_on_wall(room, wall_name):
-    for door in room.doors:
-        if door.get('wall') == wall_name:
-            return door
-    return None
-
-def get_window_on_wall(room, wall_name):
-    for window in room.windows:
-        if window.get('wall') == wall_name:
-            return window
-    return None
-
-def create_wall_with_door(name, x1, y1, x2, y2, room_height, door_pos=0.5, door_width=0.9, door_height=2.1, door_type='standard'):
-    """Create a wall with a door opening using single BMesh (no Z-fighting)"""
-    dx = x2 - x1
-    dy = y2 - y1
-    length = math.sqrt(dx*dx + dy*dy)
-    
-    if length < 0.05:
+def add_openings(room, walls):
+    """Glass panes and door leaves for the openings in a room's walls (cut and framed in the wall shell)"""
+    if detail['openings'] != 'full':
         return
-    
-    door_center = door_pos * length
-    door_start = max(0.05, door_center - door_width/2)
-    door_end = min(length - 0.05, door_center + door_width/2)
-    actual_door_width = door_end - door_start
-    
-    # Create single wall mesh with door opening
-    create_wall_with_opening_bmesh(
-        name, x1, y1, x2, y2, room_height,
-        opening_start=door_start,
-        opening_end=door_end,
-        opening_bottom=0,
-        opening_top=min(door_height, room_height - 0.1),
-        exterior=False
-    )
-    
-    # Create actual door
-    ux, uy = dx/length, dy/length
-    door_cx = x1 + ux * door_center
-    door_cy = y1 + uy * door_center
-    angle = math.atan2(dy, dx)
-    
-    if door_type == 'sliding_glass':
-        create_sliding_glass_door(f"Door_{name}", door_cx, door_cy, actual_door_width, door_height, angle)
-    else:
-        create_hinged_door(f"Door_{name}", door_cx, door_cy, actual_door_width, door_height, angle)
-
-def create_hinged_door(name, cx, cy, width, height, angle):
-    """Create a hinged door with frame"""
-    frame_w = 0.06
-    frame_d = 0.1
-    mat_frame = mat_wood_dark()
-    mat_door = mat_wood_light()
-    
-    # Direction vectors
-    cos_a = math.cos(angle)
-    sin_a = math.sin(angle)
-    
-    # Frame left (perpendicular offset from center)
-    left_offset = -width/2 + frame_w/2
-    frame_lx = cx + cos_a * left_offset
-    frame_ly = cy + sin_a * left_offset
-    
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(frame_lx, frame_ly, height/2))
-    fl = bpy.context.active_object
-    fl.name = f"{name}_FrameL"
-    fl.scale = (frame_w, frame_d, height)
-    fl.rotation_euler = (0, 0, angle)
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    fl.data.materials.append(mat_frame)
-    
-    # Frame right
-    right_offset = width/2 - frame_w/2
-    frame_rx = cx + cos_a * right_offset
-    frame_ry = cy + sin_a * right_offset
-    
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(frame_rx, frame_ry, height/2))
-    fr = bpy.context.active_object
-    fr.name = f"{name}_FrameR"
-    fr.scale = (frame_w, frame_d, height)
-    fr.rotation_euler = (0, 0, angle)
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    fr.data.materials.append(mat_frame)
-    
-    # Frame top
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(cx, cy, height - frame_w/2))
-    ft = bpy.context.active_object
-    ft.name = f"{name}_FrameT"
-    ft.scale = (width, frame_d, frame_w)
-    ft.rotation_euler = (0, 0, angle)
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    ft.data.materials.append(mat_frame)
-    
-    # Door panel (slightly open - 15 degrees)
-    door_panel_width = width - 2*frame_w - 0.02
-    door_open_angle = angle + math.radians(15)
-    
-    # Door pivot is at left frame
-    pivot_offset = -width/2 + frame_w + door_panel_width/2
-    # When door opens, it rotates around left edge
-    door_cx = cx + cos_a * (-width/2 + frame_w) + math.cos(door_open_angle) * door_panel_width/2
-    door_cy = cy + sin_a * (-width/2 + frame_w) + math.sin(door_open_angle) * door_panel_width/2
-    
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(door_cx, door_cy, height/2 - 0.02))
-    door = bpy.context.active_object
-    door.name = f"{name}_Panel"
-    door.scale = (door_panel_width, 0.04, height - frame_w - 0.02)
-    door.rotation_euler = (0, 0, door_open_angle)
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    door.data.materials.append(mat_door)
-    
-    # Door handle
-    handle_offset = door_panel_width/2 - 0.08
-    handle_x = door_cx + math.cos(door_open_angle) * handle_offset
-    handle_y = door_cy + math.sin(door_open_angle) * handle_offset
-    
-    create_cylinder(f"{name}_Handle", handle_x, handle_y, 1.0, 0.015, 0.1, mat_metal_brass())
-
-def create_sliding_glass_door(name, cx, cy, width, height, angle):
-    """Create a sliding glass door"""
-    frame_thickness = 0.04
-    mat_frame = mat_metal_chrome()
-    mat_g = mat_glass()
-    
-    # Frame
-    # Left
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(cx - width/2 + 0.02, cy, height/2))
-    frame_l = bpy.context.active_object
-    frame_l.scale = (0.04, frame_thickness, height)
-    frame_l.rotation_euler = (0, 0, angle)
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    frame_l.data.materials.append(mat_frame)
-    
-    # Right
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(cx + width/2 - 0.02, cy, height/2))
-    frame_r = bpy.context.active_object
-    frame_r.scale = (0.04, frame_thickness, height)
-    frame_r.rotation_euler = (0, 0, angle)
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    frame_r.data.materials.append(mat_frame)
-    
-    # Top
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(cx, cy, height - 0.02))
-    frame_t = bpy.context.active_object
-    frame_t.scale = (width, frame_thickness, 0.04)
-    frame_t.rotation_euler = (0, 0, angle)
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    frame_t.data.materials.append(mat_frame)
-    
-    # Glass panels (2 panels)
-    panel_width = (width - 0.08) / 2
-    for i, offset in enumerate([-panel_width/2 - 0.01, panel_width/2 + 0.01]):
-        glass_x = cx + math.cos(angle) * offset
-        glass_y = cy + math.sin(angle) * offset
-        bpy.ops.mesh.primitive_cube_add(size=1, location=(glass_x, glass_y, height/2))
-        glass = bpy.context.active_object
-        glass.name = f"{name}_Glass{i}"
-        glass.scale = (panel_width, 0.01, height - 0.06)
-        glass.rotation_euler = (0, 0, angle)
-        bpy.ops.object.transform_apply(scale=True, rotation=True)
-        glass.data.materials.append(mat_g)
-
-def create_wall_with_window(name, x1, y1, x2, y2, room_height, win_pos=0.5, win_width=1.2, win_bottom=0.9, win_height=1.4):
-    """Create a wall with a window opening using single BMesh (no Z-fighting)"""
-    dx = x2 - x1
-    dy = y2 - y1
-    length = math.sqrt(dx*dx + dy*dy)
-    
-    if length < 0.05:
-        return
-    
-    win_center = win_pos * length
-    win_start = max(0.05, win_center - win_width/2)
-    win_end = min(length - 0.05, win_center + win_width/2)
-    win_top = min(win_bottom + win_height, room_height - 0.05)
-    actual_win_width = win_end - win_start
-    
-    # Create single wall mesh with window opening
-    create_wall_with_opening_bmesh(
-        name, x1, y1, x2, y2, room_height,
-        opening_start=win_start,
-        opening_end=win_end,
-        opening_bottom=max(0.05, win_bottom),
-        opening_top=win_top,
-        exterior=True
-    )
-    
-    # Create actual window
-    ux, uy = dx/length, dy/length
-    win_cx = x1 + ux * win_center
-    win_cy = y1 + uy * win_center
-    angle = math.atan2(dy, dx)
-    create_window(f"Win_{name}", win_cx, win_cy, actual_win_width, win_height, win_bottom, angle)
-
-def create_window(name, cx, cy, width, height, bottom, angle):
-    """Create window with frame using correct rotation"""
-    mat_frame = mat_wood_light()
-    mat_g = mat_glass()
-    frame_w = 0.05
-    frame_d = 0.08
-    
-    cz = bottom + height/2
-    
-    # Direction vectors
-    cos_a = math.cos(angle)
-    sin_a = math.sin(angle)
-    
-    # Frame - Left
-    left_offset = -width/2 + frame_w/2
-    frame_lx = cx + cos_a * left_offset
-    frame_ly = cy + sin_a * left_offset
-    
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(frame_lx, frame_ly, cz))
-    fl = bpy.context.active_object
-    fl.name = f"{name}_FrameL"
-    fl.scale = (frame_w, frame_d, height)
-    fl.rotation_euler = (0, 0, angle)
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    fl.data.materials.append(mat_frame)
-    
-    # Frame - Right
-    right_offset = width/2 - frame_w/2
-    frame_rx = cx + cos_a * right_offset
-    frame_ry = cy + sin_a * right_offset
-    
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(frame_rx, frame_ry, cz))
-    fr = bpy.context.active_object
-    fr.name = f"{name}_FrameR"
-    fr.scale = (frame_w, frame_d, height)
-    fr.rotation_euler = (0, 0, angle)
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    fr.data.materials.append(mat_frame)
-    
-    # Frame - Top
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(cx, cy, bottom + height - frame_w/2))
-    ft = bpy.context.active_object
-    ft.name = f"{name}_FrameT"
-    ft.scale = (width - 2*frame_w, frame_d, frame_w)
-    ft.rotation_euler = (0, 0, angle)
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    ft.data.materials.append(mat_frame)
-    
-    # Frame - Bottom (sill - wider)
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(cx, cy, bottom + frame_w/2))
-    fb = bpy.context.active_object
-    fb.name = f"{name}_Sill"
-    fb.scale = (width + 0.04, 0.12, frame_w)
-    fb.rotation_euler = (0, 0, angle)
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    fb.data.materials.append(mat_frame)
-    
-    # Glass pane (single, simpler)
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(cx, cy, cz))
-    g = bpy.context.active_object
-    g.name = f"{name}_Glass"
-    g.scale = (width - 2*frame_w - 0.02, 0.01, height - 2*frame_w - 0.02)
-    g.rotation_euler = (0, 0, angle)
-    bpy.ops.object.transform_apply(scale=True, rotation=True)
-    g.data.materials.append(mat_g)
-
-def create_room_walls(room, all_rooms, created_walls):
-    """Create walls for a room, handling shared walls properly"""
-    if room.outdoor or room.type in ['deck', 'balcony']:
-        return
-    
-    for wall_name in ['front', 'back', 'left', 'right']:
-        coords = get_wall_coords(room, wall_name)
-        if not coords:
+    for wall in walls:
+        assembly = wall_shell.opening_assembly(wall)
+        if not assembly:
             continue
-        
-        x1, y1, x2, y2 = coords
-        wall_key = tuple(sorted([(round(x1,1), round(y1,1)), (round(x2,1), round(y2,1))]))
-        
-        if wall_key in created_walls:
-            continue
-        
-        adjacent = find_adjacent_room(room, wall_name, all_rooms)
-        
-        if adjacent and not adjacent.outdoor:
-            created_walls.add(wall_key)
-            
-            door = get_door_on_wall(room, wall_name)
-            if not door:
-                opposite = {'front': 'back', 'back': 'front', 'left': 'right', 'right': 'left'}
-                door = get_door_on_wall(adjacent, opposite[wall_name])
-            
-            if door:
-                create_wall_with_door(
-                    f"Wall_{room.id}_{wall_name}",
-                    x1, y1, x2, y2,
-                    room.height,
-                    door.get('position', 0.5),
-                    door.get('width', 0.9),
-                    door.get('height', 2.1),
-                    door.get('type', 'standard')
-                )
-            else:
-                create_wall_segment(f"Wall_{room.id}_{wall_name}", x1, y1, x2, y2, 0, room.height)
-        else:
-            created_walls.add(wall_key)
-            
-            window = get_window_on_wall(room, wall_name)
-            door = get_door_on_wall(room, wall_name)
-            
-            if window:
-                create_wall_with_window(
-                    f"Wall_{room.id}_{wall_name}",
-                    x1, y1, x2, y2,
-                    room.height,
-                    window.get('position', 0.5),
-                    window.get('width', 1.2),
-                    window.get('bottom', 0.9),
-                    window.get('height', 1.4)
-                )
-            elif door:
-                create_wall_with_door(
-                    f"Wall_{room.id}_{wall_name}",
-                    x1, y1, x2, y2,
-                    room.height,
-                    door.get('position', 0.5),
-                    door.get('width', 0.9),
-                    door.get('height', 2.1),
-                    door.get('type', 'standard')
-                )
-            else:
-                create_wall_segment(f"Wall_{room.id}_{wall_name}", x1, y1, x2, y2, 0, room.height, exterior=True)
+        name = f"{'Win' if assembly['kind'] == 'window' else 'Door'}_Wall_{room.id}_{wall['side']}"
+        if assembly['glass']:
+            boxes = np.array(assembly['glass']) / MM
+            create_box_array(f"{name}_Glass", (boxes[:, :3] + boxes[:, 3:]) / 2, boxes[:, 3:] - boxes[:, :3],
+                             mat_glass())
+        if assembly['leaf']:
+            create_door_leaf(f"{name}_Panel", assembly['leaf'])
 
 # ============= FURNITURE =============
 
 def add_furniture(room):
-    """Add detailed furniture based on room type"""
+    """Add furniture based on room type and the tier's furniture level"""
+    if room.type == 'stairs':
+        add_stairs(room)  # Structure, built at every tier
+        return
+    if detail['furniture'] == 'none':
+        return
+    if detail['furniture'] == 'basic':
+        add_basic_furniture(room)
+        return
+    
+    placements = furniture_layout.room_furniture(room)
+    for placement in placements:
+        place_furniture(placement, room.id)
+    
+    if room.type == 'living':
+        add_living_room_decor(room)
+    elif room.type in ['deck', 'balcony']:
+        # Umbrella and plants are decor
+        if detail['decor']:
+            loungers = [p for p in placements if p.item == 'lounger']
+            add_deck_decor(room, sum(p.x for p in loungers) / len(loungers), loungers[0].y)
+        create_pergola(room)
+
+def place_furniture(placement, room_id):
+    """One furniture item (see furniture_layout.py): spliced in after export, linked from the library
+    when one is loaded, else built. Its footprint is taken on the floor grid either way."""
+    if floor_grid:
+        floor_grid.occupy(placement.x, placement.y, placement.width, placement.length)
+    if spliced_furniture is not None:
+        spliced_furniture.append((room_id, placement))
+        return None
+    if furniture:
+        return furniture_library.place(furniture, placement)
+    FURNITURE_BUILDERS[placement.item](placement.x, placement.y, placement.width, placement.length)
+
+def add_basic_furniture(room):
+    """A few boxes per room (the furniture of the old v2 generator)"""
     cx, cy = room.center
     
     if room.type == 'living':
-        add_living_room_furniture(room)
+        sofa_mat = mat_fabric_gray()
+        create_box("Sofa", cx, room.y + 1.0, 0.25, 1.8, 0.5, 0.8, sofa_mat)
+        create_box("SofaBack", cx, room.y + 0.6, 0.5, 1.8, 0.4, 0.15, sofa_mat)
+        create_box("CoffeeTable", cx, cy, 0.35, 0.9, 0.06, 0.5, mat_wood_light())
     elif room.type == 'bedroom':
-        add_bedroom_furniture(room)
-    elif room.type == 'bathroom':
-        add_bathroom_fixtures(room)
+        frame_mat = mat_wood_dark()
+        create_box("BedFrame", cx, room.y + 1.2, 0.15, 1.5, 0.2, 2.0, frame_mat)
+        create_box("Mattress", cx, room.y + 1.2, 0.35, 1.4, 0.2, 1.9, mat_fabric_white())
+        create_box("Headboard", cx, room.y + 0.15, 0.5, 1.5, 0.6, 0.08, frame_mat)
     elif room.type == 'kitchen':
-        add_kitchen_furniture(room)
-    elif room.type in ['deck', 'balcony']:
-        add_deck_furniture(room)
-    elif room.type == 'hallway':
-        pass  # Usually empty
-    elif room.type == 'stairs':
-        add_stairs(room)
-
-def add_living_room_furniture(room):
-    """Add living room furniture: sofa, coffee table, rug, plant"""
+        counter_w = min(room.width - 0.4, 2.5)
+        create_box("CounterBase", cx, room.y + 0.35, 0.45, counter_w, 0.9, 0.6, mat_cabinet_wood())
+        create_box("CounterTop", cx, room.y + 0.35, 0.92, counter_w + 0.05, 0.04, 0.65, mat_counter_marble())
+    elif room.type == 'bathroom':
+        white_mat = mat_porcelain()
+        create_box("Toilet", room.x + 0.4, room.y + 0.4, 0.2, 0.4, 0.4, 0.5, white_mat)
+        create_box("Sink", room.x + room.width - 0.4, room.y + 0.35, 0.8, 0.5, 0.15, 0.4, white_mat)
+
+def add_living_room_decor(room):
+    """Round rug under the coffee table and a plant in the corner"""
+    if not detail['decor']:
+        return
     cx, cy = room.center
-    
-    # L-shaped sofa
-    create_sofa(cx - 0.3, room.y + 1.2, 2.2, 0.9)
-    
-    # Coffee table
-    table_mat = mat_wood_light()
-    create_box("CoffeeTable", cx, cy, 0.35, 0.9, 0.06, 0.5, table_mat)
-    # Table legs
-    for dx, dy in [(-0.35, -0.2), (0.35, -0.2), (-0.35, 0.2), (0.35, 0.2)]:
-        create_box(f"TableLeg", cx + dx, cy + dy, 0.16, 0.04, 0.32, 0.04, table_mat)
-    
-    # Round rug
-    create_cylinder("Rug", cx, cy, 0.01, 1.2, 0.02, mat_rug_round(), 48)
-    
-    # Plant in corner
-    create_potted_plant(room.x + 0.5, room.y2 - 0.5, 0.8)
+    create_cylinder("Rug", cx, cy, 0.01, 1.2, 0.02, mat_rug_round())
+    place_potted_plant(room, room.x + 0.5, room.y2 - 0.5, 0.8)
+
+# Procedural furniture builders, each called as builder(x, y, width, length)
+# with the floor position and size of a furniture_layout placement
 
 def create_sofa(x, y, width, depth):
     """Create a detailed sofa"""
@@ -957,21 +574,18 @@ def create_sofa(x, y, width, depth):
         cx = x - width/2 + 0.2 + cushion_w/2 + i * cushion_w
         create_box(f"SofaBackCushion{i}", cx, y - depth/2 + 0.2, 0.6, cushion_w - 0.05, 0.3, 0.15, mat_cushion)
 
-def add_bedroom_furniture(room):
-    """Add bedroom furniture: bed with pillows, nightstands"""
-    cx, cy = room.center
-    
-    # Bed
-    create_bed(cx, room.y + room.length * 0.4, 1.6, 2.0)
-    
-    # Nightstands
-    ns_mat = mat_wood_dark()
-    for side in [-1, 1]:
-        ns_x = cx + side * 1.0
-        ns_y = room.y + 0.6
-        create_box(f"Nightstand", ns_x, ns_y, 0.25, 0.4, 0.5, 0.4, ns_mat)
-        # Drawer handle
-        create_box(f"NSHandle", ns_x, ns_y + 0.21, 0.3, 0.1, 0.02, 0.02, mat_metal_brass())
+def create_coffee_table(x, y, width, length):
+    """Coffee table top on four legs"""
+    table_mat = mat_wood_light()
+    create_box("CoffeeTable", x, y, 0.35, width, 0.06, length, table_mat)
+    for dx, dy in [(-1, -1), (1, -1), (-1, 1), (1, 1)]:
+        create_box("TableLeg", x + dx * (width/2 - 0.1), y + dy * (length/2 - 0.05), 0.16, 0.04, 0.32, 0.04,
+                   table_mat)
+
+def create_nightstand(x, y, width, length):
+    """Nightstand with a drawer handle on its front"""
+    create_box("Nightstand", x, y, 0.25, width, 0.5, length, mat_wood_dark())
+    create_box("NSHandle", x, y + length/2 + 0.01, 0.3, 0.1, 0.02, 0.02, mat_metal_brass())
 
 def create_bed(x, y, width, length):
     """Create a detailed bed with mattress, pillows, and blanket"""
@@ -998,6 +612,7 @@ def create_bed(x, y, width, length):
         # Pillow shape (flattened)
         bpy.ops.mesh.primitive_cube_add(size=1, location=(px, y - length/2 + 0.4, 0.55))
         pillow = bpy.context.active_object
+        pillow.name = "Pillow"
         pillow.scale = (0.5, 0.08, 0.35)
         bpy.ops.object.transform_apply(scale=True)
         pillow.data.materials.append(mat_pillow)
@@ -1005,92 +620,92 @@ def create_bed(x, y, width, length):
     # Blanket/duvet (covering lower 2/3)
     create_box("Blanket", x, y + 0.25, 0.55, width - 0.1, 0.12, length * 0.55, mat_blanket)
 
-def add_bathroom_fixtures(room):
-    """Add bathroom fixtures: toilet, sink, bathtub/shower"""
+def create_toilet(x, y, width, length):
+    """Toilet bowl, tank and seat (fixed size)"""
     mat_p = mat_porcelain()
-    mat_chrome = mat_metal_chrome()
-    
-    # Position based on room size
-    # Toilet
-    toilet_x = room.x + 0.4
-    toilet_y = room.y + 0.5
-    
-    # Bowl
-    create_cylinder("ToiletBowl", toilet_x, toilet_y, 0.2, 0.2, 0.4, mat_p, 24)
-    # Tank
-    create_box("ToiletTank", toilet_x, toilet_y - 0.25, 0.35, 0.35, 0.35, 0.15, mat_p)
-    # Seat
-    create_cylinder("ToiletSeat", toilet_x, toilet_y + 0.05, 0.42, 0.18, 0.04, mat_p, 24)
-    
-    # Sink
-    sink_x = room.x + room.width - 0.4
-    sink_y = room.y + 0.4
-    
-    # Sink basin
-    create_box("SinkBasin", sink_x, sink_y, 0.85, 0.5, 0.15, 0.4, mat_p)
-    # Pedestal
-    create_box("SinkPedestal", sink_x, sink_y, 0.4, 0.2, 0.7, 0.2, mat_p)
-    # Faucet
-    create_cylinder("Faucet", sink_x, sink_y - 0.1, 0.95, 0.02, 0.15, mat_chrome)
-    
-    # Bathtub (if room is large enough)
-    if room.length >= 2.0 and room.width >= 1.5:
-        tub_x = room.x + room.width/2
-        tub_y = room.y2 - 0.5
-        
-        # Tub body
-        create_box("Bathtub", tub_x, tub_y, 0.3, min(room.width - 0.3, 1.5), 0.5, 0.7, mat_p)
-        # Tub interior (darker)
-        create_box("TubInterior", tub_x, tub_y, 0.35, min(room.width - 0.4, 1.4), 0.4, 0.6, mat_glass())
-
-def add_kitchen_furniture(room):
-    """Add kitchen furniture: counters, cabinets, appliances"""
-    mat_counter = mat_counter_marble()
+    create_cylinder("ToiletBowl", x, y, 0.2, 0.2, 0.4, mat_p)
+    create_box("ToiletTank", x, y - 0.25, 0.35, 0.35, 0.35, 0.15, mat_p)
+    create_cylinder("ToiletSeat", x, y + 0.05, 0.42, 0.18, 0.04, mat_p)
+
+def create_bathroom_sink(x, y, width, length):
+    """Pedestal sink with a faucet (fixed size)"""
+    mat_p = mat_porcelain()
+    create_box("SinkBasin", x, y, 0.85, 0.5, 0.15, 0.4, mat_p)
+    create_box("SinkPedestal", x, y, 0.4, 0.2, 0.7, 0.2, mat_p)
+    create_cylinder("Faucet", x, y - 0.1, 0.95, 0.02, 0.15, mat_metal_chrome())
+
+def create_bathtub(x, y, width, length):
+    """Bathtub body with a darker interior"""
+    create_box("Bathtub", x, y, 0.3, width, 0.5, length, mat_porcelain())
+    create_box("TubInterior", x, y, 0.35, width - 0.1, 0.4, length - 0.1, mat_glass())
+
+def create_kitchen_counter(x, y, width, length):
+    """Base cabinets with a counter top, and upper cabinets on the wall behind"""
     mat_cabinet = mat_cabinet_wood()
-    mat_chrome = mat_metal_chrome()
-    
-    cx, cy = room.center
-    
-    # L-shaped counter along two walls
-    counter_depth = 0.6
     counter_height = 0.9
-    
-    # Back wall counter
-    back_w = min(room.width - 0.4, 3.0)
-    create_box("CounterBack", cx, room.y + counter_depth/2 + 0.1, counter_height/2, back_w, counter_height, counter_depth, mat_cabinet)
-    create_box("CounterTopBack", cx, room.y + counter_depth/2 + 0.1, counter_height + 0.02, back_w + 0.02, 0.04, counter_depth + 0.02, mat_counter)
-    
-    # Sink
-    create_box("KitchenSink", cx, room.y + 0.4, counter_height + 0.01, 0.5, 0.1, 0.4, mat_chrome)
+    create_box("CounterBack", x, y, counter_height/2, width, counter_height, length, mat_cabinet)
+    create_box("CounterTopBack", x, y, counter_height + 0.02, width + 0.02, 0.04, length + 0.02, mat_counter_marble())
     
     # Upper cabinets
     upper_h = 0.7
-    upper_z = 1.6 + upper_h/2
-    create_box("UpperCabinets", cx, room.y + 0.25, upper_z, back_w - 0.5, upper_h, 0.35, mat_cabinet)
+    create_box("UpperCabinets", x, y - 0.15, 1.6 + upper_h/2, width - 0.5, upper_h, 0.35, mat_cabinet)
+
+def create_kitchen_sink(x, y, width, length):
+    """Sink set into the counter top"""
+    create_box("KitchenSink", x, y, 0.91, width, 0.1, length, mat_metal_chrome())
+
+def create_lounger(x, y, width, length):
+    """Outdoor lounger frame with a cushion"""
+    create_box("LoungerFrame", x, y, 0.2, width, 0.25, length, mat_wood_dark())
+    create_box("LoungerCushion", x, y, 0.3, width - 0.1, 0.1, length - 0.1, mat_fabric_blue())
+
+FURNITURE_BUILDERS = {
+    'sofa': create_sofa,
+    'coffee_table': create_coffee_table,
+    'bed': create_bed,
+    'nightstand': create_nightstand,
+    'toilet': create_toilet,
+    'bathroom_sink': create_bathroom_sink,
+    'bathtub': create_bathtub,
+    'kitchen_counter': create_kitchen_counter,
+    'kitchen_sink': create_kitchen_sink,
+    'lounger': create_lounger,
+}
+
+def build_furniture_library(path):
+    """Build every furniture item at the origin and save them as a library (see furniture_library.py).
+
+    Items are built at the default tier's detail, since one library serves every tier.
+    """
+    saved = dict(detail)
+    detail.update(DEFAULT_DETAIL)
+    clear_scene()
+    parts = {}
+    for item, (width, length) in furniture_layout.ITEM_SIZES.items():
+        before = scene_stats.object_names()
+        FURNITURE_BUILDERS[item](0, 0, width, length)
+        parts[item] = [bpy.data.objects[name] for name in sorted(scene_stats.object_names() - before)]
+    furniture_library.write_library(path, parts)
+    clear_scene()
+    detail.update(saved)
+
+def load_furniture_library(directory, link=True):
+    """Item meshes from the current library in a directory, building the library first if it is missing"""
+    path = furniture_library.library_path(directory)
+    if not os.path.exists(path):
+        build_furniture_library(path)
+    return furniture_library.load_library(path, link)
+
+def export_furniture_glbs(directory):
+    """Export the item GLBs that glb_assemble splices in, from the library in a directory, if any are missing"""
+    if all(os.path.exists(furniture_layout.item_glb_path(directory, item)) for item in furniture_layout.ITEM_SIZES):
+        return
+    clear_scene()
+    furniture_library.export_item_glbs(load_furniture_library(directory, link=False), directory)
+    clear_scene()
 
-def add_deck_furniture(room):
-    """Add outdoor deck furniture: loungers, umbrella, plants"""
-    cx, cy = room.center
-    
-    # Outdoor loungers
-    mat_frame = mat_wood_dark()
-    mat_cushion = mat_fabric_blue()
-    
-    # Lounger 1
-    l1_x = room.x + 1.5
-    l1_y = room.y + room.length * 0.6
-    create_box("Lounger1Frame", l1_x, l1_y, 0.2, 0.7, 0.25, 1.8, mat_frame)
-    create_box("Lounger1Cushion", l1_x, l1_y, 0.3, 0.6, 0.1, 1.7, mat_cushion)
-    
-    # Lounger 2
-    l2_x = room.x + 3.0
-    l2_y = room.y + room.length * 0.6
-    create_box("Lounger2Frame", l2_x, l2_y, 0.2, 0.7, 0.25, 1.8, mat_frame)
-    create_box("Lounger2Cushion", l2_x, l2_y, 0.3, 0.6, 0.1, 1.7, mat_cushion)
-    
-    # Umbrella between loungers
-    umb_x = (l1_x + l2_x) / 2
-    umb_y = l1_y
+def add_deck_decor(room, umb_x, umb_y):
+    """Umbrella between the loungers and potted plants in the corners"""
     create_cylinder("UmbrellaPole", umb_x, umb_y, 1.2, 0.03, 2.4, mat_wood_dark())
     # Umbrella canopy (cone-like)
     bpy.ops.mesh.primitive_cone_add(radius1=1.5, radius2=0.1, depth=0.5, vertices=8, location=(umb_x, umb_y, 2.5))
@@ -1100,18 +715,14 @@ def add_deck_furniture(room):
     canopy.data.materials.append(mat_umbrella())
     
     # Potted plants on deck
-    create_potted_plant(room.x + 0.4, room.y2 - 0.4, 0.5)
-    create_potted_plant(room.x2 - 0.4, room.y2 - 0.4, 0.6)
-    create_potted_plant(room.x + 0.4, room.y + 0.4, 0.4)
-    
-    # Create pergola
-    create_pergola(room)
+    place_potted_plant(room, room.x + 0.4, room.y2 - 0.4, 0.5)
+    place_potted_plant(room, room.x2 - 0.4, room.y2 - 0.4, 0.6)
+    place_potted_plant(room, room.x + 0.4, room.y + 0.4, 0.4)
 
 def create_pergola(room):
     """Create a pergola structure over the deck"""
     mat_wood = mat_wood_dark()
     
-    # Posts at corners
     post_inset = 0.3
     post_positions = [
         (room.x + post_inset, room.y + post_inset),
@@ -1121,32 +732,36 @@ def create_pergola(room):
     ]
     
     post_height = 2.8
-    for i, (px, py) in enumerate(post_positions):
-        create_box(f"PergPost{i}", px, py, post_height/2, 0.12, post_height, 0.12, mat_wood)
-    
-    # Main beams (lengthwise)
     beam_z = post_height + 0.06
-    for side in [room.x + post_inset, room.x2 - post_inset]:
-        create_box(f"PergBeam", side, room.y + room.length/2, beam_z, 0.1, 0.12, room.length - 2*post_inset, mat_wood)
-    
-    # Cross beams (widthwise) - rafters
     num_rafters = 6
-    for i in range(num_rafters):
-        rafter_y = room.y + post_inset + i * (room.length - 2*post_inset) / (num_rafters - 1)
-        create_box(f"PergRafter{i}", room.x + room.width/2, rafter_y, beam_z + 0.08, room.width - 2*post_inset, 0.08, 0.06, mat_wood)
+    rafter_y = room.y + post_inset + np.arange(num_rafters) * (room.length - 2*post_inset) / (num_rafters - 1)
+    beam_x = [room.x + post_inset, room.x2 - post_inset]
+
+    # Posts at corners, lengthwise beams, widthwise rafters - one mesh
+    centers = np.concatenate([
+        [(px, py, post_height/2) for px, py in post_positions],
+        [(bx, room.y + room.length/2, beam_z) for bx in beam_x],
+        np.column_stack([np.full(num_rafters, room.x + room.width/2), rafter_y, np.full(num_rafters, beam_z + 0.08)]),
+    ])
+    sizes = np.concatenate([
+        np.tile((0.12, 0.12, post_height), (4, 1)),
+        np.tile((0.1, room.length - 2*post_inset, 0.12), (2, 1)),
+        np.tile((room.width - 2*post_inset, 0.06, 0.08), (num_rafters, 1)),
+    ])
+    create_box_array(f"Pergola_{room.id}", centers, sizes, mat_wood)
+
+def place_potted_plant(room, x, y, height):
+    """Potted plant on the free floor nearest (x, y): off walls, door clearances, furniture and other plants"""
+    pot_r = height * 0.2
+    spot = floor_grid.free_floor_near(x, y, room=room.id, clearance=pot_r) if floor_grid else None
+    x, y = spot or (x, y)
+    create_potted_plant(x, y, height)
+    if floor_grid:
+        floor_grid.occupy(x, y, pot_r * 2, pot_r * 2)
 
 def create_potted_plant(x, y, height):
-    """Create a potted plant"""
-    pot_h = height * 0.3
-    pot_r = height * 0.2
-    
-    # Pot
-    create_cylinder(f"Pot_{x:.1f}_{y:.1f}", x, y, pot_h/2, pot_r, pot_h, mat_pot_terracotta())
-    
-    # Plant foliage (cluster of spheres)
-    plant_z = pot_h + height * 0.3
-    create_uv_sphere(f"Plant_{x:.1f}_{y:.1f}", x, y, plant_z, height * 0.35, mat_plant_green(), 12, 8)
-    create_uv_sphere(f"Plant2_{x:.1f}_{y:.1f}", x + 0.05, y - 0.03, plant_z + 0.1, height * 0.25, mat_plant_green(), 10, 6)
+    """Place a potted plant: an instance of one of the low-poly variants (see plants.py)"""
+    plants.add_plant(f"Plant_{x:.1f}_{y:.1f}", x, y, height, [mat_pot_terracotta(), mat_plant_green()])
 
 def add_stairs(room):
     """Create a staircase"""
@@ -1159,21 +774,21 @@ def add_stairs(room):
     step_depth = room.length / num_steps
     step_width = room.width - 0.4
     
-    # Create steps
-    for i in range(num_steps):
-        step_z = step_height * (i + 0.5)
-        step_y = room.y + step_depth * i + step_depth/2
-        
-        # Tread
-        create_box(f"Step{i}", room.x + room.width/2, step_y, step_z, step_width, step_height * 0.8, step_depth * 0.95, mat_wood)
+    # Treads - one mesh
+    i = np.arange(num_steps)
+    centers = np.column_stack([np.full(num_steps, room.x + room.width/2),
+                               room.y + step_depth * i + step_depth/2,
+                               step_height * (i + 0.5)])
+    create_box_array(f"Steps_{room.id}", centers, (step_width, step_depth * 0.95, step_height * 0.8), mat_wood)
     
     # Railing (simplified)
     rail_height = 0.9
     # Posts
-    for i in [0, num_steps//2, num_steps-1]:
-        post_y = room.y + step_depth * i + step_depth/2
-        post_z = step_height * i + rail_height/2 + step_height
-        create_cylinder(f"RailPost{i}", room.x + 0.15, post_y, post_z, 0.025, rail_height, mat_rail)
+    post_steps = np.array([0, num_steps//2, num_steps-1])
+    posts = np.column_stack([np.full(3, room.x + 0.15),
+                             room.y + step_depth * post_steps + step_depth/2,
+                             step_height * post_steps + rail_height/2 + step_height])
+    create_cylinder_array(f"RailPosts_{room.id}", posts, 0.025, rail_height, mat_rail)
     
     # Handrail (angled)
     start_z = step_height + rail_height
@@ -1185,8 +800,11 @@ def add_stairs(room):
     rail_len = math.sqrt(room.length**2 + (room.height - step_height)**2)
     angle = math.atan2(room.height - step_height, room.length)
     
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.03, depth=rail_len, location=(room.x + 0.15, mid_y, mid_z))
+    segments = circle_segments(0.03, detail['segment_scale'])
+    bpy.ops.mesh.primitive_cylinder_add(radius=0.03, depth=rail_len, vertices=segments,
+                                        location=(room.x + 0.15, mid_y, mid_z))
     rail = bpy.context.active_object
+    rail.name = "Handrail"
     rail.rotation_euler = (math.pi/2 - angle, 0, 0)
     rail.data.materials.append(mat_rail)
 
@@ -1219,8 +837,9 @@ def setup_lighting(rooms):
     fill.data.energy = 1
     fill.rotation_euler = (math.radians(65), math.radians(-10), math.radians(-30))
     
-    # Area light for interior fill
-    bpy.ops.object.light_add(type='AREA', location=(cx, cy, 2.5))
+    # Area light for interior fill, over indoor floor even when the bounding-box centre is not
+    ax, ay = (floor_grid.indoor_center() if floor_grid else None) or (cx, cy)
+    bpy.ops.object.light_add(type='AREA', location=(ax, ay, 2.5))
     area = bpy.context.active_object
     area.name = "AreaLight"
     area.data.energy = 100
@@ -1237,56 +856,205 @@ def setup_world():
 
 # ============= MAIN =============
 
-def create_house(data, output_path, skip_ceilings=False):
-    """Main function - create the house and export"""
-    clear_scene()
-    
-    rooms_data = data.get('rooms', [data])
-    rooms = [Room(r) for r in rooms_data]
+def build_house(data, skip_ceilings=False, control=None, tier=DEFAULT_TIER, furniture_library_dir=None,
+                link_furniture=True, splice_furniture=False, degradations=()):
+    """Build the house scene at a quality tier (no export). Returns the rooms.
+
+    `control` is checked between rooms so cancelled or overrunning jobs stop early,
+    and its memory budget makes the build degrade instead of running out of memory.
+    With `furniture_library_dir`, furniture comes from the library there, linked or
+    (without `link_furniture`) appended. With `splice_furniture` it is only collected
+    in spliced_furniture, for glb_assemble to add to the exported GLB. `degradations`
+    are steps an earlier build of the job applied (a rebuild to fit the export budget).
+    """
+    global floor_grid, furniture, spliced_furniture
+    control = control or BuildControl()
+    detail.update(house_plan.tier_detail(tier))
+    degraded.clear()
+    restore_degradation(degradations)
+    
+    with control.phase('scene'):
+        clear_scene()
+        spliced_furniture = [] if splice_furniture else None
+        furniture = None
+        if furniture_library_dir and not splice_furniture:
+            furniture = load_furniture_library(furniture_library_dir, link_furniture)
+        
+        rooms = load_rooms(data)
+        floor_grid = FloorGrid(rooms)
+        fit_memory_budget(rooms, control, skip_ceilings)
+        fit_export_budget(rooms, control, skip_ceilings)
     
-    print(f"\n=== Creating HIGH QUALITY house with {len(rooms)} rooms ===")
+    print(f"\n=== Creating {tier.upper()} tier house with {len(rooms)} rooms ===")
     for r in rooms:
         print(f"  {r.id}: {r.name} ({r.type}) - {r.width}x{r.length}m at ({r.x}, {r.y})")
     
-    created_walls = set()
-    
-    for room in rooms:
-        print(f"\nBuilding {room.id}...")
-        create_floor(room)
-        create_ceiling(room, skip_ceilings)
-        create_room_walls(room, rooms, created_walls)
-        add_furniture(room)
-    
-    setup_lighting(rooms)
-    setup_world()
-    
-    # Export
-    print(f"\nExporting to {output_path}...")
-    bpy.ops.export_scene.gltf(
-        filepath=output_path,
-        export_format='GLB',
-        export_materials='EXPORT',
-        export_cameras=False,
-        export_lights=False,
-        export_apply=True,
-    )
-    print("✅ Done! High-quality house exported.")
-
-def main():
+    room_walls = wall_shell.plan_walls(rooms)
+    all_walls = [wall for walls in room_walls.values() for wall in walls]
+    
+    with control.phase('rooms'):
+        for room in rooms:
+            control.check()
+            if control.memory_pressure() > 0.9:
+                degrade(f"RSS {control.sample_memory():.0f} MB near budget {control.memory_budget_mb:.0f} MB")
+            print(f"\nBuilding {room.id}...")
+            before = scene_stats.object_names()
+            create_floor(room, all_walls)
+            add_openings(room, room_walls[room.id])
+            add_furniture(room)
+            scene_stats.tag_objects(before, room.id)
+    
+    with control.phase('structure'):
+        create_wall_shell(all_walls, rooms)
+        create_slabs(rooms, skip_ceilings or not detail['ceilings'])
+    
+    with control.phase('lighting'):
+        setup_lighting(rooms)
+        setup_world()
+    return rooms
+
+def cull_hidden_faces(control):
+    """Delete faces covered by other geometry (see hidden_faces.py); returns the savings"""
+    with control.phase('cull'), control.blocking():
+        return hidden_faces.remove_hidden_faces()
+
+def build_result(control, tier, glb_path=None, spliced=()):
+    """Job result: phase timings, peak RSS, any degradation applied and scene statistics.
+
+    spliced: glb_assemble.spliced_meshes of furniture added after export, counted in the stats.
+    """
+    return dict(control.summary(), tier=tier, degraded=list(degraded),
+                stats=scene_stats.export_stats(glb_path, spliced))
+
+def create_house(data, output_path, skip_ceilings=False, control=None, tier=DEFAULT_TIER, snapshot=False,
+                 cull_hidden=False, optimize=False, furniture_library_dir=None, splice_furniture=False,
+                 shared_assets_dir=None, shared_assets_url=None):
+    """Main function - create the house at a quality tier and export. Returns the job result.
+
+    With `snapshot`, a compressed .blend keyed by the input hash is saved next to
+    the GLB so the scene can be re-rendered later without rebuilding; library
+    furniture is then appended rather than linked, so the snapshot stands alone.
+    With `cull_hidden`, faces covered by other geometry are deleted before export;
+    with `optimize`, the GLB is post-processed for the GPU (glb_optimize.py).
+    With `splice_furniture`, the library's item GLBs are spliced into the exported
+    house instead of exporting its furniture (glb_assemble.py). A snapshot needs the
+    furniture in the scene, so it is linked then. `shared_assets_dir` splices by
+    reference: item data goes to shared .bin files there, at `shared_assets_url`
+    if given. With an export budget on `control`, the house is rebuilt one
+    degradation step further while the exported GLB is over it.
+    """
+    control = control or BuildControl()
+    splice = bool((splice_furniture or shared_assets_dir) and furniture_library_dir and not snapshot)
+    if splice:
+        with control.phase('furniture'), control.blocking():
+            export_furniture_glbs(furniture_library_dir)
+    degradations, builds = [], 0
+    while True:
+        rooms = build_house(data, skip_ceilings, control, tier, furniture_library_dir, link_furniture=not snapshot,
+                            splice_furniture=splice, degradations=degradations)
+        builds += 1
+        hidden = cull_hidden_faces(control) if cull_hidden else None
+        
+        # Export
+        print(f"\nExporting to {output_path}...")
+        with control.phase('export'), control.blocking():
+            optimized = scene_outputs.export_glb(output_path, optimize)
+            spliced = glb_assemble.assemble_glb(output_path, spliced_furniture, furniture_library_dir,
+                                                shared_dir=shared_assets_dir,
+                                                shared_url=shared_assets_url) if splice else None
+        if not control.export_budget:
+            break
+        measured, overrun = export_overrun(control, output_path)
+        if not overrun or not degrade(overrun, 'export'):
+            break
+        # Start over with the steps so far plus the new one
+        degradations = list(degraded)
+        print(f"🔁 Rebuilding with {degradations[-1]['step']}")
+    print(f"✅ Done! {tier.capitalize()} tier house exported.")
+    result = build_result(control, tier, output_path,
+                          glb_assemble.spliced_meshes(spliced_furniture, furniture_library_dir) if splice else ())
+    if control.export_budget:
+        result['budget'] = {'limits': control.export_budget, 'measured': measured,
+                            'fits': not overrun, 'builds': builds}
+        steps = ', '.join(d['step'] for d in degraded) or 'no degradation'
+        if overrun:
+            print(f"⚠️  Over export budget with every degradation step applied: {overrun}")
+        else:
+            print(f"🎯 Export budget met ({steps}, {builds} build{'s' if builds > 1 else ''})")
+    if spliced:
+        result['spliced'] = spliced
+    if hidden:
+        result['hidden'] = hidden
+    if optimized:
+        result['optimized'] = optimized
+    
+    if snapshot and snapshot_allowed():
+        key = scene_outputs.house_snapshot_key(data, tier, skip_ceilings, cull_hidden, bool(furniture_library_dir),
+                                               control.export_budget)
+        path = scene_outputs.snapshot_path(output_path, key)
+        info = snapshot_info(rooms, tier)
+        if hidden:
+            info['hidden'] = hidden
+        with control.phase('snapshot'), control.blocking():
+            scene_outputs.save_snapshot(path, key, **info)
+        result.update(control.summary(), snapshot=path)
+    return result
+
+def main(default_tier=DEFAULT_TIER):
     argv = sys.argv
     if "--" in argv:
         argv = argv[argv.index("--") + 1:]
     
+    tier = option_value(argv, '--tier', default_tier)
+    if tier not in TIERS:
+        print(f"❌ Unknown tier '{tier}' (expected one of: {', '.join(TIERS)})")
+        sys.exit(1)
+    
+    if '--plan' in argv:
+        # Dry run: predict cost without creating any Blender data
+        data = load_blueprint(option_value(argv, '--plan'))
+        print(json.dumps(house_plan.plan_house(data, '--no-ceilings' in argv, TIERS[tier],
+                                               furniture_library='--furniture-library' in argv), indent=2))
+        return
+    
     if len(argv) < 2:
-        print("Usage: blender --background --python render_house_v3.py -- input.json output.glb [--no-ceilings]")
+        print("Usage: python3 render_house_v3.py --plan input.json [--tier TIER] [--no-ceilings] [--furniture-library DIR]")
+        print("       blender --background --python render_house_v3.py -- input.json output.glb [--tier TIER] [--no-ceilings] "
+              "[--cancel-file PATH] [--timeout phase=seconds,...] [--memory-budget MB] [--report result.json] [--trace-ops] [--snapshot] "
+              "[--cull-hidden] [--optimize-glb] [--furniture-library DIR [--splice-furniture] "
+              "[--shared-assets DIR [--shared-assets-url URL]]] [--budget tris=N,bytes=N]")
         sys.exit(1)
     
     skip_ceilings = '--no-ceilings' in argv
+    try:
+        control = BuildControl.from_argv(argv)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
     
-    with open(argv[0], 'r') as f:
-        data = json.load(f)
-    
-    create_house(data, argv[1], skip_ceilings)
+    # Reject or repair bad blueprints before any scene work
+    data = load_blueprint(argv[0])
+    
+    report_path = option_value(argv, '--report')
+    control.on_abort = lambda: write_report(report_path, dict(control.summary(), tier=tier, degraded=list(degraded)))
+    control.start()
+    tracer = OpsTracer() if '--trace-ops' in argv else None
+    try:
+        with tracer or contextlib.nullcontext():
+            result = create_house(data, argv[1], skip_ceilings, control, tier, '--snapshot' in argv,
+                                  '--cull-hidden' in argv, '--optimize-glb' in argv,
+                                  option_value(argv, '--furniture-library'), '--splice-furniture' in argv,
+                                  option_value(argv, '--shared-assets'), option_value(argv, '--shared-assets-url'))
+    except (BuildCancelled, PhaseTimeout):
+        print(control.abort_message())
+        control.on_abort()
+        sys.exit(control.exit_code())
+    finally:
+        control.stop()
+    if tracer:
+        print(tracer.format_table())
+        result['ops_trace'] = tracer.report()
+    write_report(report_path, result)
 
 if __name__ == "__main__":
     main()
@@ -2,7 +2,7 @@
 """
 Blender script to render a HIGH-QUALITY room image.
 Includes furniture, detailed materials, proper lighting.
-Run with: blender --background --python render_room.py -- input.json output.png
+Run with: blender --background --python render_room.py -- input.json output.png [--detail SCALE]
 """
 
 import bpy
@@ -11,7 +11,14 @@ import json
 import math
 import os
 import mathutils
-from random import uniform
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import plants
+from build_control import option_value
+from tessellation import circle_segments, parse_scale
+
+# Detail multiplier for round parts (tessellation.circle_segments), set by render_room
+segment_scale = 1.0
 
 def clear_scene():
     bpy.ops.object.select_all(action='SELECT')
@@ -223,7 +230,8 @@ def create_coffee_table(x, y):
     top.data.materials.append(wood_mat)
     
     for lx, ly in [(x - 0.4, y - 0.2), (x + 0.4, y - 0.2), (x - 0.4, y + 0.2), (x + 0.4, y + 0.2)]:
-        bpy.ops.mesh.primitive_cylinder_add(radius=0.02, depth=0.38, location=(lx, ly, 0.19))
+        bpy.ops.mesh.primitive_cylinder_add(radius=0.02, depth=0.38, location=(lx, ly, 0.19),
+                                            vertices=circle_segments(0.02, segment_scale))
         leg = bpy.context.active_object
         leg.name = "TableLeg"
         leg.data.materials.append(leg_mat)
@@ -232,15 +240,16 @@ def create_floor_lamp(x, y):
     base_mat = create_pbr_material("LampBase", (0.15, 0.15, 0.15, 1), roughness=0.3, metallic=0.7)
     shade_mat = create_pbr_material("LampShade", (0.95, 0.92, 0.85, 1), roughness=0.8)
     
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.15, depth=0.03, location=(x, y, 0.015))
+    bpy.ops.mesh.primitive_cylinder_add(radius=0.15, depth=0.03, location=(x, y, 0.015), vertices=circle_segments(0.15, segment_scale))
     base = bpy.context.active_object
     base.data.materials.append(base_mat)
     
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.015, depth=1.5, location=(x, y, 0.78))
+    bpy.ops.mesh.primitive_cylinder_add(radius=0.015, depth=1.5, location=(x, y, 0.78), vertices=circle_segments(0.015, segment_scale))
     pole = bpy.context.active_object
     pole.data.materials.append(base_mat)
     
-    bpy.ops.mesh.primitive_cone_add(radius1=0.2, radius2=0.12, depth=0.25, location=(x, y, 1.65))
+    bpy.ops.mesh.primitive_cone_add(radius1=0.2, radius2=0.12, depth=0.25, location=(x, y, 1.65),
+                                    vertices=circle_segments(0.2, segment_scale))
     shade = bpy.context.active_object
     shade.data.materials.append(shade_mat)
 
@@ -253,19 +262,13 @@ def create_rug(x, y, w=2.5, l=1.8):
     bpy.ops.object.transform_apply(scale=True)
     rug.data.materials.append(rug_mat)
 
+# Sized like the sphere-cluster plant it replaced
+PLANT_HEIGHT = 0.8
+
 def create_plant(x, y):
-    pot_mat = create_pbr_material("Pot", (0.75, 0.72, 0.68, 1), roughness=0.6)
-    plant_mat = create_pbr_material("Plant", (0.2, 0.45, 0.2, 1), roughness=0.8)
-    
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.12, depth=0.25, location=(x, y, 0.125))
-    pot = bpy.context.active_object
-    pot.data.materials.append(pot_mat)
-    
-    for i in range(5):
-        bpy.ops.mesh.primitive_uv_sphere_add(radius=uniform(0.08, 0.15), 
-            location=(x + uniform(-0.08, 0.08), y + uniform(-0.08, 0.08), 0.35 + uniform(0, 0.2)))
-        leaf = bpy.context.active_object
-        leaf.data.materials.append(plant_mat)
+    pot_mat = bpy.data.materials.get("Pot") or create_pbr_material("Pot", (0.75, 0.72, 0.68, 1), roughness=0.6)
+    plant_mat = bpy.data.materials.get("Plant") or create_pbr_material("Plant", (0.2, 0.45, 0.2, 1), roughness=0.8)
+    plants.add_plant("Plant", x, y, PLANT_HEIGHT, [pot_mat, plant_mat])
 
 def setup_camera(width, length, height):
     cam_x = width / 2
@@ -316,7 +319,9 @@ def setup_render(output_path):
     scene.render.filepath = output_path
     scene.render.image_settings.file_format = 'PNG'
 
-def render_room(room_data, output_path):
+def render_room(room_data, output_path, scale=1.0):
+    global segment_scale
+    segment_scale = scale
     width = room_data.get("width", 4)
     length = room_data.get("length", 5)
     height = room_data.get("height", 2.8)
@@ -362,7 +367,12 @@ def main():
         argv = argv[argv.index("--") + 1:]
     
     if len(argv) < 2:
-        print("Usage: blender --background --python render_room.py -- input.json output.png")
+        print("Usage: blender --background --python render_room.py -- input.json output.png [--detail SCALE]")
+        sys.exit(1)
+    try:
+        scale = parse_scale(option_value(argv, '--detail'))
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
         sys.exit(1)
     
     with open(argv[0], 'r') as f:
@@ -373,7 +383,7 @@ def main():
         if rooms:
             room_data = max(rooms, key=lambda r: r.get("width", 0) * r.get("length", 0))
     
-    render_room(room_data, argv[1])
+    render_room(room_data, argv[1], scale)
 
 if __name__ == "__main__":
     main()
@@ -2,16 +2,27 @@
 """
 Blender script to create a HIGH-QUALITY room and export as GLTF.
 Includes: furniture, detailed materials, architectural details.
-Run with: blender --background --python render_room_gltf.py -- input.json output.glb
+Run with: blender --background --python render_room_gltf.py -- input.json output.glb [--detail SCALE]
 """
 
 import bpy
+import contextlib
 import sys
-import json
 import math
 import os
 import mathutils
-from random import uniform, choice
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import scene_outputs
+import scene_stats
+from ops_tracer import OpsTracer
+from blueprint_check import load_blueprint
+from build_control import option_value, write_report
+from tessellation import circle_segments, parse_scale
+import plants
+
+# Detail multiplier for round parts (tessellation.circle_segments), set by build_room
+segment_scale = 1.0
 
 def clear_scene():
     """Remove all objects from the scene."""
@@ -286,7 +297,8 @@ def create_door(width, length, height=2.8):
     door.data.materials.append(door_mat)
     
     # Door handle
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.015, depth=0.1, location=(door_x - 0.07, door_y - 0.35, 1.0))
+    bpy.ops.mesh.primitive_cylinder_add(radius=0.015, depth=0.1, location=(door_x - 0.07, door_y - 0.35, 1.0),
+                                        vertices=circle_segments(0.015, segment_scale))
     handle = bpy.context.active_object
     handle.name = "DoorHandle"
     handle.rotation_euler = (math.radians(90), 0, 0)
@@ -345,7 +357,8 @@ def create_sofa(x, y, facing='back'):
     # Legs
     for lx, ly in [(x - w/2 + 0.1, y - d/2 + 0.1), (x + w/2 - 0.1, y - d/2 + 0.1),
                    (x - w/2 + 0.1, y + d/2 - 0.1), (x + w/2 - 0.1, y + d/2 - 0.1)]:
-        bpy.ops.mesh.primitive_cylinder_add(radius=0.025, depth=0.1, location=(lx, ly, 0.05))
+        bpy.ops.mesh.primitive_cylinder_add(radius=0.025, depth=0.1, location=(lx, ly, 0.05),
+                                            vertices=circle_segments(0.025, segment_scale))
         leg = bpy.context.active_object
         leg.name = "SofaLeg"
         leg.data.materials.append(leg_mat)
@@ -366,7 +379,8 @@ def create_coffee_table(x, y):
     # Legs
     for lx, ly in [(x - 0.4, y - 0.2), (x + 0.4, y - 0.2),
                    (x - 0.4, y + 0.2), (x + 0.4, y + 0.2)]:
-        bpy.ops.mesh.primitive_cylinder_add(radius=0.02, depth=0.38, location=(lx, ly, 0.19))
+        bpy.ops.mesh.primitive_cylinder_add(radius=0.02, depth=0.38, location=(lx, ly, 0.19),
+                                            vertices=circle_segments(0.02, segment_scale))
         leg = bpy.context.active_object
         leg.name = "TableLeg"
         leg.data.materials.append(leg_mat)
@@ -377,19 +391,20 @@ def create_floor_lamp(x, y):
     shade_mat = create_pbr_material("LampShade", (0.95, 0.92, 0.85, 1), roughness=0.8)
     
     # Base
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.15, depth=0.03, location=(x, y, 0.015))
+    bpy.ops.mesh.primitive_cylinder_add(radius=0.15, depth=0.03, location=(x, y, 0.015), vertices=circle_segments(0.15, segment_scale))
     base = bpy.context.active_object
     base.name = "LampBase"
     base.data.materials.append(base_mat)
     
     # Pole
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.015, depth=1.5, location=(x, y, 0.78))
+    bpy.ops.mesh.primitive_cylinder_add(radius=0.015, depth=1.5, location=(x, y, 0.78), vertices=circle_segments(0.015, segment_scale))
     pole = bpy.context.active_object
     pole.name = "LampPole"
     pole.data.materials.append(base_mat)
     
     # Shade
-    bpy.ops.mesh.primitive_cone_add(radius1=0.2, radius2=0.12, depth=0.25, location=(x, y, 1.65))
+    bpy.ops.mesh.primitive_cone_add(radius1=0.2, radius2=0.12, depth=0.25, location=(x, y, 1.65),
+                                    vertices=circle_segments(0.2, segment_scale))
     shade = bpy.context.active_object
     shade.name = "LampShade"
     shade.data.materials.append(shade_mat)
@@ -405,47 +420,29 @@ def create_rug(x, y, w=2.5, l=1.8):
     bpy.ops.object.transform_apply(scale=True)
     rug.data.materials.append(rug_mat)
 
+# Sized like the sphere-cluster plant it replaced
+PLANT_HEIGHT = 0.8
+
 def create_plant(x, y):
-    """Create a potted plant."""
-    pot_mat = create_pbr_material("Pot", (0.75, 0.72, 0.68, 1), roughness=0.6)
-    plant_mat = create_pbr_material("Plant", (0.2, 0.45, 0.2, 1), roughness=0.8)
-    soil_mat = create_pbr_material("Soil", (0.25, 0.18, 0.12, 1), roughness=0.95)
-    
-    # Pot
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.12, depth=0.25, location=(x, y, 0.125))
-    pot = bpy.context.active_object
-    pot.name = "Pot"
-    pot.data.materials.append(pot_mat)
-    
-    # Soil
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.1, depth=0.02, location=(x, y, 0.24))
-    soil = bpy.context.active_object
-    soil.name = "Soil"
-    soil.data.materials.append(soil_mat)
-    
-    # Plant (simple sphere cluster)
-    for i in range(5):
-        px = x + uniform(-0.08, 0.08)
-        py = y + uniform(-0.08, 0.08)
-        pz = 0.35 + uniform(0, 0.2)
-        size = uniform(0.08, 0.15)
-        bpy.ops.mesh.primitive_uv_sphere_add(radius=size, location=(px, py, pz))
-        leaf = bpy.context.active_object
-        leaf.name = "PlantLeaf"
-        leaf.data.materials.append(plant_mat)
+    """Create a potted plant: an instance of one of the low-poly variants (see plants.py)."""
+    pot_mat = bpy.data.materials.get("Pot") or create_pbr_material("Pot", (0.75, 0.72, 0.68, 1), roughness=0.6)
+    plant_mat = bpy.data.materials.get("Plant") or create_pbr_material("Plant", (0.2, 0.45, 0.2, 1), roughness=0.8)
+    plants.add_plant("Plant", x, y, PLANT_HEIGHT, [pot_mat, plant_mat])
 
 def create_ceiling_light(x, y, height=2.8):
     """Create a ceiling light fixture."""
     fixture_mat = create_pbr_material("LightFixture", (0.9, 0.88, 0.85, 1), roughness=0.3)
     
     # Fixture base
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.15, depth=0.05, location=(x, y, height - 0.025))
+    bpy.ops.mesh.primitive_cylinder_add(radius=0.15, depth=0.05, location=(x, y, height - 0.025),
+                                        vertices=circle_segments(0.15, segment_scale))
     base = bpy.context.active_object
     base.name = "LightFixture"
     base.data.materials.append(fixture_mat)
     
     # Shade/diffuser
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.2, depth=0.08, location=(x, y, height - 0.09))
+    bpy.ops.mesh.primitive_cylinder_add(radius=0.2, depth=0.08, location=(x, y, height - 0.09),
+                                        vertices=circle_segments(0.2, segment_scale))
     shade = bpy.context.active_object
     shade.name = "LightShade"
     shade.data.materials.append(fixture_mat)
@@ -509,8 +506,17 @@ def setup_world():
     bg.inputs["Color"].default_value = (0.6, 0.8, 1.0, 1)
     bg.inputs["Strength"].default_value = 0.3
 
-def create_room(room_data, output_path):
-    """Main function to create complete room."""
+def select_room(data):
+    """The room to build: the largest room of a house blueprint, or the data itself"""
+    rooms = data.get("rooms")
+    if rooms:
+        return max(rooms, key=lambda r: r.get("width", 0) * r.get("length", 0))
+    return data
+
+def build_room(room_data, scale=1.0):
+    """Build the complete room scene (no export); scale is the detail multiplier."""
+    global segment_scale
+    segment_scale = scale
     width = room_data.get("width", 4)
     length = room_data.get("length", 5)
     height = room_data.get("height", 2.8)
@@ -519,6 +525,7 @@ def create_room(room_data, output_path):
     print(f"Creating room: {width}x{length}m, height {height}m, type: {room_type}")
     
     clear_scene()
+    before = scene_stats.object_names()
     
     # Structure
     create_floor(width, length)
@@ -562,21 +569,18 @@ def create_room(room_data, output_path):
         if width >= 3.5:
             create_picture_frame(center_x + 0.5, height * 0.55, 'back')
     
+    scene_stats.tag_objects(before, room_data.get("id", "room"))
+    
     # Lighting & environment
     setup_lighting(width, length, height)
     setup_world()
-    
-    # Export
-    bpy.ops.export_scene.gltf(
-        filepath=output_path,
-        export_format='GLB',
-        export_materials='EXPORT',
-        export_cameras=False,
-        export_lights=False,
-        export_apply=True,
-    )
-    
+
+def create_room(room_data, output_path, scale=1.0):
+    """Main function to create complete room. Returns the export's scene stats."""
+    build_room(room_data, scale)
+    scene_outputs.export_glb(output_path)
     print(f"Exported to: {output_path}")
+    return scene_stats.export_stats(output_path)
 
 def main():
     argv = sys.argv
@@ -586,21 +590,27 @@ def main():
         argv = []
     
     if len(argv) < 2:
-        print("Usage: blender --background --python render_room_gltf.py -- input.json output.glb")
+        print("Usage: blender --background --python render_room_gltf.py -- input.json output.glb [--detail SCALE] "
+              "[--report stats.json] [--trace-ops]")
         sys.exit(1)
     
     input_path = argv[0]
     output_path = argv[1]
+    try:
+        scale = parse_scale(option_value(argv, '--detail'))
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
     
-    with open(input_path, 'r') as f:
-        room_data = json.load(f)
-    
-    if "rooms" in room_data:
-        rooms = room_data["rooms"]
-        if rooms:
-            room_data = max(rooms, key=lambda r: r.get("width", 0) * r.get("length", 0))
+    room_data = select_room(load_blueprint(input_path))
     
-    create_room(room_data, output_path)
+    tracer = OpsTracer() if '--trace-ops' in argv else None
+    with tracer or contextlib.nullcontext():
+        stats = create_room(room_data, output_path, scale)
+    if tracer:
+        print(tracer.format_table())
+        stats['ops_trace'] = tracer.report()
+    write_report(option_value(argv, '--report'), stats)
 
 if __name__ == "__main__":
     main()
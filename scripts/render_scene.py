@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Build a house (or a single room) once and write any set of outputs from the
+same in-memory scene: GLB, .blend and a Cycles PNG still.
+
+Usage:
+  blender --background --python render_scene.py -- input.json|snapshot.blend [--glb out.glb] [--png out.png]
+      [--blend out.blend] [--room [--detail SCALE]] [--tier TIER] [--no-ceilings] [--samples N] [--resolution WxH]
+      [--azimuth DEG] [--view ROOM_ID] [--cull-hidden] [--optimize-glb] [--snapshot] [--furniture-library DIR]
+      [--cancel-file PATH] [--timeout phase=seconds,...] [--memory-budget MB] [--budget tris=N,bytes=N]
+      [--report result.json]
+
+Without --room the house engine (render_house_v3.py) builds the whole
+blueprint; with --room the largest room is built by render_room_gltf.py,
+with --detail scaling its round parts (tessellation.py).
+Outputs are written in the order GLB, .blend, PNG, so the cheap ones exist
+even if the render is cancelled or times out.
+
+A .blend input (a snapshot) is loaded instead of building. With --snapshot,
+a JSON build is saved as a snapshot keyed by the input hash next to the
+outputs, and reused instead of rebuilding when the same input comes again.
+--azimuth renders a new overview angle instead of the snapshot's camera;
+--view ROOM_ID shoots that room from inside, from a viewpoint picked on the
+floor grid (floor_grid.py) when the house was built.
+--cull-hidden deletes faces covered by other geometry before any output
+(hidden_faces.py); the savings go in the report. --optimize-glb welds and
+reorders the exported GLB for the GPU (glb_optimize.py).
+--furniture-library DIR links house furniture from the prebuilt library in
+DIR (furniture_library.py); snapshots append it instead, so they stand alone.
+--budget tris=N degrades the house until its planned triangles fit (bytes
+are only enforced by render_house_v3.py, which measures its export).
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from blueprint_check import load_blueprint
+from build_control import (BuildControl, BuildCancelled, PhaseTimeout, option_value, parse_export_budget,
+                           write_report)
+import render_house_v3
+import render_room_gltf
+import scene_outputs
+import scene_stats
+from tessellation import parse_scale
+
+def build(data, argv, control):
+    """Build the scene; returns the snapshot info describing it"""
+    if '--room' in argv:
+        room_data = render_room_gltf.select_room(data)
+        with control.phase('build'):
+            render_room_gltf.build_room(room_data, parse_scale(option_value(argv, '--detail')))
+        info = {'kind': 'room', 'room': [room_data.get("width", 4), room_data.get("length", 5),
+                                         room_data.get("height", 2.8)]}
+    else:
+        tier = option_value(argv, '--tier', render_house_v3.DEFAULT_TIER)
+        rooms = render_house_v3.build_house(data, '--no-ceilings' in argv, control, tier,
+                                            option_value(argv, '--furniture-library'),
+                                            link_furniture='--snapshot' not in argv)
+        info = render_house_v3.snapshot_info(rooms, tier)
+
+    if '--cull-hidden' in argv:
+        info['hidden'] = render_house_v3.cull_hidden_faces(control)
+    return info
+
+def scene_key(data, argv):
+    cull_hidden = '--cull-hidden' in argv
+    if '--room' in argv:
+        return scene_outputs.snapshot_key(render_room_gltf.select_room(data), kind='room', cull_hidden=cull_hidden,
+                                          detail=parse_scale(option_value(argv, '--detail')))
+    return scene_outputs.house_snapshot_key(data, option_value(argv, '--tier', render_house_v3.DEFAULT_TIER),
+                                            '--no-ceilings' in argv, cull_hidden, '--furniture-library' in argv,
+                                            parse_export_budget(option_value(argv, '--budget')))
+
+def load_or_build(input_path, argv, outputs, control):
+    """Get the scene into memory; returns (snapshot info, snapshot path or None, built)"""
+    if scene_outputs.is_snapshot_input(input_path):
+        with control.phase('load'):
+            return scene_outputs.load_snapshot(input_path), input_path, False
+
+    data = load_blueprint(input_path)
+    if '--snapshot' not in argv:
+        return build(data, argv, control), None, True
+
+    key = scene_key(data, argv)
+    path = scene_outputs.snapshot_path(next(p for p in outputs.values() if p), key)
+    if os.path.exists(path):
+        with control.phase('load'):
+            return scene_outputs.load_snapshot(path), path, False
+    info = build(data, argv, control)
+    if info['kind'] == 'house' and not render_house_v3.snapshot_allowed():
+        return info, None, True
+    with control.phase('snapshot'), control.blocking():
+        scene_outputs.save_snapshot(path, key, **info)
+    return info, path, True
+
+def write_outputs(outputs, control, add_camera, samples, resolution, optimize=False):
+    """Write the requested outputs from the current scene; returns the GLB optimization stats, if any"""
+    optimized = None
+    if outputs['glb']:
+        print(f"\nExporting to {outputs['glb']}...")
+        with control.phase('glb'), control.blocking():
+            optimized = scene_outputs.export_glb(outputs['glb'], optimize)
+
+    if outputs['blend'] or outputs['png']:
+        # Set up the shot first so the saved .blend is ready to render
+        add_camera()
+        scene_outputs.setup_render(outputs['png'] or '', resolution, samples)
+
+    if outputs['blend']:
+        with control.phase('blend'), control.blocking():
+            scene_outputs.save_blend(os.path.abspath(outputs['blend']))
+        print(f"Saved {outputs['blend']}")
+
+    if outputs['png']:
+        # Cycles cannot be interrupted from Python; the watchdog ends the process instead
+        with control.phase('render'), control.blocking():
+            scene_outputs.render_still()
+        print(f"Rendered to: {outputs['png']}")
+    return optimized
+
+def main():
+    argv = sys.argv
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = []
+
+    outputs = {kind: option_value(argv, f'--{kind}') for kind in scene_outputs.OUTPUT_KINDS}
+    if not argv or argv[0].startswith('--') or not any(outputs.values()):
+        print("Usage: blender --background --python render_scene.py -- input.json|snapshot.blend "
+              "[--glb out.glb] [--png out.png] [--blend out.blend] [--room [--detail SCALE]] [--tier TIER] [--no-ceilings] "
+              "[--samples N] [--resolution WxH] [--azimuth DEG] [--view ROOM_ID] [--cull-hidden] [--optimize-glb] "
+              "[--snapshot] [--cancel-file PATH] [--timeout phase=seconds,...] [--memory-budget MB] "
+              "[--report result.json] [--furniture-library DIR] [--budget tris=N,bytes=N]")
+        sys.exit(1)
+
+    tier = option_value(argv, '--tier')
+    if tier and tier not in render_house_v3.TIERS:
+        print(f"❌ Unknown tier '{tier}' (expected one of: {', '.join(render_house_v3.TIERS)})")
+        sys.exit(1)
+
+    view = option_value(argv, '--view')
+    report_path = option_value(argv, '--report')
+    try:
+        azimuth = option_value(argv, '--azimuth')
+        azimuth = float(azimuth) if azimuth is not None else None
+        samples = int(option_value(argv, '--samples', 128))
+        resolution = scene_outputs.parse_resolution(option_value(argv, '--resolution'))
+        control = BuildControl.from_argv(argv)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    control.on_abort = lambda: write_report(report_path, dict(control.summary(), outputs=outputs))
+    control.start()
+    try:
+        info, snapshot, built = load_or_build(argv[0], argv, outputs, control)
+        optimized = write_outputs(outputs, control, lambda: scene_outputs.add_snapshot_camera(info, azimuth, view),
+                                  samples, resolution, '--optimize-glb' in argv)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    except (BuildCancelled, PhaseTimeout):
+        print(control.abort_message())
+        control.on_abort()
+        sys.exit(control.exit_code())
+    finally:
+        control.stop()
+
+    result = dict(control.summary(), outputs=outputs, snapshot=snapshot, built=built,
+                  stats=scene_stats.export_stats(outputs['glb']))
+    if built and info['kind'] == 'house':
+        result.update(tier=info['tier'], degraded=list(render_house_v3.degraded))
+    if 'hidden' in info:
+        result['hidden'] = info['hidden']
+    if optimized:
+        result['optimized'] = optimized
+    write_report(report_path, result)
+
+if __name__ == "__main__":
+    main()
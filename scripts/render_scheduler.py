@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Shortest-job-first scheduler for render jobs (GLB builds and Cycles stills).
+
+Each job's cost is predicted from its features - room count, furniture count,
+render samples and resolution - by a per-kind linear model that is updated
+from observed runtimes (recursive least squares with forgetting). Jobs are
+queued in separate lanes for interactive and batch work; within a lane the
+cheapest job runs first, and waiting time earns credit so expensive jobs are
+not starved.
+
+Plain Python - features come from the dry-run planner (house_plan.py), so no
+Blender is needed to admit or order jobs.
+
+    scheduler = RenderScheduler(CostModel.load('cost_model.json'))
+    scheduler.submit(RenderJob('j1', 'glb', job_features(blueprint)))
+    job = scheduler.next_job('interactive')
+    ...
+    scheduler.complete(job, seconds)
+"""
+
+import itertools
+import json
+import time
+
+import house_plan
+
+LANES = ['interactive', 'batch']
+
+# Prior weights for [1, rooms, furniture, sample-megapixels] per job kind
+DEFAULT_WEIGHTS = {
+    'glb': [2.0, 0.6, 0.05, 0.0],
+    'image': [6.0, 0.6, 0.05, 0.5],
+}
+
+
+def job_features(data, kind='glb', samples=128, resolution=(1920, 1080), tier=house_plan.DEFAULT_TIER):
+    """Scheduler features for a blueprint, from the dry-run planner"""
+    plan = house_plan.plan_house(data, detail=house_plan.tier_detail(tier))
+    return {
+        'rooms': plan['rooms'],
+        'furniture': plan['furniture'],
+        'samples': samples if kind == 'image' else 0,
+        'pixels': resolution[0] * resolution[1] if kind == 'image' else 0,
+    }
+
+
+def feature_vector(features):
+    megapixels = features.get('pixels', 0) / 1e6
+    return [1.0, float(features['rooms']), float(features['furniture']),
+            features.get('samples', 0) * megapixels]
+
+
+class RenderJob:
+    def __init__(self, job_id, kind, features, lane='interactive', submitted=None, payload=None):
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane '{lane}'")
+        self.id = job_id
+        self.kind = kind
+        self.features = features
+        self.lane = lane
+        self.submitted = time.monotonic() if submitted is None else submitted
+        self.payload = payload
+        self.estimate = None
+
+    def __repr__(self):
+        return f"RenderJob({self.id!r}, {self.kind!r}, lane={self.lane!r}, estimate={self.estimate})"
+
+
+class CostModel:
+    """Per-kind linear runtime model, learned online by recursive least squares."""
+
+    def __init__(self, weights=None, forgetting=0.98, prior_strength=10.0):
+        self.forgetting = forgetting
+        self.prior_strength = prior_strength
+        self.weights = {kind: list(w) for kind, w in (weights or DEFAULT_WEIGHTS).items()}
+        self.covariance = {kind: self._prior_covariance(len(w)) for kind, w in self.weights.items()}
+        self.observations = {kind: 0 for kind in self.weights}
+
+    def _prior_covariance(self, n):
+        return [[self.prior_strength if i == j else 0.0 for j in range(n)] for i in range(n)]
+
+    def _ensure_kind(self, kind):
+        if kind not in self.weights:
+            self.weights[kind] = list(DEFAULT_WEIGHTS['glb'])
+            self.covariance[kind] = self._prior_covariance(len(self.weights[kind]))
+            self.observations[kind] = 0
+
+    def predict(self, job):
+        self._ensure_kind(job.kind)
+        x = feature_vector(job.features)
+        return max(0.1, sum(w * v for w, v in zip(self.weights[job.kind], x)))
+
+    def observe(self, job, seconds):
+        """Update the model for the job's kind with an observed runtime"""
+        self._ensure_kind(job.kind)
+        x = feature_vector(job.features)
+        w, p, lam = self.weights[job.kind], self.covariance[job.kind], self.forgetting
+        n = len(x)
+
+        px = [sum(p[i][j] * x[j] for j in range(n)) for i in range(n)]
+        gain_denominator = lam + sum(x[i] * px[i] for i in range(n))
+        k = [v / gain_denominator for v in px]
+        error = seconds - sum(w[i] * x[i] for i in range(n))
+
+        for i in range(n):
+            w[i] += k[i] * error
+        self.covariance[job.kind] = [[(p[i][j] - k[i] * px[j]) / lam for j in range(n)] for i in range(n)]
+        self.observations[job.kind] += 1
+        return error
+
+    def to_dict(self):
+        return {'weights': self.weights, 'covariance': self.covariance,
+                'observations': self.observations, 'forgetting': self.forgetting}
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved model; a missing file gives the prior model"""
+        try:
+            with open(path, 'r') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        model = cls(saved['weights'], saved.get('forgetting', 0.98))
+        model.covariance.update(saved.get('covariance', {}))
+        model.observations.update(saved.get('observations', {}))
+        return model
+
+
+class RenderScheduler:
+    """Shortest-predicted-job-first with aging, one queue per lane.
+
+    A job's priority is its predicted seconds minus `aging` times the seconds
+    it has waited, so a job that waits long enough overtakes cheaper ones.
+    Idle workers of one lane take work from the other (`steal=True`).
+    """
+
+    def __init__(self, model=None, aging=0.5):
+        self.model = model or CostModel()
+        self.aging = aging
+        self.queues = {lane: [] for lane in LANES}
+        self.running = {}
+        self._order = itertools.count()
+
+    def submit(self, job):
+        job.estimate = round(self.model.predict(job), 2)
+        self.queues[job.lane].append((next(self._order), job))
+        return job.estimate
+
+    def priority(self, job, now):
+        return job.estimate - self.aging * (now - job.submitted)
+
+    def pending(self, lane=None):
+        lanes = [lane] if lane else LANES
+        return [job for l in lanes for _, job in self.queues[l]]
+
+    def next_job(self, lane='interactive', now=None, steal=True):
+        """Pop the best job for a worker of `lane` (None if nothing is queued)"""
+        now = time.monotonic() if now is None else now
+        order = [lane] + ([l for l in LANES if l != lane] if steal else [])
+        for l in order:
+            queue = self.queues[l]
+            if queue:
+                best = min(queue, key=lambda item: (self.priority(item[1], now), item[0]))
+                queue.remove(best)
+                job = best[1]
+                self.running[job.id] = (job, now)
+                return job
+        return None
+
+    def cancel(self, job_id):
+        """Drop a queued job (e.g. the user left the page)"""
+        for lane in LANES:
+            for item in self.queues[lane]:
+                if item[1].id == job_id:
+                    self.queues[lane].remove(item)
+                    return item[1]
+        return None
+
+    def complete(self, job, seconds=None, now=None):
+        """Record a finished job and learn from its runtime"""
+        now = time.monotonic() if now is None else now
+        _, started = self.running.pop(job.id, (job, None))
+        if seconds is None and started is not None:
+            seconds = now - started
+        if seconds is not None:
+            self.model.observe(job, seconds)
+        return seconds
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Outputs written from an already-built scene: GLB, .blend and a Cycles still.
+
+The room and house builders only build; these helpers export what was built,
+so one build can produce any combination of outputs (see render_scene.py).
+
+Snapshots are compressed .blend files keyed by a hash of the blueprint's
+canonical millimetre form and the build options. Render scripts can load one instead of rebuilding the scene.
+"""
+
+import json
+import math
+import os
+
+import bpy
+import mathutils
+
+import glb_optimize
+from house_layout import blueprint_key
+
+OUTPUT_KINDS = ['glb', 'blend', 'png']
+
+# Bump when builder changes make old snapshots stale
+SNAPSHOT_VERSION = 1
+
+
+def export_glb(path, optimize=False, selected=False):
+    """Export the scene (or only the selected objects) as GLB (lights and cameras are not exported).
+
+    Object custom properties (room tags, slab room maps) go out as glTF extras.
+    With `optimize` the file is welded, reordered and stripped afterwards
+    (glb_optimize.py); returns its stats then.
+    """
+    bpy.ops.export_scene.gltf(
+        filepath=path,
+        export_format='GLB',
+        export_materials='EXPORT',
+        export_cameras=False,
+        export_lights=False,
+        export_apply=True,
+        export_extras=True,
+        use_selection=selected,
+    )
+    if optimize:
+        return glb_optimize.optimize_glb(path)
+    return None
+
+
+def save_blend(path, compress=False):
+    """Save a copy of the scene as .blend without changing the session's file"""
+    bpy.ops.wm.save_as_mainfile(filepath=path, copy=True, compress=compress)
+
+
+# ============= SNAPSHOTS =============
+
+def snapshot_key(data, **options):
+    """Hash of the blueprint (in integer millimetres) and the build options that shape the scene"""
+    return blueprint_key(data, version=SNAPSHOT_VERSION, **options)
+
+
+def house_snapshot_key(data, tier, skip_ceilings=False, cull_hidden=False, furniture_library=False,
+                       export_budget=None):
+    """Snapshot key of a house build, the same from render_house_v3.py and render_scene.py"""
+    return snapshot_key(data, kind='house', tier=tier, skip_ceilings=skip_ceilings, cull_hidden=cull_hidden,
+                        furniture_library=bool(furniture_library), budget=dict(export_budget or {}))
+
+
+def snapshot_path(output_path, key):
+    """Snapshot location next to an output file"""
+    return os.path.join(os.path.dirname(os.path.abspath(output_path)), f"scene-{key}.blend")
+
+
+def save_snapshot(path, key, kind, **info):
+    """Save a compressed .blend with what is needed to render it later.
+
+    kind is 'house' or 'room'; rooms pass room=(width, length, height) for the
+    interior camera.
+    """
+    bpy.context.scene['snapshot'] = json.dumps(dict(info, key=key, kind=kind))
+    save_blend(path, compress=True)
+    print(f"💾 Snapshot saved: {path}")
+
+
+def load_snapshot(path):
+    """Replace the current scene with a snapshot; returns its info (empty for plain .blend files)"""
+    bpy.ops.wm.open_mainfile(filepath=os.path.abspath(path))
+    print(f"📂 Loaded snapshot: {path}")
+    return json.loads(bpy.context.scene.get('snapshot', '{}'))
+
+
+def is_snapshot_input(path):
+    return path.lower().endswith('.blend')
+
+
+# ============= CAMERAS =============
+
+def add_room_camera(width, length, height):
+    """Position camera for a nice interior shot."""
+    bpy.ops.object.camera_add(location=(width / 2, length - 0.8, 1.6))
+    camera = bpy.context.active_object
+    camera.name = "Camera"
+
+    # Look toward back wall with slight angle
+    camera.rotation_euler = (math.radians(85), 0, math.radians(180))
+    camera.data.lens = 24  # Wide angle
+
+    bpy.context.scene.camera = camera
+    return camera
+
+
+def add_overview_camera(azimuth=None):
+    """Three-quarter view from above, framing all meshes.
+
+    azimuth is in degrees around the house, 0 looking from the front (-Y side)
+    and positive towards the left; the default views the front-left corner.
+    """
+    corners = [obj.matrix_world @ mathutils.Vector(corner)
+               for obj in bpy.data.objects if obj.type == 'MESH'
+               for corner in obj.bound_box]
+    if not corners:
+        corners = [mathutils.Vector((0, 0, 0))]
+    low = mathutils.Vector([min(c[i] for c in corners) for i in range(3)])
+    high = mathutils.Vector([max(c[i] for c in corners) for i in range(3)])
+    center = (low + high) / 2
+    size = max((high - low).length, 1.0)
+
+    azimuth = math.radians(37 if azimuth is None else azimuth)
+    direction = mathutils.Vector((-math.sin(azimuth), -math.cos(azimuth), 0.7)).normalized()
+    location = center + direction * size * 1.1
+    bpy.ops.object.camera_add(location=location)
+    camera = bpy.context.active_object
+    camera.name = "Camera"
+    camera.rotation_euler = (center - location).to_track_quat('-Z', 'Y').to_euler()
+    camera.data.lens = 35
+    camera.data.clip_end = size * 4
+
+    bpy.context.scene.camera = camera
+    return camera
+
+
+def add_interior_camera(eye, target, eye_height=1.6, target_height=1.1):
+    """Camera standing at eye (x, y) looking at target (x, y), e.g. from FloorGrid.viewpoint"""
+    location = mathutils.Vector((eye[0], eye[1], eye_height))
+    bpy.ops.object.camera_add(location=location)
+    camera = bpy.context.active_object
+    camera.name = "Camera"
+    look = mathutils.Vector((target[0], target[1], target_height)) - location
+    if look.length < 1e-6:
+        look = mathutils.Vector((0, 1, 0))
+    camera.rotation_euler = look.to_track_quat('-Z', 'Y').to_euler()
+    camera.data.lens = 18  # Wide angle for interiors
+
+    bpy.context.scene.camera = camera
+    return camera
+
+
+def add_snapshot_camera(info, azimuth=None, view=None):
+    """Camera for a loaded snapshot: its saved camera, or a new one for its kind.
+
+    view names a room of a house snapshot to shoot from inside, using the
+    viewpoints stored with it.
+    """
+    scene = bpy.context.scene
+    if view is not None:
+        if view not in info.get('views', {}):
+            raise ValueError(f"No viewpoint for room '{view}'")
+        return add_interior_camera(*info['views'][view])
+    if azimuth is None and scene.camera:
+        return scene.camera
+    if azimuth is None and info.get('kind') == 'room':
+        return add_room_camera(*info['room'])
+    return add_overview_camera(azimuth)
+
+
+# ============= STILL RENDER =============
+
+def setup_render(output_path, resolution=(1920, 1080), samples=128):
+    """Configure high-quality render settings."""
+    scene = bpy.context.scene
+
+    scene.render.engine = 'CYCLES'
+    scene.cycles.samples = samples
+    scene.cycles.use_denoising = True
+
+    scene.render.resolution_x = resolution[0]
+    scene.render.resolution_y = resolution[1]
+    scene.render.resolution_percentage = 100
+
+    scene.render.filepath = output_path
+    scene.render.image_settings.file_format = 'PNG'
+    scene.render.image_settings.color_mode = 'RGB'
+
+
+def render_still():
+    bpy.ops.render.render(write_still=True)
+
+
+def parse_resolution(value, default=(1920, 1080)):
+    """'1280x720' -> (1280, 720)"""
+    if not value:
+        return default
+    try:
+        width, height = value.lower().split('x')
+        return int(width), int(height)
+    except ValueError:
+        raise ValueError(f"Invalid resolution '{value}', expected WxH") from None
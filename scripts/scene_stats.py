@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Scene statistics for exported houses and rooms.
+
+Counts objects, meshes, vertices, triangles and materials per room and per
+category (structure, openings, furniture, decor), and combines them with the
+byte breakdown of the exported GLB.
+
+Lights and cameras are not exported and are only counted, under "lighting".
+Objects are attributed to rooms through the "room_id" custom property set by
+`tag_objects()`; untagged objects are reported under "shared". Furniture
+spliced into the GLB after export (glb_assemble.py) is passed in as
+`spliced` and counted like the objects it replaces.
+"""
+
+import bpy
+from glb_tools import glb_stats
+
+# First matching name prefix wins; everything else counts as furniture
+CATEGORY_PREFIXES = [
+    ('openings', ('Door', 'Win_', 'Window', 'Glass')),
+    ('structure', ('Floor', 'Ceiling', 'Wall', 'Trim', 'Baseboard', 'CrownMolding',
+                   'Deck', 'Perg', 'Step', 'RailPost', 'Handrail')),
+    ('decor', ('Plant', 'Pot', 'Soil', 'Rug', 'Umbrella', 'PictureFrame', 'Art')),
+]
+
+
+def categorize(obj):
+    if obj.type != 'MESH':
+        return 'lighting'
+    for category, prefixes in CATEGORY_PREFIXES:
+        if obj.name.startswith(prefixes):
+            return category
+    return 'furniture'
+
+
+def object_names():
+    """Snapshot of object names, to pass to tag_objects() after building"""
+    return {obj.name for obj in bpy.data.objects}
+
+
+def tag_objects(before, room_id):
+    """Tag objects created since the `before` snapshot with their room"""
+    for obj in bpy.data.objects:
+        if obj.name not in before:
+            obj["room_id"] = room_id
+
+
+def _empty_counts():
+    return {'objects': 0, 'meshes': 0, 'unique_meshes': set(),
+            'vertices': 0, 'triangles': 0, 'materials': set()}
+
+
+def _finish(counts):
+    counts['unique_meshes'] = len(counts['unique_meshes'])
+    counts['materials'] = len(counts['materials'])
+    return counts
+
+
+def collect_scene_stats(spliced=()):
+    """Geometry counts for all objects, per room and category.
+
+    spliced: (room id, mesh name, vertices, triangles, material names) of
+    furniture added to the GLB outside the scene (glb_assemble.spliced_meshes).
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    rooms = {}
+    totals = _empty_counts()
+
+    for obj in bpy.data.objects:
+        room = rooms.setdefault(obj.get("room_id", "shared"), {})
+        category = categorize(obj)
+        if obj.type != 'MESH':
+            for counts in (room.setdefault(category, _empty_counts()), totals):
+                counts['objects'] += 1
+            continue
+
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        verts = len(mesh.vertices)
+        tris = sum(p.loop_total - 2 for p in mesh.polygons)
+        materials = {m.name for m in obj.data.materials if m}
+        evaluated.to_mesh_clear()
+
+        for counts in (room.setdefault(category, _empty_counts()), totals):
+            counts['objects'] += 1
+            counts['meshes'] += 1
+            counts['unique_meshes'].add(obj.data.name)
+            counts['vertices'] += verts
+            counts['triangles'] += tris
+            counts['materials'] |= materials
+
+    for room_id, mesh_name, verts, tris, materials in spliced:
+        for counts in (rooms.setdefault(room_id, {}).setdefault('furniture', _empty_counts()), totals):
+            counts['objects'] += 1
+            counts['meshes'] += 1
+            counts['unique_meshes'].add(mesh_name)
+            counts['vertices'] += verts
+            counts['triangles'] += tris
+            counts['materials'] |= set(materials)
+
+    for room in rooms.values():
+        for category in room:
+            _finish(room[category])
+
+    return {'totals': _finish(totals), 'rooms': rooms}
+
+
+def export_stats(glb_path=None, spliced=()):
+    """Stats record for an export: scene counts (plus spliced furniture) and GLB byte breakdown (if a GLB was written)"""
+    stats = collect_scene_stats(spliced)
+    totals = stats['totals']
+    line = (f"📊 {totals['objects']} objects, {totals['unique_meshes']} unique meshes, "
+            f"{totals['triangles']} triangles, {totals['materials']} materials")
+    if glb_path:
+        stats['glb'] = glb_stats(glb_path)
+        line += f", {stats['glb']['total_bytes'] / 1024:.0f} KB"
+    print(line)
+    return stats
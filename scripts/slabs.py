@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Floor and ceiling slabs merged across rooms, one mesh per material.
+
+The builders used to make each floor and ceiling a 2 cm box per room, with
+side and bottom faces buried in walls or the ground. Here each room is a
+single face: the top of the floor, the underside of the ceiling. All faces
+of one material go into one mesh. Rooms that share an edge share its
+vertices (wall_shell.weld_polygons), so the slab has no T-junctions.
+
+Faces stay one per room, in room order, so `face_rooms` maps each face
+back to its room. The builder keeps that as a face attribute and the room
+rectangles as glTF extras, for picking.
+
+Plain Python + NumPy - no bpy.
+"""
+
+import numpy as np
+
+from house_layout import MM, is_outdoor, room_bounds_mm
+from wall_shell import weld_polygons
+
+# Top of the floor and underside of the ceiling, as the old 2 cm slabs had them
+FLOOR_TOP_MM = 20
+CEILING_DROP_MM = 20
+
+# Thickness of the slab a single-sided floor or ceiling face stands for, in metres
+SLAB_THICKNESS = FLOOR_TOP_MM / MM
+
+def floor_material(room):
+    """Material name of a room's floor"""
+    if room.type == 'bathroom':
+        return 'TileWhite'
+    if room.type == 'kitchen':
+        return 'TileBeige'
+    return 'WoodFloor'
+
+def has_floor_slab(room):
+    # Decks and balconies get planks (create_deck_floor)
+    return room.type not in ['deck', 'balcony']
+
+def has_ceiling(room, skip_ceilings=False):
+    return not is_outdoor(room) and not skip_ceilings
+
+def _slab(rooms, bounds, heights, facing_up):
+    polygons = []
+    for (x0, y0, x1, y1), z in zip(bounds.tolist(), heights):
+        corners = [(x0, y0, z), (x1, y0, z), (x1, y1, z), (x0, y1, z)]
+        polygons.append(corners if facing_up else corners[::-1])
+    points, loops, face_sizes = weld_polygons(polygons)
+    return {
+        'vertices': (points / MM).astype(np.float32),
+        'loops': loops,
+        'face_sizes': face_sizes,
+        'face_rooms': [room.id for room in rooms],
+        'room_bounds': {room.id: [v / MM for v in b] for room, b in zip(rooms, bounds.tolist())},
+        'triangles': int((face_sizes - 2).sum()),
+    }
+
+def floor_slabs(rooms):
+    """{material name: slab} for the floors of all rooms that have one"""
+    groups = {}
+    for room in rooms:
+        if has_floor_slab(room):
+            groups.setdefault(floor_material(room), []).append(room)
+    return {material: _slab(group, room_bounds_mm(group), [FLOOR_TOP_MM] * len(group), True)
+            for material, group in groups.items()}
+
+def ceiling_slab(rooms, skip_ceilings=False):
+    """One slab for all ceilings (facing down), or None"""
+    group = [room for room in rooms if has_ceiling(room, skip_ceilings)]
+    if not group:
+        return None
+    return _slab(group, room_bounds_mm(group), [room.height_mm - CEILING_DROP_MM for room in group], False)
+
+def extend_through_slabs(bounds, facing):
+    """Copy of bounds (rows of min xyz, max xyz in metres) reaching SLAB_THICKNESS behind slabs.
+
+    facing is +1 for floors (facing up), -1 for ceilings (facing down) and
+    0 for anything that is not a slab.
+    """
+    bounds = np.array(bounds, dtype=float).reshape(-1, 6)
+    facing = np.asarray(facing).reshape(-1)
+    bounds[facing > 0, 2] -= SLAB_THICKNESS
+    bounds[facing < 0, 5] += SLAB_THICKNESS
+    return bounds
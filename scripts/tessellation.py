@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Segment counts for round primitives, chosen from their size.
+
+A circle of radius r drawn with n segments strays from the true circle by
+at most r * (1 - cos(pi / n)). The builders pick the smallest n that keeps
+that error under SCREEN_ERROR_PX pixels for a viewer VIEW_DISTANCE away, so
+a 2 cm faucet gets a handful of segments and a 1.2 m rug gets as many as
+it needs to look round:
+
+    circle_segments(0.02)            # 6
+    circle_segments(1.2)             # 43
+    sphere_segments(0.28)            # (21, 11)
+
+`scale` is the global detail multiplier (detail['segment_scale'] in
+render_house_v3, --detail in the room scripts): 0.5 allows twice the error.
+
+Plain Python - no bpy.
+"""
+
+import math
+
+# Typical distance from the viewer to furniture in a walkthrough (metres)
+VIEW_DISTANCE = 3.0
+
+# Largest silhouette error allowed, in pixels of a 1080p view with a 60 degree field of view
+SCREEN_ERROR_PX = 1.0
+VIEWPORT_PX = 1080
+FIELD_OF_VIEW = math.radians(60)
+
+MIN_SEGMENTS = 6
+MAX_SEGMENTS = 64
+MIN_RINGS = 3
+
+
+def tolerance(scale=1.0, distance=VIEW_DISTANCE):
+    """World-space error (metres) allowed at a viewing distance"""
+    pixel = 2 * distance * math.tan(FIELD_OF_VIEW / 2) / VIEWPORT_PX
+    return SCREEN_ERROR_PX * pixel / scale
+
+
+def circle_segments(radius, scale=1.0, distance=VIEW_DISTANCE):
+    """Segments for a circle of this radius (cylinders, cones, sphere equators)"""
+    error = tolerance(scale, distance)
+    if radius <= error:
+        return MIN_SEGMENTS
+    segments = math.ceil(math.pi / math.acos(1 - error / radius))
+    return min(MAX_SEGMENTS, max(MIN_SEGMENTS, segments))
+
+
+def sphere_segments(radius, scale=1.0, distance=VIEW_DISTANCE):
+    """(segments, rings) for a UV sphere; rings only span half a circle"""
+    segments = circle_segments(radius, scale, distance)
+    return segments, max(MIN_RINGS, math.ceil(segments / 2))
+
+
+def parse_scale(value, default=1.0):
+    """Detail multiplier from the command line (--detail 0.5)"""
+    if value is None:
+        return default
+    try:
+        scale = float(value)
+    except ValueError:
+        scale = 0
+    if not scale > 0:
+        raise ValueError(f"Invalid detail '{value}', expected a positive number")
+    return scale
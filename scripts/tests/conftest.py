@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The scripts are run from their own directory and import each other as top-level modules
+sys.path.insert(0, SCRIPTS)
+
+from blueprint_check import check_blueprint  # noqa: E402
+
+TEST_BLUEPRINT = os.path.join(os.path.dirname(SCRIPTS), 'test-blueprint.json')
+
+
+@pytest.fixture
+def house():
+    """The repo's test blueprint, repaired and snapped the way the builders load it"""
+    with open(TEST_BLUEPRINT) as f:
+        return check_blueprint(json.load(f), repair=True)['blueprint']
+
+
+def room(room_id, x, y, width, length, **fields):
+    """A blueprint room dict"""
+    return dict({'id': room_id, 'type': 'living', 'position': {'x': x, 'y': y}, 'width': width,
+                 'length': length, 'height': 2.8}, **fields)
+
+
+def mesh_gltf(positions, indices=None, name='mesh', material=None):
+    """One-mesh, one-node glTF with float32 POSITION and optional uint16 indices; returns (gltf, binary)"""
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    blob = bytearray(positions.tobytes())
+    primitive = {'attributes': {'POSITION': 0}}
+    gltf = {
+        'asset': {'version': '2.0'},
+        'scene': 0,
+        'scenes': [{'nodes': [0]}],
+        'nodes': [{'name': name, 'mesh': 0}],
+        'meshes': [{'name': name, 'primitives': [primitive]}],
+        'bufferViews': [{'buffer': 0, 'byteOffset': 0, 'byteLength': len(blob), 'target': 34962}],
+        'accessors': [{'bufferView': 0, 'componentType': 5126, 'type': 'VEC3', 'count': len(positions),
+                       'min': positions.min(axis=0).tolist(), 'max': positions.max(axis=0).tolist()}],
+    }
+    if indices is not None:
+        data = np.asarray(indices, dtype=np.uint16).tobytes()
+        blob.extend(b'\0' * (-len(blob) % 4))
+        gltf['bufferViews'].append({'buffer': 0, 'byteOffset': len(blob), 'byteLength': len(data), 'target': 34963})
+        gltf['accessors'].append({'bufferView': 1, 'componentType': 5123, 'type': 'SCALAR', 'count': len(indices)})
+        blob.extend(data)
+        primitive['indices'] = 1
+    if material:
+        gltf['materials'] = [{'name': material, 'pbrMetallicRoughness': {'baseColorFactor': [0.5, 0.5, 0.5, 1]}}]
+        primitive['material'] = 0
+    gltf['buffers'] = [{'byteLength': len(blob)}]
+    return gltf, bytes(blob)
@@ -0,0 +1,84 @@
+from blueprint_check import MIN_ROOM_SIZE, OPENING_MARGIN, check_blueprint
+from conftest import room
+
+
+def codes(report):
+    return {issue['code'] for issue in report['issues']}
+
+
+def test_clean_blueprint_has_no_issues():
+    report = check_blueprint({'rooms': [room('a', 0, 0, 4, 3), room('b', 4, 0, 3, 3)]}, repair=True)
+    assert report['valid'] and report['issues'] == []
+    assert [r['id'] for r in report['blueprint']['rooms']] == ['a', 'b']
+
+
+def test_missing_width_rejects_the_job():
+    bad = room('a', 0, 0, 4, 3)
+    del bad['width']
+    report = check_blueprint({'rooms': [bad]}, repair=True)
+    assert not report['valid'] and report['blueprint'] is None
+    assert 'room.missing_size' in codes(report)
+
+
+def test_numeric_strings_are_converted_for_every_size():
+    report = check_blueprint({'rooms': [room('a', 0, 0, '4', '3', height='2.6')]}, repair=True)
+    assert report['valid']
+    fixed = report['blueprint']['rooms'][0]
+    assert (fixed['width'], fixed['length'], fixed['height']) == (4.0, 3.0, 2.6)
+    assert [i['path'] for i in report['issues'] if i['code'] == 'room.string_size'] == \
+        ['rooms[0].width', 'rooms[0].length', 'rooms[0].height']
+
+
+def test_negative_width_is_flipped():
+    report = check_blueprint({'rooms': [room('a', 4, 0, -4, 3)]}, repair=True)
+    fixed = report['blueprint']['rooms'][0]
+    assert fixed['position']['x'] == 0 and fixed['width'] == 4
+
+
+def test_too_small_rooms_are_dropped():
+    report = check_blueprint({'rooms': [room('a', 0, 0, 4, 3), room('tiny', 5, 0, MIN_ROOM_SIZE / 2, 1)]},
+                             repair=True)
+    assert [r['id'] for r in report['blueprint']['rooms']] == ['a']
+
+
+def test_overlapping_rooms_are_trimmed_to_share_a_wall():
+    report = check_blueprint({'rooms': [room('a', 0, 0, 4, 3), room('b', 3, 0, 3, 3)]}, repair=True)
+    assert 'room.overlap' in codes(report)
+    a, b = report['blueprint']['rooms']
+    # The room that loses the smaller share of its width is trimmed
+    assert a['position']['x'] + a['width'] == b['position']['x']
+    assert (a['width'], b['width']) == (3.0, 3.0)
+
+
+def test_duplicate_ids_are_renamed():
+    report = check_blueprint({'rooms': [room('a', 0, 0, 4, 3), room('a', 4, 0, 3, 3)]}, repair=True)
+    assert [r['id'] for r in report['blueprint']['rooms']] == ['a', 'a_1']
+
+
+def test_openings_are_fitted_into_their_wall():
+    door = {'wall': 'front', 'position': 0.95, 'width': 5.0, 'height': 3.5}
+    report = check_blueprint({'rooms': [room('a', 0, 0, 4, 3, doors=[door])]}, repair=True)
+    assert {'opening.wider_than_wall', 'opening.too_tall'} <= codes(report)
+    fixed = report['blueprint']['rooms'][0]['doors'][0]
+    assert fixed['width'] == 4 - 2 * OPENING_MARGIN
+    assert fixed['height'] < 2.8
+
+
+def test_opening_on_an_unknown_wall_is_dropped():
+    report = check_blueprint({'rooms': [room('a', 0, 0, 4, 3, windows=[{'wall': 'roof'}])]}, repair=True)
+    assert report['blueprint']['rooms'][0]['windows'] == []
+
+
+def test_without_repair_fixable_errors_still_fail():
+    report = check_blueprint({'rooms': [room('a', 0, 0, 4, 3), room('b', 3, 0, 3, 3)]})
+    assert not report['valid'] and report['blueprint'] is None
+
+
+def test_repaired_blueprint_is_snapped_to_millimetres():
+    report = check_blueprint({'rooms': [room('a', 0.00049, 0, 4.0004, 3)]}, repair=True)
+    fixed = report['blueprint']['rooms'][0]
+    assert (fixed['position']['x'], fixed['width']) == (0.0, 4.0)
+
+
+def test_the_test_blueprint_is_repairable(house):
+    assert len(house['rooms']) > 5
@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from build_control import (EXIT_TIMEOUT, BuildCancelled, BuildControl, PhaseTimeout, parse_budgets,
+                           parse_export_budget)
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_parse_budgets():
+    assert parse_budgets('rooms=20, export=2.5') == {'rooms': 20.0, 'export': 2.5}
+    assert parse_budgets(None) == {}
+    with pytest.raises(ValueError):
+        parse_budgets('rooms')
+
+
+def test_parse_export_budget():
+    assert parse_export_budget('tris=150k,bytes=5mb') == {'triangles': 150000, 'bytes': 5 * 2**20}
+    assert parse_export_budget('triangles=2m, bytes=512kb') == {'triangles': 2000000, 'bytes': 512 * 1024}
+    for bad in ('12q', 'tris=lots', 'pixels=5'):
+        with pytest.raises(ValueError):
+            parse_export_budget(bad)
+
+
+def test_from_argv_reads_every_option():
+    control = BuildControl.from_argv(['in.json', '--timeout', 'rooms=3', '--memory-budget', '512',
+                                      '--budget', 'tris=10k', '--cancel-file', '/tmp/stop'])
+    assert control.budgets == {'rooms': 3.0} and control.memory_budget_mb == 512.0
+    assert control.export_budget == {'triangles': 10000} and control.cancel_file == '/tmp/stop'
+
+
+def test_phase_overrun_raises_and_is_reported():
+    control = BuildControl(budgets={'rooms': 0.01})
+    with pytest.raises(PhaseTimeout):
+        with control.phase('rooms'):
+            time.sleep(0.02)
+            control.check()
+    summary = control.summary()
+    assert summary['status'] == 'timeout' and summary['phase'] == 'rooms'
+    assert summary['phases'][0]['seconds'] >= 0.02
+
+
+def test_cancel_file_cancels_at_the_next_check(tmp_path):
+    control = BuildControl(cancel_file=str(tmp_path / 'stop'))
+    with pytest.raises(BuildCancelled):
+        with control.phase('rooms'):
+            control.check()
+            (tmp_path / 'stop').touch()
+            control.check()
+            pytest.fail("check() did not see the cancel file")
+    assert control.summary()['status'] == 'cancelled'
+
+
+def run_job(tmp_path, body):
+    """Run a job script in its own process, since the watchdog ends it with os._exit"""
+    script = textwrap.dedent('''
+        import sys, time
+        sys.path.insert(0, {scripts!r})
+        from build_control import BuildControl, write_report
+        control = BuildControl(budgets={{'work': 0.2}}, poll_interval=0.05)
+        control.on_abort = lambda: write_report({report!r}, control.summary())
+    ''').format(scripts=SCRIPTS, report=str(tmp_path / 'report.json')) + textwrap.dedent(body)
+    return subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, timeout=30)
+
+
+def test_watchdog_writes_the_report_when_the_main_thread_never_checks(tmp_path):
+    done = run_job(tmp_path, '''
+        control.start()
+        with control.phase('work'):
+            end = time.monotonic() + 10
+            while time.monotonic() < end:
+                pass
+    ''')
+    assert done.returncode == EXIT_TIMEOUT
+    report = json.loads((tmp_path / 'report.json').read_text())
+    assert report['status'] == 'timeout'
+    assert report['phase'] == 'work'
+
+
+def test_watchdog_exits_inside_blocking_calls_with_a_report(tmp_path):
+    done = run_job(tmp_path, '''
+        control.start()
+        with control.phase('work'), control.blocking():
+            time.sleep(10)
+    ''')
+    assert done.returncode == EXIT_TIMEOUT
+    assert json.loads((tmp_path / 'report.json').read_text())['status'] == 'timeout'
@@ -0,0 +1,57 @@
+import pytest
+
+from conftest import room
+from floor_grid import FloorGrid
+
+# Living room with a door to the bedroom on its right, and a deck in front
+HOUSE = {'rooms': [
+    room('living', 0, 0, 4, 4, doors=[{'wall': 'right', 'position': 0.5, 'width': 0.9}]),
+    room('bedroom', 4, 0, 3, 4),
+    room('deck', 0, -2, 2, 2, type='deck'),
+]}
+
+
+@pytest.fixture
+def grid():
+    return FloorGrid.from_blueprint(HOUSE)
+
+
+def test_room_at(grid):
+    assert grid.room_at(1.0, 1.0).id == 'living'
+    assert grid.room_at(5.0, 3.0).id == 'bedroom'
+    assert grid.room_at(1.0, -1.0).id == 'deck'
+    assert grid.room_at(10.0, 10.0) is None
+
+
+def test_free_floor_keeps_off_walls_and_door_clearances(grid):
+    # The door spans y 1.55-2.45 on x = 4, and keeps 0.9 m in front of it free
+    x, y = grid.free_floor_near(4.0, 2.0, room='living', clearance=0.2)
+    assert x < 4.0 - 0.06 - 0.2
+    assert x < 4.0 - 0.9 - 0.2 or not 1.55 - 0.2 < y < 2.45 + 0.2
+    x, y = grid.free_floor_near(0.0, 3.0, room='living', clearance=0.2)
+    assert 0.2 < x and y < 3.8
+
+
+def test_occupied_furniture_is_avoided(grid):
+    before = grid.free_floor_near(0.5, -1.0, room='deck', clearance=0.1)
+    grid.occupy(0.5, -1.0, 0.8, 1.8)
+    after = grid.free_floor_near(0.5, -1.0, room='deck', clearance=0.1)
+    assert abs(before[0] - 0.5) < 0.1
+    assert after[0] > 0.5 + 0.4 + 0.1
+
+
+def test_line_of_sight_passes_through_doors_only(grid):
+    assert grid.line_of_sight((3.0, 2.0), (5.0, 2.0))
+    assert not grid.line_of_sight((3.0, 0.5), (5.0, 0.5))
+
+
+def test_exterior_edges(grid):
+    assert grid.is_exterior_edge(0, 4, 4, 4)
+    assert not grid.is_exterior_edge(4, 0.5, 4, 3.5)
+
+
+def test_viewpoint_looks_into_the_room(grid):
+    eye, target = grid.viewpoint('living')
+    assert grid.room_at(*eye).id == 'living'
+    assert target == pytest.approx((2.0, 2.0), abs=0.1)
+    assert grid.line_of_sight(eye, target)
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from conftest import mesh_gltf
+from furniture_layout import place
+from glb_assemble import assemble, item_counts, shared_buffer, splice_mesh
+from glb_optimize import optimize, read_accessor
+from glb_tools import build_glb, glb_triangles, parse_glb
+
+FLOOR = [(0, 0, 0), (4, 0, 0), (4, 0, -3), (0, 0, 0), (4, 0, -3), (0, 0, -3)]
+SOFA = [(0, 0, 0), (2.2, 0, 0), (2.2, 0.9, 0), (0, 0.9, 0)]
+
+
+def house():
+    return mesh_gltf(FLOOR, name='Floor', material='Wood')
+
+
+def sofa():
+    return mesh_gltf(SOFA, [0, 1, 2, 0, 2, 3], name='Sofa', material='Wood')
+
+
+def mesh_positions(gltf, binary, mesh):
+    return read_accessor(gltf, binary, gltf['meshes'][mesh]['primitives'][0]['attributes']['POSITION'])
+
+
+def test_assemble_adds_one_mesh_per_item_and_one_node_per_placement():
+    placements = [('living', place('sofa', 'Sofa', 1, 2)), ('den', place('sofa', 'Sofa.001', 3, 1, width=1.1))]
+    gltf, binary, stats = assemble(*house(), placements, {'sofa': sofa()})
+    assert stats['items'] == 1 and stats['nodes'] == 2
+    assert len(gltf['meshes']) == 2
+    assert [node['mesh'] for node in gltf['nodes'][1:]] == [1, 1]
+    assert gltf['scenes'][0]['nodes'] == [0, 1, 2]
+    first, second = gltf['nodes'][1:]
+    assert first['translation'] == [1, 0.0, -2] and first['extras'] == {'room_id': 'living'}
+    assert second['scale'] == pytest.approx([0.5, 1.0, 1.0])
+    # Both parts use the same material definition
+    assert len(gltf['materials']) == 1
+    assert gltf['meshes'][1]['primitives'][0]['material'] == 0
+
+
+def test_spliced_data_survives_a_glb_round_trip():
+    placements = [('living', place('sofa', 'Sofa', 1, 2))]
+    gltf, binary, stats = assemble(*house(), placements, {'sofa': sofa()})
+    assert gltf['buffers'] == [{'byteLength': len(binary)}]
+    assert stats['bytes_added'] == len(binary) - len(house()[1])
+    gltf, binary = parse_glb(build_glb(gltf, binary))
+    assert np.allclose(mesh_positions(gltf, binary, 0), FLOOR)
+    assert np.allclose(mesh_positions(gltf, binary, 1), SOFA)
+    indices = read_accessor(gltf, binary, gltf['meshes'][1]['primitives'][0]['indices'])
+    assert indices.reshape(-1).tolist() == [0, 1, 2, 0, 2, 3]
+    assert glb_triangles(gltf) == 4
+
+
+def test_spliced_house_can_be_optimized():
+    placements = [('living', place('sofa', 'Sofa', 1, 2))]
+    gltf, binary, _ = assemble(*house(), placements, {'sofa': sofa()})
+    gltf, binary, stats = optimize(gltf, binary)
+    assert stats['triangles'] == [4, 4]
+    assert glb_triangles(gltf) == 4
+    assert np.allclose(np.unique(mesh_positions(gltf, binary, 1), axis=0), np.unique(SOFA, axis=0))
+
+
+def test_shared_items_are_external_buffers():
+    placements = [('living', place('sofa', 'Sofa', 1, 2))]
+    _, house_binary = house()
+    gltf, binary, stats = assemble(*house(), placements, {'sofa': sofa()}, uris={'sofa': 'sofa.bin'})
+    assert binary == house_binary and stats['bytes_added'] == 0
+    assert gltf['buffers'] == [{'byteLength': len(house_binary)}, {'uri': 'sofa.bin', 'byteLength': len(sofa()[1])}]
+    assert stats['shared_bytes'] == len(sofa()[1])
+    assert {view['buffer'] for view in gltf['bufferViews'][2:]} == {1}
+
+
+def test_empty_house_gets_a_bin_buffer_first():
+    gltf = {'asset': {'version': '2.0'}, 'scene': 0, 'scenes': [{'nodes': []}]}
+    placements = [('living', place('sofa', 'Sofa', 1, 2))]
+    gltf, binary, _ = assemble(gltf, b'', placements, {'sofa': sofa()})
+    assert gltf['buffers'] == [{'byteLength': len(binary)}]
+    # Shared only: no empty BIN buffer in front of the external one
+    gltf = {'asset': {'version': '2.0'}, 'scene': 0, 'scenes': [{'nodes': []}]}
+    gltf, binary, _ = assemble(gltf, b'', placements, {'sofa': sofa()}, uris={'sofa': 'sofa.bin'})
+    assert binary == b''
+    assert gltf['buffers'] == [{'uri': 'sofa.bin', 'byteLength': len(sofa()[1])}]
+
+
+def test_embedded_item_after_shared_one_moves_the_bin_buffer_to_the_front():
+    gltf = {'asset': {'version': '2.0'}, 'scene': 0, 'scenes': [{'nodes': []}]}
+    blob = bytearray()
+    splice_mesh(gltf, blob, sofa(), 'sofa', uri='sofa.bin')
+    splice_mesh(gltf, blob, sofa(), 'sofa')
+    assert gltf['buffers'][0] == {'byteLength': 0} and gltf['buffers'][1]['uri'] == 'sofa.bin'
+    assert [view['buffer'] for view in gltf['bufferViews']] == [1, 1, 0, 0]
+
+
+def test_splice_refuses_parts_it_cannot_copy():
+    gltf, blob = {}, bytearray()
+    part_gltf, part_binary = sofa()
+    part_gltf['meshes'].append(part_gltf['meshes'][0])
+    with pytest.raises(ValueError, match='expected one mesh'):
+        splice_mesh(gltf, blob, (part_gltf, part_binary), 'sofa')
+    part_gltf, part_binary = sofa()
+    part_gltf['images'] = [{'uri': 'wood.png'}]
+    with pytest.raises(ValueError, match='textures'):
+        splice_mesh(gltf, blob, (part_gltf, part_binary), 'sofa')
+
+
+def test_item_counts_count_distinct_positions():
+    split = SOFA + SOFA[:2]
+    part = mesh_gltf(split, [0, 1, 2, 4, 2, 3, 5, 0, 3], name='Sofa', material='Fabric')
+    assert item_counts(part) == ('Sofa', 4, 3, {'Fabric'})
+
+
+def test_shared_buffer_is_content_hashed(tmp_path):
+    path = shared_buffer(b'abcd', 'sofa', tmp_path)
+    assert shared_buffer(b'abcd', 'sofa', tmp_path) == path
+    assert shared_buffer(b'efgh', 'sofa', tmp_path) != path
+    assert open(path, 'rb').read() == b'abcd'
+    assert sorted(p.name.split('-')[2] for p in tmp_path.iterdir()) == ['sofa', 'sofa']
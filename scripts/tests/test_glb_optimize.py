@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+from conftest import mesh_gltf
+from glb_optimize import (cache_miss_ratio, compact, fetch_order, optimize, optimize_glb, read_accessor, tipsify,
+                          weld)
+from glb_tools import glb_triangles, read_glb, write_glb
+
+
+def grid(n):
+    """n x n quads as unindexed triangles: every corner is its own vertex"""
+    corners = []
+    for i in range(n):
+        for j in range(n):
+            a, b, c, d = (i, j, 0), (i + 1, j, 0), (i + 1, j + 1, 0), (i, j + 1, 0)
+            corners.extend([a, b, c, a, c, d])
+    return np.array(corners, dtype=np.float32)
+
+
+def triangles(positions, indices):
+    """Triangles as position tuples, rotated to start at the smallest corner so winding still counts"""
+    result = []
+    for tri in np.asarray(indices).reshape(-1, 3):
+        corners = [tuple(positions[i].tolist()) for i in tri]
+        start = corners.index(min(corners))
+        result.append(tuple(corners[start:] + corners[:start]))
+    return sorted(result)
+
+
+def primitive_triangles(gltf, binary, primitive):
+    positions = read_accessor(gltf, binary, primitive['attributes']['POSITION'])
+    if 'indices' not in primitive:
+        return triangles(positions, np.arange(len(positions)))
+    return triangles(positions, read_accessor(gltf, binary, primitive['indices']).reshape(-1))
+
+
+def test_optimize_welds_and_reorders_without_changing_the_triangles():
+    gltf, binary = mesh_gltf(grid(8))
+    before = primitive_triangles(gltf, binary, gltf['meshes'][0]['primitives'][0])
+    gltf, binary, stats = optimize(gltf, binary)
+    primitive = gltf['meshes'][0]['primitives'][0]
+    assert primitive_triangles(gltf, binary, primitive) == before
+    assert stats['vertices'] == [8 * 8 * 6, 9 * 9]
+    assert stats['triangles'] == [128, 128]
+    assert stats['acmr'][1] < stats['acmr'][0] == 3.0
+    # Only the new accessors survive compaction, and the buffer matches the BIN data
+    assert len(gltf['accessors']) == 2 and len(gltf['bufferViews']) == 2
+    assert gltf['buffers'][0]['byteLength'] == len(binary)
+
+
+def test_weld_drops_triangles_that_collapse():
+    positions = np.array([(0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 0, 0), (1, 0, 0), (0, 0, 0)], dtype=np.float32)
+    attributes, indices = weld({'POSITION': positions}, np.arange(6))
+    assert len(attributes['POSITION']) == 3
+    assert len(indices) == 3
+
+
+def test_weld_keeps_vertices_apart_where_normals_differ():
+    positions = np.zeros((6, 3), dtype=np.float32)
+    positions[[1, 4], 0] = 1
+    positions[[2, 5], 1] = 1
+    normals = np.array([(0, 0, 1)] * 3 + [(0, 0, -1)] * 3, dtype=np.float32)
+    attributes, indices = weld({'POSITION': positions, 'NORMAL': normals}, np.arange(6))
+    assert len(attributes['POSITION']) == 6 and len(indices) == 6
+
+
+def test_tipsify_and_fetch_order_keep_every_triangle():
+    rng = np.random.default_rng(7)
+    positions = rng.random((200, 3))
+    indices = rng.integers(0, 200, size=(600, 3))
+    indices = indices[(indices[:, 0] != indices[:, 1]) & (indices[:, 1] != indices[:, 2])
+                      & (indices[:, 2] != indices[:, 0])].reshape(-1)
+    ordered = tipsify(indices, 200)
+    assert triangles(positions, ordered) == triangles(positions, indices)
+    attributes, renumbered = fetch_order({'POSITION': positions}, ordered)
+    assert triangles(attributes['POSITION'], renumbered) == triangles(positions, indices)
+    # First use order: each new vertex is the next number
+    _, first = np.unique(renumbered, return_index=True)
+    assert renumbered[np.sort(first)].tolist() == list(range(len(first)))
+
+
+def test_cache_miss_ratio():
+    assert cache_miss_ratio(np.arange(9)) == 3.0
+    assert cache_miss_ratio(np.array([0, 1, 2, 2, 1, 3])) == 2.0
+    assert cache_miss_ratio(np.array([], dtype=np.int64)) == 0.0
+
+
+def test_compact_drops_unreferenced_data():
+    gltf, binary = mesh_gltf(grid(1), [0, 1, 2, 3, 4, 5])
+    del gltf['meshes'][0]['primitives'][0]['indices']
+    binary = compact(gltf, binary)
+    assert len(gltf['accessors']) == 1 and len(gltf['bufferViews']) == 1
+    assert len(binary) == gltf['buffers'][0]['byteLength'] == 6 * 12
+
+
+def test_compact_keeps_buffer_views_named_by_extensions():
+    gltf, binary = mesh_gltf(grid(1), [0, 1, 2, 3, 4, 5])
+    primitive = gltf['meshes'][0]['primitives'][0]
+    del primitive['indices']
+    primitive['extensions'] = {'KHR_draco_mesh_compression': {'bufferView': 1, 'attributes': {'POSITION': 0}}}
+    binary = compact(gltf, binary)
+    assert len(gltf['bufferViews']) == 2
+    view = gltf['bufferViews'][primitive['extensions']['KHR_draco_mesh_compression']['bufferView']]
+    data = binary[view['byteOffset']:view['byteOffset'] + view['byteLength']]
+    assert np.frombuffer(data, dtype=np.uint16).tolist() == [0, 1, 2, 3, 4, 5]
+
+
+def test_compact_never_leaves_empty_arrays_or_buffers():
+    gltf, binary = mesh_gltf(grid(1))
+    gltf['meshes'] = []
+    gltf['nodes'] = []
+    assert compact(gltf, binary) == b''
+    assert not {'accessors', 'bufferViews', 'buffers'} & set(gltf)
+
+
+def test_optimize_refuses_what_it_cannot_rewrite():
+    gltf, binary = mesh_gltf(grid(1))
+    gltf['extensionsUsed'] = ['EXT_meshopt_compression']
+    with pytest.raises(ValueError, match='EXT_meshopt_compression'):
+        optimize(gltf, binary)
+    gltf, binary = mesh_gltf(grid(1))
+    gltf['buffers'].append({'uri': 'extra.bin', 'byteLength': 4})
+    with pytest.raises(ValueError, match='single-buffer'):
+        optimize(gltf, binary)
+
+
+def test_optimize_glb_file_round_trip(tmp_path):
+    path = tmp_path / 'grid.glb'
+    write_glb(path, *mesh_gltf(grid(4), name='grid'))
+    stats = optimize_glb(path)
+    gltf, binary = read_glb(path)
+    assert glb_triangles(gltf) == 32
+    assert stats['bytes'][1] == path.stat().st_size < stats['bytes'][0]
+    assert primitive_triangles(gltf, binary, gltf['meshes'][0]['primitives'][0]) == triangles(
+        grid(4), np.arange(len(grid(4))))
@@ -0,0 +1,45 @@
+import pytest
+
+from conftest import mesh_gltf
+from glb_tools import build_glb, glb_stats, glb_triangles, parse_glb, write_glb
+
+QUAD = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
+
+
+def test_glb_round_trip():
+    gltf, binary = mesh_gltf(QUAD, [0, 1, 2, 0, 2, 3])
+    data = build_glb(gltf, binary)
+    assert len(data) % 4 == 0
+    parsed, parsed_binary = parse_glb(data)
+    assert parsed == gltf
+    # The BIN chunk is padded to four bytes
+    assert parsed_binary[:len(binary)] == binary and len(parsed_binary) % 4 == 0
+
+
+def test_json_only_glb_has_no_bin_chunk():
+    gltf, binary = parse_glb(build_glb({'asset': {'version': '2.0'}}, b''))
+    assert gltf == {'asset': {'version': '2.0'}} and binary == b''
+
+
+def test_not_a_glb():
+    with pytest.raises(ValueError):
+        parse_glb(b'\0' * 20)
+
+
+def test_triangles_count_every_node_using_a_mesh():
+    gltf, _ = mesh_gltf(QUAD, [0, 1, 2, 0, 2, 3])
+    assert glb_triangles(gltf) == 2
+    gltf['nodes'].append({'mesh': 0, 'children': [2]})
+    gltf['nodes'].append({'mesh': 0})
+    gltf['scenes'][0]['nodes'].append(1)
+    assert glb_triangles(gltf) == 6
+
+
+def test_stats_split_bytes_by_usage(tmp_path):
+    gltf, binary = mesh_gltf(QUAD, [0, 1, 2, 0, 2, 3])
+    path = tmp_path / 'quad.glb'
+    write_glb(path, gltf, binary)
+    stats = glb_stats(path)
+    assert stats['total_bytes'] == path.stat().st_size
+    assert stats['by_usage'] == {'POSITION': 48, 'indices': 12}
+    assert stats['triangles'] == 2 and stats['external_bytes'] == 0
@@ -0,0 +1,68 @@
+import numpy as np
+
+from conftest import room
+from house_layout import (MM, WELD_MM, blueprint_key, load_rooms, plan_room_walls, snap_blueprint, to_mm,
+                          weld_edges)
+
+
+def test_to_mm_rounds_to_whole_millimetres():
+    assert to_mm(3.0004) == 3000
+    assert to_mm(3.0006) == 3001
+    assert to_mm('2.5') == 2500
+
+
+def test_weld_edges_snaps_close_values_to_the_most_common():
+    welded = weld_edges([4000, 4000, 4020, 9000])
+    assert welded.tolist() == [4000, 4000, 4000, 9000]
+
+
+def test_weld_edges_leaves_values_further_apart_than_the_weld():
+    values = [0, WELD_MM + 1, 2 * WELD_MM + 2]
+    assert weld_edges(values).tolist() == values
+
+
+def test_snap_blueprint_welds_nearly_touching_rooms():
+    data = {'rooms': [room('a', 0, 0, 4.02, 3), room('b', 4.0, 0, 3, 3), room('c', 7.0, 0.0004, 2, 3)]}
+    a, b, c = snap_blueprint(data)['rooms']
+    assert a['position']['x'] + a['width'] == b['position']['x'] == 4.0
+    assert c['position']['y'] == 0.0
+    # The input is left alone
+    assert data['rooms'][0]['width'] == 4.02
+
+
+def test_snap_blueprint_snaps_opening_centres_to_millimetres():
+    data = {'rooms': [room('a', 0, 0, 3, 3, doors=[{'wall': 'front', 'position': 0.33333, 'width': 0.9004}])]}
+    door = snap_blueprint(data)['rooms'][0]['doors'][0]
+    assert door['width'] == 0.9
+    assert round(door['position'] * 3000, 6) == 1000
+
+
+def test_blueprint_key_ignores_names_and_sub_millimetre_noise():
+    plain = {'rooms': [room('a', 0, 0, 4, 3)]}
+    noisy = {'meta': {'source': 'scan'}, 'rooms': [room('a', 0.0002, 0, 4.0001, 3, name='Salon')]}
+    moved = {'rooms': [room('a', 0.01, 0, 4, 3)]}
+    assert blueprint_key(plain) == blueprint_key(noisy)
+    assert blueprint_key(plain) != blueprint_key(moved)
+    assert blueprint_key(plain, tier='high') != blueprint_key(plain, tier='shell')
+
+
+def test_shared_wall_is_planned_once_and_interior():
+    rooms = load_rooms({'rooms': [room('a', 0, 0, 4, 3), room('b', 4, 0, 3, 3)]})
+    created = set()
+    a_walls = plan_room_walls(rooms[0], rooms, created)
+    b_walls = plan_room_walls(rooms[1], rooms, created)
+    assert len(a_walls) == 4 and len(b_walls) == 3
+    shared = next(w for w in a_walls if w['side'] == 'right')
+    assert shared['interior'] and shared['mm'] == (4000, 0, 4000, 3000)
+    assert 'left' not in {w['side'] for w in b_walls}
+
+
+def test_outdoor_rooms_plan_no_walls():
+    rooms = load_rooms({'rooms': [room('deck', 0, 0, 4, 3, type='deck')]})
+    assert plan_room_walls(rooms[0], rooms, set()) == []
+
+
+def test_room_attributes_are_metres_of_the_millimetre_geometry():
+    (r,) = load_rooms({'rooms': [room('a', 1.25, 2.5, 4.2, 3.7)]})
+    assert (r.x_mm, r.y_mm, r.x2_mm, r.y2_mm) == (1250, 2500, 5450, 6200)
+    assert np.isclose(r.x2, 5450 / MM) and r.center == (3.35, 4.35)
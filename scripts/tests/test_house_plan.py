@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+import house_plan
+import wall_shell
+from house_layout import load_rooms
+
+
+def test_tiers_get_more_expensive(house):
+    plans = house_plan.plan_tiers(house)
+    triangles = [plans[tier]['triangles'] for tier in ('shell', 'basic', 'detailed', 'high')]
+    assert triangles == sorted(triangles)
+    assert plans['shell']['furniture'] == 0 < plans['high']['furniture']
+
+
+def test_structure_includes_the_same_wall_shell_the_builder_makes(house):
+    rooms = load_rooms(house)
+    walls = [w for ws in wall_shell.plan_walls(rooms).values() for w in ws]
+    shell = wall_shell.build_shell(walls, rooms)
+    plan = house_plan.plan_house(house, detail=house_plan.tier_detail('shell'))
+    assert plan['by_category']['structure']['triangles'] >= shell['triangles']
+
+
+def test_no_ceilings_saves_triangles(house):
+    assert house_plan.plan_house(house, skip_ceilings=True)['triangles'] < house_plan.plan_house(house)['triangles']
+
+
+def test_unknown_tier():
+    with pytest.raises(ValueError):
+        house_plan.tier_detail('ultra')
+
+
+def test_least_squares_recovers_an_exact_model():
+    rows = [[1.0, x, y] for x, y in ((1, 2), (3, 1), (4, 7), (10, 3), (6, 6))]
+    targets = [5 + 2 * x - 0.5 * y for _, x, y in rows]
+    assert house_plan.least_squares(rows, targets) == pytest.approx([5, 2, -0.5])
+
+
+def test_least_squares_needs_varied_reports():
+    with pytest.raises(ValueError):
+        house_plan.least_squares([[1.0, 2.0]] * 3, [1, 1, 1])
+
+
+def write_reports(tmp_path, base=10000, per_object=1500, per_triangle=13):
+    paths = []
+    for n, (meshes, triangles) in enumerate(((20, 500), (60, 3000), (110, 5500), (200, 9000))):
+        report = {'stats': {'totals': {'meshes': meshes, 'triangles': triangles},
+                            'glb': {'total_bytes': base + per_object * meshes + per_triangle * triangles}},
+                  'phases': [{'phase': 'rooms', 'seconds': 0.1 + 0.001 * meshes}]}
+        path = tmp_path / f'r{n}.json'
+        path.write_text(json.dumps(report))
+        paths.append(str(path))
+    return paths
+
+
+def test_calibrate_fits_the_reports(tmp_path):
+    coefficients = house_plan.calibrate(write_reports(tmp_path))
+    assert coefficients['glb_bytes'] == pytest.approx({'base': 10000, 'per_object': 1500, 'per_triangle': 13})
+    assert coefficients['calibrated_from'] == 4
+    assert all(ok for *_, ok in house_plan.check_estimates(write_reports(tmp_path), coefficients))
+
+
+def test_check_estimates_flags_estimates_out_of_tolerance(tmp_path):
+    coefficients = house_plan.calibrate(write_reports(tmp_path))
+    # Files twice as large as the fit predicts
+    results = house_plan.check_estimates(write_reports(tmp_path, 2 * 10000, 2 * 1500, 2 * 13), coefficients)
+    assert not any(ok for *_, ok in results)
+
+
+def test_shipped_coefficients_estimate_the_high_tier_close_to_a_real_build(house):
+    # High-tier build of the test blueprint: 254324 bytes when the coefficients were fitted
+    estimate = house_plan.plan_house(house)['est_glb_bytes']
+    assert abs(estimate - 254324) <= house_plan.GLB_BYTES_TOLERANCE * 254324
@@ -0,0 +1,27 @@
+import numpy as np
+
+from plants import LEAVES, PLANT_TRIANGLES, PLANT_VARIANTS, PLANT_VERTICES, POT, plant_geometry, variant_at
+
+
+def test_counts_match_the_geometry():
+    for variant in range(PLANT_VARIANTS):
+        verts, loops, face_sizes, face_materials = plant_geometry(variant)
+        assert len(verts) == PLANT_VERTICES
+        assert int((face_sizes - 2).sum()) == PLANT_TRIANGLES
+        assert len(loops) == face_sizes.sum() and loops.max() < len(verts)
+        assert set(face_materials.tolist()) == {POT, LEAVES}
+
+
+def test_variants_are_reproducible_and_distinct():
+    assert np.array_equal(plant_geometry(1)[0], plant_geometry(1)[0])
+    assert not np.array_equal(plant_geometry(1)[0], plant_geometry(2)[0])
+
+
+def test_plant_stands_on_the_floor_at_unit_height():
+    verts = plant_geometry(0)[0]
+    assert verts[:, 2].min() == 0 and 0.9 < verts[:, 2].max() < 1.1
+
+
+def test_variant_depends_only_on_position():
+    assert variant_at(1.5, 2.25) == variant_at(1.5, 2.25)
+    assert {variant_at(x / 10, 0) for x in range(40)} == set(range(PLANT_VARIANTS))
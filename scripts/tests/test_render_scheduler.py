@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from render_scheduler import CostModel, RenderJob, RenderScheduler, feature_vector, job_features
+
+
+def job(job_id, rooms, furniture=0, lane='interactive', submitted=0.0, kind='glb'):
+    return RenderJob(job_id, kind, {'rooms': rooms, 'furniture': furniture}, lane=lane, submitted=submitted)
+
+
+def test_rls_converges_to_the_true_cost_model():
+    true_weights = [1.5, 0.9, 0.12, 0.0]
+    model = CostModel(forgetting=1.0)
+    rng = random.Random(7)
+    for n in range(200):
+        j = job(f'j{n}', rng.randint(1, 20), rng.randint(0, 40))
+        model.observe(j, sum(w * x for w, x in zip(true_weights, feature_vector(j.features))))
+    assert model.weights['glb'][:3] == pytest.approx(true_weights[:3], abs=0.01)
+    assert model.predict(job('x', 10, 10)) == pytest.approx(1.5 + 9 + 1.2, abs=0.01)
+
+
+def test_forgetting_tracks_a_changed_machine():
+    model = CostModel(forgetting=0.9)
+    for n in range(100):
+        model.observe(job(f'a{n}', 1 + n % 10), 2.0 * (1 + n % 10))
+    for n in range(100):
+        model.observe(job(f'b{n}', 1 + n % 10), 4.0 * (1 + n % 10))
+    assert model.predict(job('x', 5)) == pytest.approx(20, rel=0.05)
+
+
+def test_model_round_trips_through_json(tmp_path):
+    model = CostModel()
+    model.observe(job('a', 4, 3), 9.0)
+    model.save(tmp_path / 'model.json')
+    loaded = CostModel.load(tmp_path / 'model.json')
+    assert loaded.weights == model.weights and loaded.observations == {'glb': 1, 'image': 0}
+    assert CostModel.load(tmp_path / 'missing.json').weights == CostModel().weights
+
+
+def test_cheapest_job_runs_first():
+    scheduler = RenderScheduler(aging=0.0)
+    for j in (job('big', 20), job('small', 2), job('medium', 8)):
+        scheduler.submit(j)
+    assert [scheduler.next_job(now=0).id for _ in range(3)] == ['small', 'medium', 'big']
+    assert scheduler.next_job(now=0) is None
+
+
+def test_waiting_jobs_overtake_cheaper_ones():
+    scheduler = RenderScheduler(aging=0.5)
+    scheduler.submit(job('old', 20, submitted=0.0))
+    scheduler.submit(job('new', 2, submitted=100.0))
+    assert scheduler.next_job(now=100.0).id == 'old'
+
+
+def test_idle_lanes_steal_work():
+    scheduler = RenderScheduler()
+    scheduler.submit(job('b', 3, lane='batch'))
+    assert scheduler.next_job('interactive', now=0, steal=False) is None
+    assert scheduler.next_job('interactive', now=0).id == 'b'
+
+
+def test_cancel_and_complete():
+    scheduler = RenderScheduler()
+    scheduler.submit(job('a', 3))
+    scheduler.submit(job('b', 4))
+    assert scheduler.cancel('a').id == 'a' and scheduler.cancel('a') is None
+    running = scheduler.next_job(now=10.0)
+    assert scheduler.complete(running, now=13.0) == 3.0
+    assert scheduler.model.observations['glb'] == 1
+
+
+def test_unknown_lane():
+    with pytest.raises(ValueError):
+        job('a', 1, lane='urgent')
+
+
+def test_job_features_come_from_the_planner(house):
+    features = job_features(house, kind='image', samples=64, resolution=(1280, 720))
+    assert features['rooms'] == len(house['rooms'])
+    assert features['furniture'] > 0 and features['pixels'] == 1280 * 720
+    assert job_features(house)['samples'] == 0
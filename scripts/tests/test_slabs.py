@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from conftest import room
+from house_layout import load_rooms
+from slabs import FLOOR_TOP_MM, SLAB_THICKNESS, ceiling_slab, extend_through_slabs, floor_slabs
+
+BOX = [1.0, 2.0, 0.02, 3.0, 4.0, 0.02]
+
+
+def test_slab_thickness_is_two_centimetres():
+    assert SLAB_THICKNESS == pytest.approx(0.02)
+
+
+def test_floors_extend_down_and_ceilings_up_by_the_slab():
+    extended = extend_through_slabs([BOX, BOX, BOX], [1, -1, 0])
+    assert extended[0] == pytest.approx([1.0, 2.0, 0.0, 3.0, 4.0, 0.02])
+    assert extended[1] == pytest.approx([1.0, 2.0, 0.02, 3.0, 4.0, 0.04])
+    assert extended[2] == pytest.approx(BOX)
+
+
+def test_input_bounds_are_left_alone():
+    bounds = np.array([BOX])
+    extend_through_slabs(bounds, [1])
+    assert bounds[0] == pytest.approx(BOX)
+
+
+def test_adjacent_floors_share_their_edge_vertices():
+    rooms = load_rooms({'rooms': [room('a', 0, 0, 4, 3), room('b', 4, 0, 3, 3)]})
+    (slab,) = floor_slabs(rooms).values()
+    # Two quads; b's left edge welds onto a's right edge
+    assert slab['face_sizes'].tolist() == [4, 4]
+    assert len(slab['vertices']) == 6
+    assert np.allclose(slab['vertices'][:, 2], FLOOR_TOP_MM / 1000)
+    assert slab['face_rooms'] == ['a', 'b']
+
+
+def test_floors_are_grouped_by_material_and_decks_have_none():
+    rooms = load_rooms({'rooms': [room('a', 0, 0, 4, 3), room('bath', 4, 0, 2, 3, type='bathroom'),
+                                  room('deck', 0, 3, 6, 2, type='deck')]})
+    slabs = floor_slabs(rooms)
+    assert sorted(slabs) == ['TileWhite', 'WoodFloor']
+    assert slabs['WoodFloor']['face_rooms'] == ['a']
+
+
+def test_ceiling_faces_down_at_each_room_height():
+    rooms = load_rooms({'rooms': [room('a', 0, 0, 4, 3), room('b', 4, 0, 3, 3, height=3.0)]})
+    slab = ceiling_slab(rooms)
+    assert slab['triangles'] == 4
+    assert np.unique(slab['vertices'][:, 2]) == pytest.approx([2.78, 2.98])
+    # Corners run clockwise seen from above, so the face normal points down
+    first = slab['vertices'][slab['loops'][:3]]
+    assert np.cross(first[1] - first[0], first[2] - first[1])[2] < 0
+
+
+def test_no_ceilings_when_skipped_or_outdoor():
+    assert ceiling_slab(load_rooms({'rooms': [room('a', 0, 0, 4, 3)]}), skip_ceilings=True) is None
+    assert ceiling_slab(load_rooms({'rooms': [room('deck', 0, 0, 4, 3, type='deck')]})) is None
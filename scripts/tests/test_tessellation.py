@@ -0,0 +1,34 @@
+import math
+
+import pytest
+
+from tessellation import MAX_SEGMENTS, MIN_SEGMENTS, circle_segments, parse_scale, sphere_segments, tolerance
+
+
+def test_docstring_examples():
+    assert circle_segments(0.02) == 6
+    assert circle_segments(1.2) == 43
+    assert sphere_segments(0.28) == (21, 11)
+
+
+def test_segment_count_keeps_the_silhouette_error_within_tolerance():
+    for radius in (0.05, 0.2, 0.5, 1.0):
+        n = circle_segments(radius)
+        assert radius * (1 - math.cos(math.pi / n)) <= tolerance()
+        if n > MIN_SEGMENTS:
+            assert radius * (1 - math.cos(math.pi / (n - 1))) > tolerance()
+
+
+def test_segments_grow_with_radius_and_detail_within_bounds():
+    counts = [circle_segments(r) for r in (0.01, 0.1, 0.5, 1.0, 10.0)]
+    assert counts == sorted(counts)
+    assert counts[0] == MIN_SEGMENTS and counts[-1] == MAX_SEGMENTS
+    assert circle_segments(0.5, scale=0.5) < circle_segments(0.5) < circle_segments(0.5, scale=2)
+
+
+def test_parse_scale():
+    assert parse_scale(None) == 1.0
+    assert parse_scale('0.5') == 0.5
+    for bad in ('abc', '0', '-1', 'nan'):
+        with pytest.raises(ValueError):
+            parse_scale(bad)
@@ -0,0 +1,104 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import wall_shell
+from conftest import room
+from house_layout import load_rooms
+
+
+def directed_edges(shell):
+    loops = shell['loops'].tolist()
+    edges = []
+    start = 0
+    for size in shell['face_sizes'].tolist():
+        ring = loops[start:start + size]
+        edges.extend(zip(ring, ring[1:] + ring[:1]))
+        start += size
+    return edges
+
+
+def assert_watertight(shell):
+    edges = directed_edges(shell)
+    # Each edge is used once in each direction: closed, no T-junctions, faces consistently wound
+    unique = set(edges)
+    assert len(unique) == len(edges)
+    assert all((b, a) in unique for a, b in edges)
+
+
+def shell_of(data, frames=False):
+    rooms = load_rooms(data)
+    walls = [w for ws in wall_shell.plan_walls(rooms).values() for w in ws]
+    return wall_shell.build_shell(walls, rooms, frames=frames)
+
+
+TWO_ROOMS = {'rooms': [
+    room('a', 0, 0, 4, 3, doors=[{'wall': 'right', 'position': 0.5, 'width': 0.9, 'height': 2.1}],
+         windows=[{'wall': 'front', 'position': 0.5, 'width': 1.2, 'height': 1.2, 'bottom': 0.9}]),
+    room('b', 4, 0, 3, 3, doors=[{'wall': 'back', 'position': 0.5, 'width': 1.8, 'height': 2.1,
+                                  'type': 'sliding_glass'}]),
+]}
+
+
+@pytest.mark.parametrize('frames', [False, True])
+def test_two_room_shell_is_watertight(frames):
+    assert_watertight(shell_of(TWO_ROOMS, frames))
+
+
+@pytest.mark.parametrize('frames', [False, True])
+def test_test_house_shell_is_watertight(house, frames):
+    assert_watertight(shell_of(house, frames))
+
+
+def test_shell_triangle_count_matches_its_faces():
+    shell = shell_of(TWO_ROOMS)
+    assert shell['triangles'] == int((shell['face_sizes'] - 2).sum())
+    assert len(shell['face_materials']) == len(shell['face_sizes'])
+
+
+def test_faces_into_outdoor_air_get_the_exterior_material():
+    shell = shell_of({'rooms': [room('a', 0, 0, 4, 3)]})
+    materials = set(shell['face_materials'].tolist())
+    assert materials == {wall_shell.INTERIOR, wall_shell.EXTERIOR}
+
+
+def test_no_walls_no_shell():
+    assert shell_of({'rooms': [room('deck', 0, 0, 4, 3, type='deck')]}) is None
+
+
+def test_shell_spans_the_walls_and_room_height():
+    vertices = shell_of({'rooms': [room('a', 0, 0, 4, 3)]})['vertices']
+    half = wall_shell.WALL_THICKNESS_MM / 2000
+    assert np.allclose(vertices.min(axis=0), (-half, -half, 0))
+    assert np.allclose(vertices.max(axis=0), (4 + half, 3 + half, 2.8))
+
+
+def test_weld_polygons_splits_edges_at_neighbouring_corners():
+    # One tall square beside two short ones: its right edge gets their shared corner
+    big = [(0, 0, 0), (2, 0, 0), (2, 2, 0), (0, 2, 0)]
+    low = [(2, 0, 0), (3, 0, 0), (3, 1, 0), (2, 1, 0)]
+    high = [(2, 1, 0), (3, 1, 0), (3, 2, 0), (2, 2, 0)]
+    points, loops, face_sizes = wall_shell.weld_polygons([big, low, high])
+    assert face_sizes.tolist() == [5, 4, 4]
+    assert len(points) == 8
+    edges = directed_edges({'loops': loops, 'face_sizes': face_sizes})
+    uses = Counter(tuple(sorted(edge)) for edge in edges)
+    # The three inner edges are shared (in opposite directions), the seven outline edges are not
+    assert sorted(Counter(uses.values()).items()) == [(1, 7), (2, 3)]
+    assert len(set(edges)) == len(edges)
+
+
+def test_opening_cut_keeps_clear_of_the_wall_ends():
+    wall = {'length_mm': 2000, 'window': None, 'door': {'position': 0.0, 'width': 0.9, 'height': 2.1}}
+    start, end, bottom, top = wall_shell.opening_cut(wall, 2800)
+    assert start == wall_shell.OPENING_END_MARGIN_MM and bottom == 0 and top == 2100
+
+
+def test_baseboards_stop_at_doors():
+    rooms = load_rooms(TWO_ROOMS)
+    walls = [w for ws in wall_shell.plan_walls(rooms).values() for w in ws]
+    boards = wall_shell.baseboard_boxes(rooms[0], walls)
+    # Right wall of room a is split around the door to b
+    right = boards[boards[:, 0] == boards[:, 0].max()]
+    assert len(right) == 2
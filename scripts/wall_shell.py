@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+All walls of a house as one watertight mesh with no overlapping volumes.
+
+The builders used to make each wall a separate 12 cm box of the full room
+edge length. Boxes overlapped at corners and T-junctions and left hidden
+faces inside each other. Here the walls planned by house_layout are unioned
+instead:
+
+1. Each wall is a box around its centre line, extended by half the
+   thickness at both ends so corners close. Door and window openings are
+   boxes cut out of it.
+2. All box edges are collected into a compressed grid (integer millimetres,
+   see house_layout). Each grid cell is either wall or air, so the union
+   has no overlapping volume and corners come out as one shared
+   (square-mitred) block.
+3. Only faces between wall and air are emitted. Coplanar faces of the same
+   material merge into maximal rectangles. Vertices of neighbouring
+   rectangles that fall on an edge are added to it, so every edge is
+   shared by exactly two faces: no cracks and no T-junctions.
+
+Faces facing into indoor rooms get the interior material; faces facing
+outdoors or outdoor rooms get the exterior material.
+
+Door and window frames can be part of the union as well (build_shell
+frames=True): they are extra solid boxes inside the openings whose faces
+get frame materials, so a house's frames cost no objects. The builder only
+adds the glass panes and door leaves that opening_assembly describes.
+
+Plain Python + NumPy - no bpy. The builder turns the arrays into a mesh,
+and the planner counts the same triangles.
+"""
+
+import numpy as np
+
+from house_layout import MM, MIN_WALL_MM, is_outdoor, plan_room_walls, room_bounds_mm, to_mm
+
+WALL_THICKNESS_MM = 120
+
+# Openings stay this far from the wall ends, and below the room top
+# (blueprint_check validates against the same limits)
+OPENING_END_MARGIN_MM = 50
+DOOR_HEAD_MARGIN_MM = 100
+WINDOW_HEAD_MARGIN_MM = 50
+
+INTERIOR, EXTERIOR = 0, 1
+
+# ============= WALL BOXES =============
+
+def plan_walls(rooms):
+    """Walls of every room, {room id: [planned walls with the room's height_mm]}.
+
+    Shared walls are planned once, by the first room that has them.
+    """
+    created_walls = set()
+    return {room.id: [dict(wall, height_mm=room.height_mm) for wall in plan_room_walls(room, rooms, created_walls)]
+            for room in rooms}
+
+
+def opening_cut(wall, height_mm):
+    """(start, end, bottom, top) of the opening cut into a planned wall, millimetres along it"""
+    length = wall['length_mm']
+    if wall['window']:
+        window = wall['window']
+        center = window.get('position', 0.5) * length
+        half = to_mm(window.get('width', 1.2)) / 2
+        bottom_raw = to_mm(window.get('bottom', 0.9))
+        bottom = max(OPENING_END_MARGIN_MM, bottom_raw)
+        top = min(bottom_raw + to_mm(window.get('height', 1.4)), height_mm - WINDOW_HEAD_MARGIN_MM)
+    elif wall['door']:
+        door = wall['door']
+        center = door.get('position', 0.5) * length
+        half = to_mm(door.get('width', 0.9)) / 2
+        bottom = 0
+        top = min(to_mm(door.get('height', 2.1)), height_mm - DOOR_HEAD_MARGIN_MM)
+    else:
+        return None
+    start = max(OPENING_END_MARGIN_MM, round(center - half))
+    end = min(length - OPENING_END_MARGIN_MM, round(center + half))
+    if end <= start or top <= bottom:
+        return None
+    return (start, end, round(bottom), round(top))
+
+def opening_span(wall):
+    """(lo, hi, bottom, top) of a planned wall's opening: lo/hi along the wall's axis in world millimetres"""
+    cut = opening_cut(wall, wall['height_mm'])
+    if not cut:
+        return None
+    start, end, bottom, top = cut
+    # Along-wall distances run from the wall's first coordinate
+    x1, y1, x2, y2 = wall['mm']
+    a0, a1 = (x1, x2) if y1 == y2 else (y1, y2)
+    lo, hi = (a0 + start, a0 + end) if a1 >= a0 else (a0 - end, a0 - start)
+    return (lo, hi, bottom, top)
+
+def opening_box(wall, thickness_mm=WALL_THICKNESS_MM):
+    """(x0, y0, z0, x1, y1, z1) millimetres cut out of a planned wall for its opening, or None"""
+    span = opening_span(wall)
+    if not span:
+        return None
+    lo, hi, bottom, top = span
+    half = thickness_mm // 2
+    x1, y1, x2, y2 = wall['mm']
+    horizontal = y1 == y2
+    # Keep the corner blocks of crossing walls intact
+    a0, a1 = sorted((x1, x2) if horizontal else (y1, y2))
+    lo, hi = max(lo, a0 + half), min(hi, a1 - half)
+    if hi <= lo:
+        return None
+    if horizontal:
+        return (lo, y1 - half, bottom, hi, y1 + half, top)
+    return (x1 - half, lo, bottom, x1 + half, hi, top)
+
+def wall_boxes(walls, thickness_mm=WALL_THICKNESS_MM):
+    """Solid and cut-out boxes, (N, 6) int arrays of x0, y0, z0, x1, y1, z1 in millimetres.
+
+    walls: planned walls (see plan_walls).
+    """
+    half = thickness_mm // 2
+    solids, cuts = [], []
+    for wall in walls:
+        if wall['length_mm'] < MIN_WALL_MM:
+            continue
+        wx1, wy1, wx2, wy2 = wall['mm']
+        x0, x1 = sorted((wx1, wx2))
+        y0, y1 = sorted((wy1, wy2))
+        height = wall['height_mm']
+        horizontal = y0 == y1
+        if horizontal:
+            solids.append((x0 - half, y0 - half, 0, x1 + half, y0 + half, height))
+        else:
+            solids.append((x0 - half, y0 - half, 0, x0 + half, y1 + half, height))
+
+        cut = opening_box(wall, thickness_mm)
+        if cut:
+            cuts.append(cut)
+    return (np.array(solids, dtype=np.int64).reshape(-1, 6),
+            np.array(cuts, dtype=np.int64).reshape(-1, 6))
+
+# ============= OPENING ASSEMBLIES =============
+
+# Door and window frames are extra solid of the shell, with their own
+# material slots after INTERIOR and EXTERIOR. Only the glass panes and
+# door leaves stay separate objects.
+DOOR_FRAME, SLIDING_FRAME, WINDOW_FRAME = 2, 3, 4
+
+# Frame member (width, depth) per frame material, millimetres
+FRAME_SIZES = {DOOR_FRAME: (60, 100), SLIDING_FRAME: (40, 40), WINDOW_FRAME: (50, 80)}
+
+# Window sill under the side frames; deeper than the wall so it shows on both faces
+SILL_HEIGHT_MM = 50
+SILL_DEPTH_MM = 160
+
+# Glass runs this far into the frame; door leaves keep this gap to it
+GLASS_REBATE_MM = 10
+GLASS_THICKNESS_MM = 10
+LEAF_GAP_MM = 10
+
+# The two panes of a sliding door overlap by this much on parallel tracks
+SLIDING_OVERLAP_MM = 50
+
+def opening_kind(wall):
+    """'window', 'sliding' or 'hinged' for a planned wall with an opening, else None"""
+    if wall['window']:
+        return 'window'
+    if wall['door']:
+        return 'sliding' if wall['door'].get('type', 'standard') == 'sliding_glass' else 'hinged'
+    return None
+
+def _across(wall, u0, u1, v0, v1, z0, z1):
+    """World box from along-wall (u), across-wall (v, from the centre line) and height ranges"""
+    x1, y1, x2, y2 = wall['mm']
+    if y1 == y2:
+        return (u0, y1 + v0, z0, u1, y1 + v1, z1)
+    return (x1 + v0, u0, z0, x1 + v1, u1, z1)
+
+def opening_assembly(wall, thickness_mm=WALL_THICKNESS_MM):
+    """Frame and fill of a planned wall's opening, or None.
+
+    Returns {'kind', 'material' (frame slot), 'frames', 'glass', 'leaf'}.
+    frames and glass are lists of (x0, y0, z0, x1, y1, z1) millimetres.
+    leaf is None, or for hinged doors {'hinge' (x, y), 'direction' (unit
+    (dx, dy) along the wall), 'width', 'bottom', 'top'}: the closed leaf
+    runs from the hinge along direction.
+    """
+    kind = opening_kind(wall)
+    cut = kind and wall['length_mm'] >= MIN_WALL_MM and opening_box(wall, thickness_mm)
+    if not cut:
+        return None
+    x1, y1, x2, y2 = wall['mm']
+    horizontal = y1 == y2
+    lo, hi = (cut[0], cut[3]) if horizontal else (cut[1], cut[4])
+    bottom, top = cut[2], cut[5]
+    material = {'window': WINDOW_FRAME, 'sliding': SLIDING_FRAME, 'hinged': DOOR_FRAME}[kind]
+    width, depth = FRAME_SIZES[material]
+    sill = SILL_HEIGHT_MM if kind == 'window' else 0
+    # Opening left inside the frame
+    in_lo, in_hi, in_bottom, in_top = lo + width, hi - width, bottom + sill, top - width
+    if in_hi - in_lo <= 2 * LEAF_GAP_MM + SLIDING_OVERLAP_MM or in_top - in_bottom <= 2 * LEAF_GAP_MM:
+        return None
+
+    d = depth // 2
+    frames = [_across(wall, lo, in_lo, -d, d, in_bottom, top),
+              _across(wall, in_hi, hi, -d, d, in_bottom, top),
+              _across(wall, in_lo, in_hi, -d, d, in_top, top)]
+    if sill:
+        frames.append(_across(wall, lo, hi, -SILL_DEPTH_MM // 2, SILL_DEPTH_MM // 2, bottom, in_bottom))
+
+    r, g = GLASS_REBATE_MM, GLASS_THICKNESS_MM // 2
+    glass, leaf = [], None
+    if kind == 'window':
+        glass.append(_across(wall, in_lo - r, in_hi + r, -g, g, in_bottom - r, in_top + r))
+    elif kind == 'sliding':
+        mid, overlap = (in_lo + in_hi) // 2, SLIDING_OVERLAP_MM // 2
+        glass.append(_across(wall, in_lo - r, mid + overlap, -3 * g, -g, bottom, in_top + r))
+        glass.append(_across(wall, mid - overlap, in_hi + r, g, 3 * g, bottom, in_top + r))
+    else:
+        # Hinged on the side nearest the wall's start
+        forward = (x2 - x1 if horizontal else y2 - y1) > 0
+        hinge = in_lo + LEAF_GAP_MM if forward else in_hi - LEAF_GAP_MM
+        step = 1 if forward else -1
+        leaf = {'hinge': (hinge, y1) if horizontal else (x1, hinge),
+                'direction': (step, 0) if horizontal else (0, step),
+                'width': in_hi - in_lo - 2 * LEAF_GAP_MM,
+                'bottom': bottom + LEAF_GAP_MM, 'top': in_top - LEAF_GAP_MM}
+    return {'kind': kind, 'material': material, 'frames': frames, 'glass': glass, 'leaf': leaf}
+
+def frame_boxes(walls, thickness_mm=WALL_THICKNESS_MM):
+    """Frames of every opening: (N, 6) int array of boxes in millimetres and (N,) frame material slots"""
+    boxes, materials = [], []
+    for wall in walls:
+        assembly = opening_assembly(wall, thickness_mm)
+        if assembly:
+            boxes.extend(assembly['frames'])
+            materials.extend([assembly['material']] * len(assembly['frames']))
+    return np.array(boxes, dtype=np.int64).reshape(-1, 6), np.array(materials, dtype=np.int32)
+
+# ============= VOXELS =============
+
+def _voxelize(solids, cuts, frames, frame_materials):
+    """Compressed grid lines per axis, the wall/air state of every cell and the frame slot of frame cells (else 0)"""
+    boxes = np.concatenate([solids, cuts, frames])
+    lines = [np.unique(boxes[:, [axis, axis + 3]]) for axis in range(3)]
+    filled = np.zeros(tuple(len(l) - 1 for l in lines), dtype=bool)
+    framed = np.zeros(filled.shape, dtype=np.int8)
+
+    def cells(box):
+        lo = [np.searchsorted(lines[a], box[a]) for a in range(3)]
+        hi = [np.searchsorted(lines[a], box[a + 3]) for a in range(3)]
+        return tuple(slice(lo[a], hi[a]) for a in range(3))
+
+    for boxes_, value in ((solids, True), (cuts, False)):
+        for box in boxes_:
+            filled[cells(box)] = value
+    for box, material in zip(frames, frame_materials):
+        filled[cells(box)] = True
+        framed[cells(box)] = material
+    return lines, filled, framed
+
+def _indoor_cells(lines, rooms):
+    """(nx, ny) mask of grid columns whose centre lies inside an indoor room"""
+    xs = (lines[0][:-1] + lines[0][1:]) / 2
+    ys = (lines[1][:-1] + lines[1][1:]) / 2
+    indoor = np.zeros((len(xs), len(ys)), dtype=bool)
+    for room, (x0, y0, x1, y1) in zip(rooms, room_bounds_mm(rooms)):
+        if not is_outdoor(room):
+            indoor |= ((xs > x0) & (xs < x1))[:, None] & ((ys > y0) & (ys < y1))[None, :]
+    return indoor
+
+# ============= WELDING =============
+
+def weld_polygons(polygons):
+    """Share vertices between axis-aligned polygons and remove T-junctions.
+
+    polygons: corner lists of integer (x, y, z) points, each edge parallel
+    to an axis. Any polygon corner lying inside another polygon's edge is
+    inserted into that edge, so neighbouring faces meet edge to edge.
+    Returns (points (V, 3) int64, loops, face_sizes).
+    """
+    # Every corner, grouped by the axis-aligned lines through it
+    corners = {corner for polygon in polygons for corner in polygon}
+    on_line = {}
+    for corner in corners:
+        for axis in range(3):
+            key = (axis,) + tuple(corner[a] for a in range(3) if a != axis)
+            on_line.setdefault(key, []).append(corner[axis])
+    on_line = {key: np.sort(values) for key, values in on_line.items()}
+
+    index = {}
+    loops, face_sizes = [], []
+    for polygon in polygons:
+        ring = []
+        for start, end in zip(polygon, polygon[1:] + polygon[:1]):
+            ring.append(start)
+            axis = next(a for a in range(3) if start[a] != end[a])
+            key = (axis,) + tuple(start[a] for a in range(3) if a != axis)
+            values = on_line[key]
+            lo, hi = sorted((start[axis], end[axis]))
+            between = values[np.searchsorted(values, lo, 'right'):np.searchsorted(values, hi, 'left')]
+            if end[axis] < start[axis]:
+                between = between[::-1]
+            for value in between.tolist():
+                point = list(start)
+                point[axis] = value
+                ring.append(tuple(point))
+        loops.extend(index.setdefault(point, len(index)) for point in ring)
+        face_sizes.append(len(ring))
+
+    points = np.array(list(index), dtype=np.int64).reshape(-1, 3)
+    return points, np.array(loops, dtype=np.int32), np.array(face_sizes, dtype=np.int32)
+
+def _rectangles(mask):
+    """Greedy cover of a 2D mask with maximal rectangles: (u0, v0, u1, v1) cell ranges"""
+    mask = mask.copy()
+    rects = []
+    for u, v in zip(*np.nonzero(mask)):
+        if not mask[u, v]:
+            continue
+        v1 = v + 1
+        while v1 < mask.shape[1] and mask[u, v1]:
+            v1 += 1
+        u1 = u + 1
+        while u1 < mask.shape[0] and mask[u1, v:v1].all():
+            u1 += 1
+        mask[u:u1, v:v1] = False
+        rects.append((u, v, u1, v1))
+    return rects
+
+# Axes spanning a face normal to each axis, ordered so (b, c) is right-handed with the normal
+FACE_AXES = {0: (1, 2), 1: (2, 0), 2: (0, 1)}
+
+def _boundary_faces(filled, framed, indoor):
+    """Merged faces between wall and air: (normal axis, sign, plane index, material, rect)"""
+    padded = np.pad(filled, 1)
+    padded_framed = np.pad(framed, 1)
+    # Material of the air cell each face looks into (top and bottom faces count as interior)
+    air_indoor = np.pad(np.broadcast_to(indoor[:, :, None], filled.shape), 1)
+    faces = []
+    for axis in range(3):
+        b, c = FACE_AXES[axis]
+        lower = [np.take(grid, range(0, grid.shape[axis] - 1), axis=axis)
+                 for grid in (padded, air_indoor, padded_framed)]
+        upper = [np.take(grid, range(1, grid.shape[axis]), axis=axis)
+                 for grid in (padded, air_indoor, padded_framed)]
+        lo, hi = lower[0], upper[0]
+        # Faces look into the air cell and take a frame's material from the solid one
+        for sign, face, air, frame in ((1, lo & ~hi, upper[1], lower[2]), (-1, hi & ~lo, lower[1], upper[2])):
+            # Drop the padding on the two in-plane axes
+            face, air, frame = (np.moveaxis(grid, axis, 0)[:, 1:-1, 1:-1] for grid in (face, air, frame))
+            # moveaxis keeps the remaining axes in ascending order; put them in (b, c) order
+            if b > c:
+                face, air, frame = face.transpose(0, 2, 1), air.transpose(0, 2, 1), frame.transpose(0, 2, 1)
+            for plane in np.flatnonzero(face.any(axis=(1, 2))):
+                inside = air[plane] if axis != 2 else np.ones_like(air[plane])
+                materials = np.where(frame[plane] > 0, frame[plane], np.where(inside, INTERIOR, EXTERIOR))
+                for material in np.unique(materials[face[plane]]).tolist():
+                    for rect in _rectangles(face[plane] & (materials == material)):
+                        faces.append((axis, sign, plane, material, rect))
+    return faces
+
+# ============= MESH =============
+
+def _face_corners(axis, sign, plane, rect):
+    """Grid-index corners of a face rectangle, counter-clockwise seen from outside"""
+    b, c = FACE_AXES[axis]
+    u0, v0, u1, v1 = rect
+    corners = []
+    for u, v in ((u0, v0), (u1, v0), (u1, v1), (u0, v1)):
+        point = [0, 0, 0]
+        point[axis], point[b], point[c] = plane, u, v
+        corners.append(tuple(point))
+    return corners if sign > 0 else corners[::-1]
+
+def build_shell(walls, rooms, thickness_mm=WALL_THICKNESS_MM, frames=False):
+    """Union of the planned walls as one mesh.
+
+    With frames, the door and window frames of every opening are part of
+    the union (see opening_assembly).
+    Returns {'vertices' (V, 3) float32 metres, 'loops', 'face_sizes',
+    'face_materials' (INTERIOR/EXTERIOR or a frame slot per face),
+    'triangles'}, or None when there are no walls.
+    """
+    solids, cuts = wall_boxes(walls, thickness_mm)
+    if not len(solids):
+        return None
+    frame_solids, frame_materials = frame_boxes(walls, thickness_mm) if frames else (solids[:0], [])
+    lines, filled, framed = _voxelize(solids, cuts, frame_solids, frame_materials)
+    faces = _boundary_faces(filled, framed, _indoor_cells(lines, rooms))
+    polygons = [_face_corners(axis, sign, plane, rect) for axis, sign, plane, _, rect in faces]
+    grid, loops, face_sizes = weld_polygons(polygons)
+
+    vertices = np.column_stack([lines[a][grid[:, a]] for a in range(3)]) / MM
+    return {
+        'vertices': vertices.astype(np.float32),
+        'loops': loops,
+        'face_sizes': face_sizes,
+        'face_materials': np.array([material for _, _, _, material, _ in faces], dtype=np.int32),
+        'triangles': int((face_sizes - 2).sum()),
+    }
+
+# ============= BASEBOARDS =============
+
+BASEBOARD_HEIGHT_MM = 80
+BASEBOARD_DEPTH_MM = 15
+
+def _subtract(lo, hi, gaps):
+    """Parts of [lo, hi] not covered by any (gap_lo, gap_hi)"""
+    runs = []
+    for gap_lo, gap_hi in sorted(gaps):
+        if gap_hi <= lo or gap_lo >= hi:
+            continue
+        if gap_lo > lo:
+            runs.append((lo, gap_lo))
+        lo = max(lo, gap_hi)
+    if hi > lo:
+        runs.append((lo, hi))
+    return runs
+
+def baseboard_boxes(room, walls, thickness_mm=WALL_THICKNESS_MM):
+    """Baseboard runs around a room, (N, 6) int array of x0, y0, z0, x1, y1, z1 in millimetres.
+
+    The boards sit against the inner faces of the walls and stop at door
+    openings in any wall on the room's edges (walls: every planned wall of
+    the house, see plan_walls). Front and back boards run the full inner
+    width and side boards fit between them, so corners do not overlap.
+    """
+    half, depth, top = thickness_mm // 2, BASEBOARD_DEPTH_MM, BASEBOARD_HEIGHT_MM
+    ix0, iy0, ix1, iy1 = room.x_mm + half, room.y_mm + half, room.x2_mm - half, room.y2_mm - half
+    if ix1 - ix0 <= 2 * depth or iy1 - iy0 <= 2 * depth:
+        return np.zeros((0, 6), dtype=np.int64)
+
+    # Door gaps per wall line: (horizontal, coordinate) -> [(lo, hi)]
+    gaps = {}
+    for wall in walls:
+        span = wall['door'] and not wall['window'] and opening_span(wall)
+        if span:
+            x1, y1, x2, y2 = wall['mm']
+            line = (True, y1) if y1 == y2 else (False, x1)
+            gaps.setdefault(line, []).append(span[:2])
+
+    boxes = []
+    for y_edge, y_board in ((room.y_mm, iy0), (room.y2_mm, iy1 - depth)):
+        for lo, hi in _subtract(ix0, ix1, gaps.get((True, y_edge), [])):
+            boxes.append((lo, y_board, 0, hi, y_board + depth, top))
+    for x_edge, x_board in ((room.x_mm, ix0), (room.x2_mm, ix1 - depth)):
+        for lo, hi in _subtract(iy0 + depth, iy1 - depth, gaps.get((False, x_edge), [])):
+            boxes.append((x_board, lo, 0, x_board + depth, hi, top))
+    return np.array(boxes, dtype=np.int64).reshape(-1, 6)